@@ -0,0 +1,103 @@
+"""Общая подготовка Django для бенчмарков.
+
+Бенчмарки запускаются из корня репозитория, например::
+
+    python benchmarks/pagination.py
+
+Каждый из них создаёт отдельную тестовую базу (как pytest-django)
+и удаляет её по завершении, рабочая db.sqlite3 не затрагивается.
+"""
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'blogicum'
+
+
+def setup_django():
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+    import django
+    django.setup()
+    from django.conf import settings
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['*']
+
+
+@contextmanager
+def test_database():
+    from django.db import connection
+    from django.test.utils import (setup_test_environment,
+                                   teardown_test_environment)
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def make_posts(n, *, n_categories=1, n_authors=1, text='Текст публикации',
+               title=None, batch_size=5000):
+    """Массово создаёт опубликованные публикации в прошлом.
+
+    text — строка или функция номера публикации, возвращающая текст;
+    title — функция номера, возвращающая заголовок.
+    """
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from blog.models import Category, Location, Post, User, make_excerpt
+    if not callable(text):
+        fixed_text, fixed_excerpt = text, make_excerpt(text)
+    categories = [
+        Category.objects.create(
+            title=f'Категория {i}', description='', slug=f'category-{i}')
+        for i in range(n_categories)
+    ]
+    authors = [
+        User.objects.create(username=f'author{i}') for i in range(n_authors)
+    ]
+    location = Location.objects.create(name='Место')
+    start = timezone.now() - timedelta(minutes=n + 1)
+    batch = []
+    for i in range(n):
+        if callable(text):
+            post_text = text(i)
+            excerpt = make_excerpt(post_text)
+        else:
+            post_text, excerpt = fixed_text, fixed_excerpt
+        batch.append(Post(
+            title=title(i) if title else f'Публикация {i}',
+            text=post_text,
+            excerpt=excerpt,
+            pub_date=start + timedelta(minutes=i),
+            is_live=True,
+            author=authors[i % n_authors],
+            category=categories[i % n_categories],
+            location=location,
+        ))
+        if len(batch) == batch_size:
+            Post.objects.bulk_create(batch)
+            batch = []
+    Post.objects.bulk_create(batch)
+    return categories, authors
+
+
+def measure(func, repeat=20):
+    """Возвращает (медиана, p99) времени вызова func в миллисекундах"""
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    return statistics.median(timings), p99
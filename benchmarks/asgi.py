@@ -0,0 +1,204 @@
+"""Пропускная способность и задержка публичных страниц под WSGI и ASGI.
+
+HTTP-сервер не нужен: приложения вызываются в процессе, как их вызвал
+бы сервер. Режимы:
+
+* wsgi — пул из --threads потоков, как у многопоточного сервера;
+* asgi-sync — ASGI с синхронными представлениями (Django выполняет их
+  в общем потоке для синхронного кода);
+* asgi — асинхронные представления чтения, запросы к базе и рендер в
+  пуле из того же числа потоков (BLOG_ASYNC_READ_THREADS).
+
+Клиенты без пауз запрашивают ленту, категории, публикации, профили и
+статические страницы. Кэш страниц отключён — измеряется рендер,
+карточки кэшируются как обычно::
+
+    python benchmarks/asgi.py [--clients 1 16 256] [--posts 10000]
+
+Каждый режим запускается в отдельном процессе: асинхронные
+представления включает переменная окружения BLOG_ASYNC_READ_VIEWS.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from _setup import make_posts, setup_django, test_database
+
+MODES = ('wsgi', 'asgi-sync', 'asgi')
+
+
+def make_paths(n_posts, n_categories, n_authors, seed=0):
+    rng = random.Random(seed)
+    choices = (
+        lambda: '/',
+        lambda: f'/category/category-{rng.randrange(n_categories)}/',
+        lambda: f'/posts/{rng.randint(1, n_posts)}/',
+        lambda: f'/profile/author{rng.randrange(n_authors)}/',
+        lambda: '/pages/about/',
+    )
+    return [rng.choice(choices)() for _ in range(10_000)]
+
+
+def report(mode, clients, timings, elapsed, errors):
+    timings.sort()
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(f'{mode:<9} {clients:>8} {len(timings) / elapsed:>9.0f} '
+          f'{statistics.median(timings):>11.1f} {p99:>9.1f} {errors:>7}',
+          flush=True)
+
+
+def run_wsgi(paths, clients, requests, threads):
+    from django.core.wsgi import get_wsgi_application
+    from django.test.client import RequestFactory
+
+    application = get_wsgi_application()
+    factory = RequestFactory()
+    server = ThreadPoolExecutor(max_workers=threads)
+    timings, errors = [], []
+    counter = iter(range(requests))
+    lock = threading.Lock()
+
+    def call(path):
+        statuses = []
+        environ = factory.get(path).environ
+        body = application(
+            environ, lambda status, headers: statuses.append(status))
+        b''.join(body)
+        body.close()
+        return statuses[0]
+
+    def client():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            start = time.perf_counter()
+            status = server.submit(call, paths[i % len(paths)]).result()
+            timings.append((time.perf_counter() - start) * 1000)
+            if not status.startswith('200'):
+                errors.append(status)
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=client) for _ in range(clients)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+    return timings, elapsed, len(errors)
+
+
+def run_asgi(paths, clients, requests):
+    from django.core.asgi import get_asgi_application
+
+    application = get_asgi_application()
+    timings, errors = [], []
+
+    async def call(path):
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'},
+            'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+            'path': path, 'raw_path': path.encode(), 'query_string': b'',
+            'root_path': '', 'headers': [(b'host', b'localhost')],
+            'client': ('127.0.0.1', 50000), 'server': ('localhost', 80),
+        }
+        messages = [{'type': 'http.request', 'body': b''}]
+        statuses = []
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await asyncio.Future()
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                statuses.append(message['status'])
+
+        await application(scope, receive, send)
+        return statuses[0]
+
+    async def main():
+        counter = iter(range(requests))
+
+        async def client():
+            for i in counter:
+                start = time.perf_counter()
+                status = await call(paths[i % len(paths)])
+                timings.append((time.perf_counter() - start) * 1000)
+                if status != 200:
+                    errors.append(status)
+
+        await asyncio.gather(*(client() for _ in range(clients)))
+
+    start = time.perf_counter()
+    asyncio.run(main())
+    return timings, time.perf_counter() - start, len(errors)
+
+
+def child(args):
+    setup_django()
+    from django.conf import settings
+    from django.db import connection
+
+    settings.MIDDLEWARE = [
+        name for name in settings.MIDDLEWARE if 'debug_toolbar' not in name
+    ]
+    settings.BLOG_PAGE_CACHE_TIMEOUT = 0
+    settings.BLOG_ASYNC_READ_THREADS = args.threads
+    connection.settings_dict['TEST']['NAME'] = args.database
+    with test_database():
+        n_categories, n_authors = 10, 100
+        make_posts(args.posts, n_categories=n_categories,
+                   n_authors=n_authors)
+        paths = make_paths(args.posts, n_categories, n_authors)
+        for clients in args.clients:
+            requests = max(args.requests, clients * 4)
+            if args.mode == 'wsgi':
+                result = run_wsgi(paths, clients, requests, args.threads)
+            else:
+                result = run_asgi(paths, clients, requests)
+            report(args.mode, clients, *result)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, nargs='+',
+                        default=[1, 16, 256])
+    parser.add_argument('--posts', type=int, default=10_000)
+    parser.add_argument('--requests', type=int, default=500,
+                        help='Запросов на каждое число клиентов.')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--mode', choices=MODES)
+    parser.add_argument('--database')
+    args = parser.parse_args()
+    if args.mode:
+        return child(args)
+
+    print(f'{"режим":<9} {"клиенты":>8} {"запр./с":>9} '
+          f'{"median, ms":>11} {"p99, ms":>9} {"ошибки":>7}', flush=True)
+    for mode in MODES:
+        env = dict(os.environ, BLOG_ASYNC_READ_VIEWS=str(int(mode == 'asgi')))
+        with tempfile.TemporaryDirectory() as directory:
+            subprocess.run([
+                sys.executable, __file__, '--mode', mode,
+                '--database', str(Path(directory) / 'bench.sqlite3'),
+                '--posts', str(args.posts),
+                '--requests', str(args.requests),
+                '--threads', str(args.threads),
+                '--clients', *map(str, args.clients),
+            ], env=env, check=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Память на страницу ленты с длинными публикациями.
+
+Сравнивает пиковое потребление памяти (tracemalloc) при загрузке
+страницы ленты с полным текстом и с defer('text'), а также рендер
+главной страницы с пустым кэшем карточек::
+
+    python benchmarks/feed_memory.py [--text-kb 50]
+"""
+import argparse
+import tracemalloc
+
+from _setup import make_posts, measure, setup_django, test_database
+
+
+def peak_kb(func):
+    """Пиковый прирост памяти во время вызова func, КБ"""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=200)
+    parser.add_argument('--text-kb', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import cache
+    from django.test import Client
+
+    from blog.views import CursorPaginator, post_query
+
+    word = 'слово '
+    text = word * (args.text_kb * 1024 // len(word.encode()))
+    with test_database():
+        make_posts(args.posts, text=text)
+        client = Client()
+        feed = post_query().select_related('author').order_by(
+            *CursorPaginator.ordering)
+
+        def full():
+            return list(feed[:10])
+
+        def deferred():
+            return list(feed.defer('text')[:10])
+
+        def page():
+            cache.clear()
+            client.get('/')
+
+        print(f'{"":<24} {"peak, KB":>10} {"median, ms":>12}')
+        for name, func in (
+                ('страница, полный text', full),
+                ('страница, defer(text)', deferred),
+                ('рендер / без кэша', page)):
+            print(f'{name:<24} {peak_kb(func):>10.0f} '
+                  f'{measure(func, args.repeat)[0]:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""Обработка фото: загрузка в запросе и пропускная способность воркера.
+
+Сравнивается время Post.save() с новым фото — теперь оно только
+сохраняет оригинал и ставит его в очередь — с тем, сколько занимала бы
+обработка прямо в запросе (images.process()). Затем партию из --photos
+фото обрабатывает image_pipeline.process_pending() с пулом из
+--workers процессов. Фото — JPEG --size с шумом и EXIF, файлы пишутся
+во временный MEDIA_ROOT::
+
+    python benchmarks/images.py [--photos 1000] [--workers 1 2 4]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from io import BytesIO
+
+from _setup import make_posts, measure, setup_django, test_database
+
+
+def make_photo(width, height):
+    from PIL import Image
+    image = Image.merge('RGB', [
+        Image.effect_noise((width, height), sigma)
+        for sigma in (40, 60, 80)
+    ])
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    exif[0x010F] = 'Camera'
+    buffer = BytesIO()
+    image.save(buffer, 'JPEG', quality=90, exif=exif)
+    return buffer.getvalue()
+
+
+def bench_upload(photo):
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    from blog import images
+    from blog.models import Post
+    post = Post.objects.first()
+
+    def upload():
+        post.image = SimpleUploadedFile('upload.jpg', photo, 'image/jpeg')
+        post.save()
+
+    def inline():
+        upload()
+        images.process(post.image.name)
+
+    for name, func in (('очередь', upload), ('в запросе', inline)):
+        median, p99 = measure(func, repeat=20)
+        print(f'Post.save() с фото, {name:<10} median {median:7.1f} ms, '
+              f'p99 {p99:7.1f} ms')
+
+
+def bench_pipeline(photo, n_photos, workers):
+    from django.core.files.base import ContentFile
+    from django.core.files.storage import default_storage
+
+    from blog import image_pipeline
+    from blog.models import Post
+    posts = list(Post.objects.order_by('pk')[:n_photos])
+    for post in posts:
+        post.image = default_storage.save(
+            'birthdays_images/photo.jpg', ContentFile(photo))
+        post.image_variants = {'name': post.image.name, 'pending': True}
+    Post.objects.bulk_update(posts, ['image', 'image_variants'])
+
+    start = time.perf_counter()
+    with image_pipeline.executor(workers) as pool:
+        while image_pipeline.process_pending(pool, 100):
+            pass
+    elapsed = time.perf_counter() - start
+    print(f'{workers:>8} {n_photos / elapsed:>9.1f} {elapsed:>9.1f}',
+          flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--photos', type=int, default=1000)
+    parser.add_argument('--size', default='2048x1536')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    width, height = map(int, args.size.split('x'))
+    photo = make_photo(width, height)
+    media = tempfile.mkdtemp()
+    settings.MEDIA_ROOT = media
+    settings.BLOG_PAGE_CACHE_TIMEOUT = 0
+    try:
+        with test_database():
+            make_posts(args.photos)
+            print(f'Фото {args.size}, {len(photo) // 1024} КБ, CPU: '
+                  f'{os.cpu_count()}')
+            bench_upload(photo)
+            print(f'{"процессы":>8} {"фото/с":>9} {"всего, с":>9}')
+            for workers in args.workers:
+                bench_pipeline(photo, args.photos, workers)
+    finally:
+        shutil.rmtree(media)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Время ответа главной страницы в зависимости от глубины страницы.
+
+Сравнивает ?page=N (LIMIT/OFFSET + COUNT) и ?cursor=<токен>
+(keyset по (pub_date, id)) для страниц с 1 по 10 000. Перед каждым
+запросом кэш очищается: иначе анонимный клиент получал бы страницу из
+кэша страниц и измерялось бы попадание в кэш::
+
+    python benchmarks/pagination.py [--posts 100000]
+"""
+import argparse
+
+from _setup import make_posts, measure, setup_django, test_database
+
+PAGES = (1, 10, 100, 1000, 10000)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import cache
+    from django.test import Client
+
+    from blog.paginators import NEXT, encode_cursor
+    from blog.views import CursorPaginator, post_query
+
+    with test_database():
+        make_posts(args.posts)
+        client = Client()
+
+        def run(params):
+            cache.clear()
+            client.get('/', params)
+
+        feed = post_query().order_by(*CursorPaginator.ordering)
+        per_page = 10
+        print(f'{"page":>6} {"?page=N, ms":>14} {"?cursor, ms":>14}')
+        for number in PAGES:
+            if number * per_page > args.posts:
+                break
+            by_number = measure(
+                lambda: run({'page': number}), args.repeat)
+            if number == 1:
+                by_cursor = measure(lambda: run({}), args.repeat)
+            else:
+                anchor = feed[(number - 1) * per_page - 1]
+                token = encode_cursor(anchor, NEXT)
+                by_cursor = measure(
+                    lambda: run({'cursor': token}), args.repeat)
+            print(f'{number:>6} {by_number[0]:>14.2f} {by_cursor[0]:>14.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Задержка полнотекстового поиска (FTS5) в зависимости от числа постов.
+
+Тексты собираются из словаря русских слов с распределением Ципфа, так
+что в выдаче встречаются и частые, и редкие слова. Кэш страниц
+очищается перед каждым запросом — измеряется сам поиск::
+
+    python benchmarks/search.py [--posts 100000 1000000]
+"""
+import argparse
+import random
+
+from _setup import make_posts, measure, setup_django, test_database
+
+VOCABULARY = (
+    'город река лес поле дорога дом окно снег дождь ветер солнце ёлка '
+    'праздник подарок зима весна лето осень утро вечер ночь друг семья '
+    'книга музыка песня кино театр музей парк сад цветок дерево птица '
+    'кошка собака море гора озеро остров путешествие поезд самолёт '
+    'машина работа школа университет наука история искусство спорт '
+    'футбол хоккей шахматы кухня рецепт пирог суп чай кофе завтрак обед '
+    'ужин рынок магазин праздничный зимний весенний летний осенний '
+    'красивый старый новый большой маленький тёплый холодный быстрый'
+).split()
+
+QUERIES = (
+    ('частое слово', 'город'),
+    ('два слова', 'зимний праздник'),
+    ('редкое слово', 'шахматы'),
+    ('форма слова', 'ёлки'),
+    ('нет совпадений', 'квазар'),
+)
+
+
+def make_text(words=60, seed=0):
+    rng = random.Random(seed)
+    weights = [1 / rank for rank in range(1, len(VOCABULARY) + 1)]
+
+    def text(i):
+        return ' '.join(rng.choices(VOCABULARY, weights, k=words)).capitalize()
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--posts', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import cache
+    from django.test import Client
+
+    def run(client, query):
+        cache.clear()
+        client.get('/search/', {'q': query})
+
+    for n_posts in args.posts:
+        with test_database():
+            make_posts(n_posts, n_categories=10, text=make_text())
+            client = Client()
+            print(f'\n{n_posts} публикаций')
+            print(f'{"запрос":<16} {"median, ms":>12} {"p99, ms":>10}')
+            for name, query in QUERIES:
+                median, p99 = measure(
+                    lambda: run(client, query), args.repeat)
+                print(f'{name:<16} {median:>12.2f} {p99:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""Пропускная способность SQLite при одновременных чтении и записи.
+
+Несколько процессов читают ленту и комментарии публикации, несколько
+других добавляют комментарии (в транзакции, как CommentCreateView,
+с сигналами счётчика). Сравниваются два профиля:
+
+* baseline — журнал DELETE, без PRAGMA, соединение на каждый запрос
+  (CONN_MAX_AGE = 0);
+* production — BLOG_SQLITE_PRAGMAS профиля BLOG_DB_PROFILE=production
+  (WAL, synchronous=NORMAL, mmap, cache_size, busy_timeout, temp_store)
+  и постоянное соединение.
+
+База — временный файл (в памяти блокировок файла нет)::
+
+    python benchmarks/sqlite_concurrency.py [--readers 8 --writers 4]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from _setup import make_posts, setup_django, test_database
+
+N_POSTS = 20_000
+
+
+def read_op(rng):
+    from blog.models import Comment, Post
+    list(Post.objects.filter(
+        is_live=True, is_published=True, category__is_published=True
+    ).select_related('author').defer('text').order_by(
+        '-pub_date', '-pk'
+    )[:10])
+    list(Comment.objects.filter(
+        post_id=rng.randint(1, N_POSTS)
+    ).select_related('author'))
+
+
+def write_op(rng, author_id):
+    from django.db import transaction
+
+    from blog.models import Comment
+    with transaction.atomic():
+        Comment.objects.create(
+            post_id=rng.randint(1, N_POSTS), author_id=author_id,
+            text='Комментарий'
+        )
+
+
+def worker(kind, seed, duration, persistent, results):
+    from django.db import OperationalError, connection
+
+    from blog.models import User
+    rng = random.Random(seed)
+    author_id = User.objects.values_list('pk', flat=True).first()
+    if not persistent:
+        connection.close()
+    ops = errors = 0
+    timings = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            if kind == 'read':
+                read_op(rng)
+            else:
+                write_op(rng, author_id)
+            ops += 1
+            timings.append((time.perf_counter() - start) * 1000)
+        except OperationalError:
+            errors += 1
+        if not persistent:
+            # Конец запроса при CONN_MAX_AGE = 0.
+            connection.close()
+    results.put((kind, ops, errors, timings))
+
+
+def run(profile, args):
+    from django.conf import settings
+    from django.db import connection, connections
+
+    persistent = profile == 'production'
+    settings.BLOG_SQLITE_PRAGMAS = (
+        {'default': dict(PRAGMAS)} if persistent else {}
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'PRAGMA journal_mode = {"WAL" if persistent else "DELETE"}'
+        )
+    connections.close_all()
+
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(
+            kind, i, args.duration, persistent, results))
+        for i, kind in enumerate(
+            ['read'] * args.readers + ['write'] * args.writers)
+    ]
+    for process in processes:
+        process.start()
+    totals = {'read': [0, 0, []], 'write': [0, 0, []]}
+    for _ in processes:
+        kind, ops, errors, timings = results.get()
+        totals[kind][0] += ops
+        totals[kind][1] += errors
+        totals[kind][2] += timings
+    for process in processes:
+        process.join()
+    for kind, (ops, errors, timings) in totals.items():
+        timings.sort()
+        p99 = timings[int(len(timings) * 0.99)] if timings else 0
+        median = statistics.median(timings) if timings else 0
+        print(f'{profile:<11} {kind:<6} {ops / args.duration:>9.0f} '
+              f'{median:>11.2f} {p99:>9.2f} {errors:>7}')
+
+
+PRAGMAS = {}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=5)
+    args = parser.parse_args()
+
+    os.environ['BLOG_DB_PROFILE'] = 'production'
+    setup_django()
+    from django.conf import settings
+    from django.db import connection
+
+    PRAGMAS.update(settings.BLOG_SQLITE_PRAGMAS['default'])
+    with tempfile.TemporaryDirectory() as directory:
+        connection.settings_dict['TEST']['NAME'] = str(
+            Path(directory) / 'bench.sqlite3')
+        with test_database():
+            make_posts(N_POSTS, n_categories=10, n_authors=10)
+            print(f'{args.readers} читателей, {args.writers} писателей, '
+                  f'{args.duration:g} с')
+            print(f'{"профиль":<11} {"":<6} {"опер./с":>9} '
+                  f'{"median, ms":>11} {"p99, ms":>9} {"ошибки":>7}')
+            for profile in ('baseline', 'production'):
+                run(profile, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Сколько байт статики передаёт просмотр ленты: первый и повторный.
+
+Статика страницы — ссылки /static/ в HTML ленты (Bootstrap, логотип,
+иконки). Сравниваются:
+
+* до — StaticFilesStorage без хэшей и сжатия, django.views.static.serve
+  без Cache-Control: при повторном просмотре браузер перепроверяет
+  каждый файл запросом с If-Modified-Since (ответ 304 без тела);
+* после — CompressedManifestStorage и core.staticfiles.serve: сжатые
+  копии по Accept-Encoding, файлы с хэшем — immutable и при повторном
+  просмотре не запрашиваются.
+
+Браузер присылает Accept-Encoding: gzip, deflate, br. Считаются тела
+ответов статики; размер HTML (он не сжимается) показан отдельно::
+
+    python benchmarks/static_assets.py
+"""
+import re
+import shutil
+import tempfile
+
+from _setup import make_posts, setup_django, test_database
+
+ACCEPT_ENCODING = 'gzip, deflate, br'
+STATIC_LINK = re.compile(r'(?:href|src)="/static/([^"]+)"')
+
+
+def body_size(response):
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def page_view(serve, paths, warm_cache):
+    """(запросов, байт) статики за просмотр; warm_cache — ответы
+    первого просмотра по путям"""
+    from django.test.client import RequestFactory
+    factory = RequestFactory()
+    requests = size = 0
+    responses = {}
+    for path in paths:
+        headers = {'HTTP_ACCEPT_ENCODING': ACCEPT_ENCODING}
+        cached = warm_cache.get(path)
+        if cached is not None:
+            if cached.has_header('Cache-Control'):
+                # immutable или свежий max-age: из кэша браузера.
+                continue
+            headers['HTTP_IF_MODIFIED_SINCE'] = cached['Last-Modified']
+        response = serve(factory.get(f'/static/{path}', **headers), path)
+        requests += 1
+        size += body_size(response)
+        responses[path] = response
+    return requests, size, responses
+
+
+def run(label, storage, serve):
+    from django.conf import settings
+    from django.contrib.staticfiles.storage import staticfiles_storage
+    from django.core.cache import cache
+    from django.core.management import call_command
+    from django.test import Client
+    from django.utils.functional import empty
+
+    settings.STATICFILES_STORAGE = storage
+    staticfiles_storage._wrapped = empty
+    call_command('collectstatic', interactive=False, verbosity=0,
+                 clear=True)
+    cache.clear()
+    html = Client().get('/').content
+    paths = STATIC_LINK.findall(html.decode())
+    cold_requests, cold_size, responses = page_view(serve, paths, {})
+    warm_requests, warm_size, _ = page_view(serve, paths, responses)
+    print(f'{label:<6} {len(html):>9} {cold_requests:>11} '
+          f'{cold_size:>11} {warm_requests:>12} {warm_size:>12}')
+
+
+def main():
+    setup_django()
+    from django.conf import settings
+    from django.views.static import serve as django_serve
+
+    from core.staticfiles import serve
+
+    static_root = tempfile.mkdtemp()
+    settings.STATIC_ROOT = static_root
+    settings.BLOG_PAGE_CACHE_TIMEOUT = 0
+    try:
+        with test_database():
+            make_posts(20)
+            print(f'{"":<6} {"HTML, Б":>9} {"1-й: запр.":>11} '
+                  f'{"1-й: байт":>11} {"2-й: запр.":>12} '
+                  f'{"2-й: байт":>12}')
+            run('до', 'django.contrib.staticfiles.storage.'
+                'StaticFilesStorage',
+                lambda request, path: django_serve(
+                    request, path, document_root=static_root))
+            run('после', 'core.staticfiles.CompressedManifestStorage',
+                serve)
+    finally:
+        shutil.rmtree(static_root)
+
+
+if __name__ == '__main__':
+    main()
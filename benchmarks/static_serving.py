@@ -0,0 +1,96 @@
+"""Отдача статики в процессе: через Django и через StaticFilesWSGI.
+
+Сравниваются WSGI-приложения, как их вызвал бы сервер без nginx:
+
+* django — get_wsgi_application(): middleware, разрешение URL и
+  core.staticfiles.serve (stat() и выбор сжатой копии на каждый запрос);
+* static_app — то же приложение в обёртке core.static_app.StaticFilesWSGI
+  (blogicum/wsgi.py): индекс STATIC_ROOT, middleware и URL не
+  вызываются.
+
+Тело ответа читается целиком, как его отправил бы сервер;
+wsgi.file_wrapper — wsgiref.util.FileWrapper (без sendfile)::
+
+    python benchmarks/static_serving.py [--requests 2000]
+"""
+import argparse
+import shutil
+import tempfile
+import time
+import tracemalloc
+from wsgiref.util import FileWrapper, setup_testing_defaults
+
+from _setup import setup_django, test_database
+
+# (путь без STATIC_URL, Accept-Encoding)
+CASES = (
+    ('img/logo.png', ''),
+    ('css/bootstrap.pruned.css', 'gzip, deflate, br'),
+    ('css/bootstrap.min.css', ''),
+)
+
+
+def request(app, path, accept_encoding):
+    environ = {'PATH_INFO': path, 'REQUEST_METHOD': 'GET',
+               'HTTP_ACCEPT_ENCODING': accept_encoding,
+               'wsgi.file_wrapper': FileWrapper}
+    setup_testing_defaults(environ)
+    statuses = []
+    body = app(environ, lambda status, headers: statuses.append(status))
+    try:
+        size = sum(len(block) for block in body)
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+    assert statuses[0].startswith('200'), statuses
+    return size
+
+
+def measure(app, path, accept_encoding, requests):
+    request(app, path, accept_encoding)
+    started = time.perf_counter()
+    for _ in range(requests):
+        size = request(app, path, accept_encoding)
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    request(app, path, accept_encoding)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return size, requests / elapsed, elapsed / requests * 1e6, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+    setup_django()
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.core.wsgi import get_wsgi_application
+
+    from core.static_app import StaticFilesWSGI
+
+    static_root = tempfile.mkdtemp()
+    settings.STATIC_ROOT = static_root
+    try:
+        call_command('collectstatic', interactive=False, verbosity=0)
+        with test_database():
+            django_app = get_wsgi_application()
+            apps = {'django': django_app,
+                    'static_app': StaticFilesWSGI(django_app)}
+            print(f'{"файл":<26} {"режим":<10} {"байт":>7} {"запр./с":>8} '
+                  f'{"мкс":>7} {"пик памяти, Б":>14}')
+            for name, accept_encoding in CASES:
+                for label, app in apps.items():
+                    size, rate, micros, peak = measure(
+                        app, f'{settings.STATIC_URL}{name}',
+                        accept_encoding, args.requests
+                    )
+                    print(f'{name:<26} {label:<10} {size:>7} {rate:>8.0f} '
+                          f'{micros:>7.0f} {peak:>14}')
+    finally:
+        shutil.rmtree(static_root)
+
+
+if __name__ == '__main__':
+    main()
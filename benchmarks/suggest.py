@@ -0,0 +1,64 @@
+"""Задержка подсказок поиска на каждое нажатие клавиши.
+
+Заголовки публикаций собираются из словаря русских слов (как в
+benchmarks/search.py), индекс подсказок строится командой
+rebuild_suggestions. Для каждого запроса по очереди отправляются все его
+префиксы — так, как их набирает пользователь::
+
+    python benchmarks/suggest.py [--posts 100000 1000000]
+"""
+import argparse
+import itertools
+import random
+
+from _setup import make_posts, measure, setup_django, test_database
+from search import VOCABULARY
+
+QUERIES = ('зимний праздник', 'шахматы', 'ёлка', 'категория 3', 'author1')
+
+
+def title_maker(seed=0):
+    rng = random.Random(seed)
+    weights = [1 / rank for rank in range(1, len(VOCABULARY) + 1)]
+
+    def title(i):
+        return ' '.join(rng.choices(VOCABULARY, weights, k=4)).capitalize()
+    return title
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '--posts', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=50,
+                        help='Сколько раз набирается каждый запрос.')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.management import call_command
+    from django.test import Client
+
+    for n_posts in args.posts:
+        with test_database():
+            make_posts(n_posts, n_categories=10, n_authors=100,
+                       title=title_maker())
+            call_command('rebuild_suggestions')
+            client = Client()
+            print(f'\n{n_posts} публикаций')
+            print(f'{"запрос":<18} {"median, ms":>12} {"p99, ms":>10}')
+            for query in QUERIES:
+                # Все префиксы запроса — одна выборка нажатий клавиш.
+                prefixes = [
+                    query[:length] for length in range(1, len(query) + 1)
+                ]
+                keystrokes = itertools.cycle(prefixes)
+                median, p99 = measure(
+                    lambda: client.get(
+                        '/search/suggest/', {'q': next(keystrokes)}),
+                    args.repeat * len(prefixes)
+                )
+                print(f'{query:<18} {median:>12.2f} {p99:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,7 @@
 from django.contrib import admin
+from django.db.models.expressions import RawSQL
 
+from . import search
 from .models import Category, Location, Post
 
 admin.site.empty_value_display = 'Не задано'
@@ -9,7 +11,7 @@ admin.site.empty_value_display = 'Не задано'
 class PostAdmin (admin.ModelAdmin):
     list_display = [
         field.name for field in Post._meta.get_fields()
-        if field.name != 'id'
+        if field.name != 'id' and field.concrete
     ]
     list_editable = (
         'is_published',
@@ -20,6 +22,19 @@ class PostAdmin (admin.ModelAdmin):
     list_filter = ('category',)
     list_display_links = ('title',)
 
+    def get_search_results(self, request, queryset, search_term):
+        """Поиск по заголовку и тексту через полнотекстовый индекс"""
+        match = search.match_expression(search_term)
+        if not match or not search.is_available():
+            return super().get_search_results(
+                request, queryset, search_term
+            )
+        return queryset.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {search.FTS_TABLE} '
+            f'WHERE {search.FTS_TABLE} MATCH %s',
+            (match,)
+        )), False
+
 
 @admin.register(Category)
 class CategoryAdmin (admin.ModelAdmin):
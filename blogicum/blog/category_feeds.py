@@ -0,0 +1,86 @@
+"""Материализованные ленты категорий.
+
+Для категорий, отмеченных CategoryFeed, видимые публикации хранятся в
+таблице CategoryFeedEntry: id поста и ключ сортировки pub_date. Страница
+категории листает эту узкую таблицу по индексу (category, pub_date, post)
+без соединений и затем загружает только посты текущей страницы; готовые
+карточки берутся из кэша карточек.
+
+Записи поддерживаются сигналами: сохранение поста (публикация, снятие с
+публикации, правка, перенос в другую категорию), наступление даты
+отложенной публикации и удаление (каскадом). Изменения в обход моделей
+(QuerySet.update, сырой SQL) находит команда check_category_feeds,
+исправляет rebuild_category_feeds.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .models import CategoryFeed, CategoryFeedEntry, Post
+
+
+def visible_posts():
+    """Публикации, которые должны быть в лентах своих категорий"""
+    return Post.objects.filter(is_live=True, is_published=True)
+
+
+def entries(category):
+    """Записи ленты категории в порядке ленты"""
+    return CategoryFeedEntry.objects.filter(
+        category=category
+    ).order_by('-pub_date', '-pk')
+
+
+def rebuild(category):
+    """Строит ленту категории заново; возвращает число записей"""
+    with transaction.atomic():
+        CategoryFeedEntry.objects.filter(category=category).delete()
+        created = CategoryFeedEntry.objects.bulk_create(
+            CategoryFeedEntry(
+                post_id=post_id, category=category, pub_date=pub_date
+            )
+            for post_id, pub_date in visible_posts().filter(
+                category=category
+            ).values_list('id', 'pub_date').iterator()
+        )
+        CategoryFeed.objects.update_or_create(
+            category=category, defaults={'rebuilt_at': timezone.now()}
+        )
+    return len(created)
+
+
+def drop(category):
+    """Удаляет ленту; страница категории вернётся к запросу по Post"""
+    with transaction.atomic():
+        CategoryFeedEntry.objects.filter(category=category).delete()
+        CategoryFeed.objects.filter(category=category).delete()
+
+
+def sync_posts(post_ids):
+    """Приводит записи лент для указанных постов к их текущему состоянию"""
+    with transaction.atomic():
+        CategoryFeedEntry.objects.filter(post_id__in=post_ids).delete()
+        CategoryFeedEntry.objects.bulk_create(
+            CategoryFeedEntry(
+                post_id=post_id, category_id=category_id, pub_date=pub_date
+            )
+            for post_id, category_id, pub_date in visible_posts().filter(
+                pk__in=post_ids, category__feed__isnull=False
+            ).values_list('id', 'category_id', 'pub_date')
+        )
+
+
+def diff(category):
+    """Расхождения ленты с Post: (нет в ленте, лишние, устаревшие)"""
+    expected = dict(
+        visible_posts().filter(category=category).values_list(
+            'id', 'pub_date'
+        )
+    )
+    actual = dict(entries(category).values_list('post_id', 'pub_date'))
+    missing = expected.keys() - actual.keys()
+    extra = actual.keys() - expected.keys()
+    stale = {
+        post_id for post_id in expected.keys() & actual.keys()
+        if expected[post_id] != actual[post_id]
+    }
+    return missing, extra, stale
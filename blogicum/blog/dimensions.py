@@ -0,0 +1,114 @@
+"""Кэш справочников Category и Location в памяти процесса.
+
+Категорий и местоположений единицы и десятки, поэтому запросы лент
+выбирают только их id, а объекты подставляются отсюда. Таблицы целиком
+перечитываются (вместе со списком категорий с материализованной лентой),
+когда меняется версия области page_cache.DIMENSIONS: её сбрасывают
+сигналы сохранения и удаления Category, Location и CategoryFeed.
+Сброс версии видят только воркеры с тем же бэкендом кэша, а LocMemCache
+у каждого процесса свой, поэтому таблицы перечитываются и просто раз
+в BLOG_DIMENSIONS_TTL секунд: изменения из другого воркера или в обход
+сигналов видны не позже этого срока. Id, которых ещё нет в памяти
+(объект создан между сбросом версии и её чтением), догружаются из базы.
+"""
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+
+from . import page_cache
+from .models import Category, CategoryFeed, Location, Post
+
+Tables = namedtuple(
+    'Tables',
+    ('version', 'loaded_at', 'categories', 'slugs', 'locations', 'feeds')
+)
+
+_lock = threading.Lock()
+_tables = Tables(None, None, {}, {}, {}, frozenset())
+
+
+def _is_stale(tables, version, now):
+    return tables.version != version or (
+        now - tables.loaded_at
+        > getattr(settings, 'BLOG_DIMENSIONS_TTL', 30)
+    )
+
+
+def _load():
+    """Текущие таблицы; при смене версии или по истечении
+    BLOG_DIMENSIONS_TTL перечитывает их из базы"""
+    global _tables
+    version, = page_cache.get_versions([page_cache.DIMENSIONS])
+    now = time.monotonic()
+    if _is_stale(_tables, version, now):
+        with _lock:
+            if _is_stale(_tables, version, now):
+                categories = Category.objects.in_bulk()
+                _tables = Tables(
+                    version=version,
+                    loaded_at=now,
+                    categories=categories,
+                    slugs={
+                        category.slug: category
+                        for category in categories.values()
+                    },
+                    locations=Location.objects.in_bulk(),
+                    feeds=frozenset(CategoryFeed.objects.values_list(
+                        'category_id', flat=True
+                    )),
+                )
+    return _tables
+
+
+def category_by_slug(slug):
+    """Категория по идентификатору или None"""
+    category = _load().slugs.get(slug)
+    if category is None:
+        category = Category.objects.filter(slug=slug).first()
+    return category
+
+
+def category_by_id(category_id):
+    """Категория по id или None"""
+    category = _load().categories.get(category_id)
+    if category is None:
+        category = Category.objects.filter(pk=category_id).first()
+    return category
+
+
+def has_feed(category):
+    """Построена ли для категории материализованная лента"""
+    tables = _load()
+    if category.pk in tables.categories:
+        return category.pk in tables.feeds
+    return CategoryFeed.objects.filter(category=category).exists()
+
+
+def attach(posts):
+    """Подставляет в посты категории и местоположения из памяти"""
+    tables = _load()
+    categories, locations = tables.categories, tables.locations
+    missing = [
+        post.category_id for post in posts
+        if post.category_id is not None and post.category_id not in categories
+    ]
+    if missing:
+        categories = {**categories, **Category.objects.in_bulk(missing)}
+    missing = [
+        post.location_id for post in posts
+        if post.location_id is not None and post.location_id not in locations
+    ]
+    if missing:
+        locations = {**locations, **Location.objects.in_bulk(missing)}
+    for post in posts:
+        if post.category_id is not None:
+            Post.category.field.set_cached_value(
+                post, categories.get(post.category_id)
+            )
+        if post.location_id is not None:
+            Post.location.field.set_cached_value(
+                post, locations.get(post.location_id)
+            )
+    return posts
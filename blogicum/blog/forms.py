@@ -1,4 +1,7 @@
 from django import forms
+from django.contrib.auth import forms as auth_forms
+from django.template import loader
+from tasks import queue
 
 from .models import Comment, Post, User
 
@@ -22,3 +25,23 @@ class UserForm(forms.ModelForm):
     class Meta:
         model = User
         fields = ('first_name', 'last_name', 'username', 'email')
+
+
+class PasswordResetForm(auth_forms.PasswordResetForm):
+    """Письмо сброса пароля отправляет фоновая задача blog.send_mail"""
+
+    def send_mail(self, subject_template_name, email_template_name,
+                  context, from_email, to_email,
+                  html_email_template_name=None):
+        subject = ''.join(
+            loader.render_to_string(subject_template_name, context)
+            .splitlines()
+        )
+        html = None
+        if html_email_template_name is not None:
+            html = loader.render_to_string(html_email_template_name, context)
+        queue.enqueue(
+            'blog.send_mail', subject=subject,
+            body=loader.render_to_string(email_template_name, context),
+            from_email=from_email, to=[to_email], html=html
+        )
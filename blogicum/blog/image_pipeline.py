@@ -0,0 +1,72 @@
+"""Обработка фото публикаций из очереди.
+
+Очередь — публикации, у которых в Post.image_variants стоит pending
+(см. blog.images). Для каждого нового фото сигнал ставит фоновую задачу
+blog.process_image (blog/tasks.py), её выполняет run_tasks. Для
+обработки накопившихся фото разом (например, после
+build_image_variants) команда process_images забирает их порциями и
+отдаёт images.process() в пул процессов: декод и ресайз занимают CPU.
+
+Результат записывается одним UPDATE при условии, что фото за это время
+не сменилось и ещё не обработано; иначе созданные копии удаляются.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.files.storage import default_storage
+
+from . import images, page_cache
+from .models import Post
+from .signals import post_cache_scopes
+
+
+def executor(workers):
+    # fork: дочерним процессам достаются настроенные Django и хранилище.
+    return ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context('fork')
+    )
+
+
+def pending_posts(limit):
+    """Id и имена фото из очереди, старые первыми"""
+    return list(Post.objects.filter(
+        image_variants__pending=True
+    ).order_by('pk').values_list('pk', 'image')[:limit])
+
+
+def is_pending(post_id, name):
+    return Post.objects.filter(
+        pk=post_id, image=name, image_variants__pending=True
+    ).exists()
+
+
+def save_result(post_id, name, data):
+    """Записывает результат images.process(); False — фото сменилось"""
+    updated = Post.objects.filter(
+        pk=post_id, image=name, image_variants__pending=True
+    ).update(image_variants=data)
+    if not updated:
+        images.delete(data, default_storage)
+    return bool(updated)
+
+
+def process_post(post_id, name):
+    """Обрабатывает одно фото, если оно ещё в очереди"""
+    if is_pending(post_id, name) and save_result(
+            post_id, name, images.process(name)):
+        page_cache.bump_on_commit(*post_cache_scopes([post_id]))
+
+
+def process_pending(pool, batch_size):
+    """Обрабатывает порцию очереди; возвращает число обработанных фото"""
+    batch = pending_posts(batch_size)
+    if not batch:
+        return 0
+    results = pool.map(images.process, [name for _, name in batch])
+    done = [
+        post_id for (post_id, name), data in zip(batch, results)
+        if save_result(post_id, name, data)
+    ]
+    if done:
+        page_cache.bump(*post_cache_scopes(done))
+    return len(batch)
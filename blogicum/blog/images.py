@@ -0,0 +1,164 @@
+"""Обработка фото публикаций.
+
+Post.save() только сохраняет загруженный оригинал и ставит фото
+в очередь — записывает в Post.image_variants {"name": ..., "pending":
+true} с размерами из заголовка файла. Остальное делает воркер
+(blog.image_pipeline, команда process_images) в пуле процессов:
+process() декодирует оригинал, поворачивает его по EXIF, перекодирует
+без метаданных и создаёт копии шириной VARIANT_WIDTHS (только меньше
+оригинала). Результат:
+
+    {"name": "birthdays_images/photo.jpg", "width": 3000, "height": 2000,
+     "variants": [{"name": "birthdays_images/variants/photo_320w.jpg",
+                   "width": 320, "height": 213}, ...]}
+
+Шаблон (тег {% post_image %}) выводит из этого srcset, sizes и явные
+width/height, а пока фото в очереди — заглушку PLACEHOLDER тех же
+размеров. Файл, который Pillow не открывает, записывается только
+по имени — выводится оригинал без размеров.
+"""
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.templatetags.static import static
+from PIL import Image, ImageOps
+
+VARIANT_WIDTHS = (320, 640, 1280)
+# Ширина картинки в карточке (40rem) — копия для src по умолчанию.
+DISPLAY_WIDTH = 640
+SIZES = '(max-width: 40rem) 100vw, 40rem'
+JPEG_QUALITY = 82
+# Качество перекодированного оригинала.
+ORIGINAL_QUALITY = 90
+PLACEHOLDER = 'img/placeholder.svg'
+
+
+def variant_name(name, width, extension):
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(
+        directory, 'variants', f'{stem}_{width}w.{extension}'
+    )
+
+
+def _encode(image):
+    """Байты копии и расширение: PNG для прозрачных, иначе JPEG"""
+    buffer = BytesIO()
+    if image.mode in ('RGBA', 'LA') or (
+            image.mode == 'P' and 'transparency' in image.info):
+        image.save(buffer, 'PNG', optimize=True)
+        return buffer.getvalue(), 'png'
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    image.save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True,
+               progressive=True)
+    return buffer.getvalue(), 'jpg'
+
+
+def _strip(image, format):
+    """Оригинал без метаданных, кроме цветового профиля"""
+    buffer = BytesIO()
+    options = {'icc_profile': image.info.get('icc_profile')}
+    if format == 'JPEG':
+        if image.mode not in ('RGB', 'L', 'CMYK'):
+            image = image.convert('RGB')
+        options.update(quality=ORIGINAL_QUALITY, optimize=True)
+    image.save(buffer, format, **options)
+    return buffer.getvalue()
+
+
+def process(name, storage=default_storage):
+    """Обрабатывает сохранённый оригинал; выполняется в процессе воркера
+    и возвращает описание для Post.image_variants"""
+    data = {'name': name}
+    try:
+        with storage.open(name, 'rb') as file, Image.open(file) as original:
+            format = original.format
+            animated = getattr(original, 'is_animated', False)
+            image = ImageOps.exif_transpose(original)
+            width, height = image.size
+            data.update(width=width, height=height, variants=[])
+            if not animated and format in ('JPEG', 'PNG', 'WEBP'):
+                content = _strip(image, format)
+                file.close()
+                with storage.open(name, 'wb') as target:
+                    target.write(content)
+            for target_width in VARIANT_WIDTHS:
+                if target_width >= width:
+                    break
+                size = (target_width,
+                        max(1, round(height * target_width / width)))
+                content, extension = _encode(
+                    image.resize(size, Image.LANCZOS)
+                )
+                variant = storage.save(
+                    variant_name(name, target_width, extension),
+                    ContentFile(content)
+                )
+                data['variants'].append(
+                    {'name': variant, 'width': size[0], 'height': size[1]}
+                )
+    except (OSError, ValueError, Image.DecompressionBombError):
+        delete(data, storage)
+        return {'name': name}
+    return data
+
+
+def pending(file):
+    """Описание фото в очереди: размеры читаются из заголовка файла"""
+    data = {'name': file.name, 'pending': True}
+    try:
+        data.update(width=file.width, height=file.height)
+    except (OSError, ValueError, TypeError):
+        pass
+    return data
+
+
+def delete(data, storage):
+    """Удаляет файлы копий из описания"""
+    for variant in data.get('variants', ()):
+        storage.delete(variant['name'])
+
+
+def refresh(post):
+    """Ставит фото в очередь, если изображение публикации сменилось"""
+    file = post.image
+    old = post.image_variants or {}
+    if (old.get('name') or '') == (file.name or ''):
+        return False
+    if file and not file._committed:
+        # То же, что FileField.pre_save: в очередь попадает имя файла
+        # в хранилище.
+        file.save(file.name, file.file, save=False)
+    post.image_variants = pending(file) if file else {}
+    delete(old, file.storage)
+    return True
+
+
+def attributes(file, data):
+    """src, srcset и размеры тега <img> для изображения публикации"""
+    if data.get('pending'):
+        return {'src': static(PLACEHOLDER), 'srcset': '',
+                'width': data.get('width'), 'height': data.get('height')}
+    variants = sorted(data.get('variants', ()), key=lambda v: v['width'])
+    storage = file.storage
+    candidates = [
+        (storage.url(variant['name']), variant['width'], variant['height'])
+        for variant in variants
+    ]
+    if data.get('width'):
+        candidates.append((file.url, data['width'], data['height']))
+    if not candidates:
+        return {'src': file.url, 'srcset': '', 'width': None, 'height': None}
+    src, width, height = next(
+        (c for c in candidates if c[1] >= DISPLAY_WIDTH), candidates[-1]
+    )
+    return {
+        'src': src,
+        'srcset': ', '.join(f'{url} {w}w' for url, w, _ in candidates)
+        if len(candidates) > 1 else '',
+        'width': width,
+        'height': height,
+    }
@@ -0,0 +1,86 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.template import engines
+
+from blog.models import Post, PostBody, make_excerpt, render_body
+
+
+def chunks(size):
+    """Публикации порциями по size вместе с сохранённым HTML текста"""
+    posts = Post.objects.only('id', 'text', 'excerpt').order_by('pk')
+    last_pk = 0
+    while True:
+        chunk = list(posts.filter(pk__gt=last_pk)[:size])
+        if not chunk:
+            return
+        last_pk = chunk[-1].pk
+        stored = dict(PostBody.objects.filter(
+            post_id__in=[post.pk for post in chunk]
+        ).values_list('post_id', 'html'))
+        yield chunk, stored
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает то, что Post.save() выводит из текста (excerpt и '
+        'HTML текста), для записей, созданных в обход save(). С --check '
+        'только сверяет сохранённый HTML с выводом фильтра linebreaksbr.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Сколько публикаций обрабатывать за раз.'
+        )
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Ничего не менять, сообщить о расхождениях.'
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            return self.check_bodies(options['batch_size'])
+        n_excerpts = n_bodies = 0
+        for chunk, stored in chunks(options['batch_size']):
+            excerpts, bodies = [], []
+            for post in chunk:
+                excerpt = make_excerpt(post.text)
+                if post.excerpt != excerpt:
+                    post.excerpt = excerpt
+                    excerpts.append(post)
+                html = render_body(post.text)
+                if stored.get(post.pk) != html:
+                    bodies.append(PostBody(post_id=post.pk, html=html))
+            with transaction.atomic():
+                Post.objects.bulk_update(excerpts, ['excerpt'])
+                PostBody.objects.filter(
+                    post_id__in=[body.post_id for body in bodies]
+                ).delete()
+                PostBody.objects.bulk_create(bodies)
+            n_excerpts += len(excerpts)
+            n_bodies += len(bodies)
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлено: начало текста — {n_excerpts}, '
+            f'HTML текста — {n_bodies}'
+        ))
+
+    def check_bodies(self, batch_size):
+        """Сверяет PostBody побайтно с выводом {{ post.text|linebreaksbr }}"""
+        template = engines['django'].from_string(
+            '{{ post.text|linebreaksbr }}'
+        )
+        broken = []
+        for chunk, stored in chunks(batch_size):
+            for post in chunk:
+                expected = template.render({'post': post}).encode()
+                if stored.get(post.pk, '').encode() != expected:
+                    broken.append(post.pk)
+        if broken:
+            raise CommandError(
+                f'HTML текста расходится с linebreaksbr у {len(broken)} '
+                'публикаций, например: '
+                + ', '.join(map(str, broken[:10]))
+            )
+        self.stdout.write(
+            self.style.SUCCESS('HTML текста всех публикаций совпадает')
+        )
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+
+from blog import images, page_cache
+from blog.models import Post
+from blog.signals import post_cache_scopes
+from tasks import queue
+
+
+class Command(BaseCommand):
+    help = (
+        'Ставит в очередь обработки фото публикаций, загруженные до '
+        'появления копий или в обход Post.save(). С --force — все фото.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Сколько публикаций обрабатывать за раз.'
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Обработать заново и уже обработанные фото.'
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image='').only(
+            'id', 'image', 'image_variants'
+        ).order_by('pk')
+        last_pk = queued = 0
+        while True:
+            chunk = list(
+                posts.filter(pk__gt=last_pk)[:options['batch_size']]
+            )
+            if not chunk:
+                break
+            last_pk = chunk[-1].pk
+            if not options['force']:
+                # Обработанное или уже стоящее в очереди фото записано
+                # в image_variants под своим именем.
+                chunk = [
+                    post for post in chunk
+                    if post.image_variants.get('name') != post.image.name
+                ]
+            for post in chunk:
+                images.delete(post.image_variants, post.image.storage)
+                post.image_variants = images.pending(post.image)
+            if not chunk:
+                continue
+            # Без save(): дата изменения и сигналы здесь ни к чему.
+            Post.objects.bulk_update(chunk, ['image_variants'])
+            for post in chunk:
+                queue.enqueue('blog.process_image', post_id=post.pk,
+                              name=post.image.name)
+            page_cache.bump(*post_cache_scopes([post.pk for post in chunk]))
+            queued += len(chunk)
+        self.stdout.write(self.style.SUCCESS(
+            f'Поставлено в очередь фото: {queued}. Обработает их '
+            'run_tasks или разом в пуле процессов process_images.'
+        ))
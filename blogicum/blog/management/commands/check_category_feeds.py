@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog import category_feeds, page_cache
+from blog.models import Category
+
+
+class Command(BaseCommand):
+    help = 'Сверяет материализованные ленты категорий с таблицей публикаций'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix', action='store_true',
+            help='Перестроить ленты, в которых найдены расхождения.'
+        )
+
+    def handle(self, *args, **options):
+        broken = []
+        for category in Category.objects.filter(feed__isnull=False):
+            missing, extra, stale = category_feeds.diff(category)
+            if not (missing or extra or stale):
+                continue
+            broken.append(category.slug)
+            self.stdout.write(
+                f'{category.slug}: нет в ленте {len(missing)}, '
+                f'лишних {len(extra)}, с устаревшей датой {len(stale)}'
+            )
+            if options['fix']:
+                category_feeds.rebuild(category)
+                page_cache.bump_on_commit(
+                    page_cache.category_scope(category.slug)
+                )
+        if broken and not options['fix']:
+            raise CommandError(
+                'Расхождения в лентах: ' + ', '.join(broken)
+            )
+        self.stdout.write(self.style.SUCCESS('Ленты категорий согласованы'))
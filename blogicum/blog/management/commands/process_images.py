@@ -0,0 +1,45 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog import image_pipeline
+
+
+class Command(BaseCommand):
+    help = (
+        'Обрабатывает фото из очереди в пуле процессов: поворот по EXIF, '
+        'удаление метаданных, уменьшенные копии. С --loop работает '
+        'постоянно.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count(),
+            help='Число процессов пула (по умолчанию — число CPU).'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Сколько фото забирать из очереди за раз.'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а ждать новых фото.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=2,
+            help='Пауза между проверками пустой очереди с --loop, секунд.'
+        )
+
+    def handle(self, *args, **options):
+        with image_pipeline.executor(options['workers']) as pool:
+            while True:
+                processed = image_pipeline.process_pending(
+                    pool, options['batch_size']
+                )
+                if processed:
+                    self.stdout.write(f'Обработано фото: {processed}')
+                elif not options['loop']:
+                    return
+                else:
+                    time.sleep(options['interval'])
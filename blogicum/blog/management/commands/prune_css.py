@@ -0,0 +1,106 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import forms as auth_forms
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+from django.template import Context, Template, loader
+
+from blog import forms
+from blog.models import User
+from core import css
+
+SOURCE = 'css/bootstrap.min.css'
+PRUNED = 'css/bootstrap.pruned.css'
+CRITICAL = 'css/critical.css'
+# Шапка, подвал и карточки ленты — то, что видно до прокрутки.
+CRITICAL_TEMPLATES = (
+    'base.html', 'includes/header.html', 'includes/footer.html',
+    'includes/post_card.html', 'includes/post_image.html',
+    'includes/category_link.html',
+)
+FORM_MARKUP = Template(
+    '{% load django_bootstrap5 %}{% bootstrap_form form %}'
+    '{% bootstrap_button button_type="submit" content="-" %}'
+)
+
+
+def template_paths():
+    for directory in settings.TEMPLATES[0]['DIRS']:
+        yield from sorted(Path(directory).glob('**/*.html'))
+
+
+def _forms():
+    user = User()
+    return (
+        forms.BlogForm, forms.CommentForm, forms.UserForm,
+        forms.PasswordResetForm, auth_forms.AuthenticationForm,
+        auth_forms.UserCreationForm,
+        lambda **kwargs: auth_forms.PasswordChangeForm(user, **kwargs),
+        lambda **kwargs: auth_forms.SetPasswordForm(user, **kwargs),
+    )
+
+
+def form_markup():
+    """Разметка форм из {% bootstrap_form %}: пустых и с ошибками"""
+    for form_class in _forms():
+        for bound in (False, True):
+            form = form_class(data={}) if bound else form_class()
+            for field in form.fields.values():
+                # Варианты выбора из базы не должны менять результат.
+                if hasattr(field, 'queryset'):
+                    field.queryset = field.queryset.none()
+            if bound:
+                form.is_valid()
+                form.add_error(None, '-')
+            yield FORM_MARKUP.render(Context({'form': form}))
+
+
+def markup():
+    """Тексты, в которых ищутся используемые классы"""
+    for path in template_paths():
+        yield path.read_text(encoding='utf-8')
+    yield from form_markup()
+
+
+class Command(BaseCommand):
+    help = (
+        f'Пишет {PRUNED} — {SOURCE} без правил для классов, которых нет '
+        f'в шаблонах и формах, — и {CRITICAL} для встраивания в '
+        'base.html. С --check только проверяет, что файлы актуальны.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Завершиться с ошибкой, если файлы нужно пересобрать.'
+        )
+
+    def handle(self, *args, **options):
+        source = Path(finders.find(SOURCE))
+        static_dir = source.parent.parent
+        full = source.read_text(encoding='utf-8')
+        pruned = css.prune(full, css.used_words(markup()))
+        critical = css.prune(pruned, css.used_words(
+            loader.get_template(name).template.source
+            for name in CRITICAL_TEMPLATES
+        ))
+        outputs = {PRUNED: pruned, CRITICAL: critical}
+        if options['check']:
+            stale = [
+                name for name, content in outputs.items()
+                if not (static_dir / name).is_file()
+                or (static_dir / name).read_text(encoding='utf-8')
+                != content
+            ]
+            if stale:
+                raise CommandError(
+                    f'Устарели {", ".join(stale)}: запустите prune_css.'
+                )
+            return
+        for name, content in outputs.items():
+            (static_dir / name).write_text(content, encoding='utf-8')
+        self.stdout.write(self.style.SUCCESS(
+            f'{SOURCE}: {len(full)} Б, {PRUNED}: {len(pruned)} Б, '
+            f'{CRITICAL}: {len(critical)} Б.'
+        ))
@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog import scheduler
+
+
+class Command(BaseCommand):
+    help = (
+        'Публикует отложенные посты, дата которых наступила. '
+        'С --loop работает постоянно, просыпаясь к дате ближайшей публикации.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а ждать следующих публикаций.'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            post_ids = scheduler.publish_due_posts()
+            if post_ids:
+                self.stdout.write(f'Опубликовано постов: {len(post_ids)}')
+            if not options['loop']:
+                return
+            time.sleep(self.seconds_to_next_due())
+
+    @staticmethod
+    def seconds_to_next_due():
+        """Сон до ближайшей публикации, но не дольше интервала пересверки"""
+        limit = scheduler.resync_interval().total_seconds()
+        next_due = scheduler.next_due_date()
+        if next_due is None:
+            return limit
+        delay = (next_due - timezone.now()).total_seconds()
+        return min(max(delay, 0), limit)
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Q
+
+from blog import category_feeds, page_cache
+from blog.models import Category
+
+
+class Command(BaseCommand):
+    help = (
+        'Строит материализованные ленты категорий. Без аргументов — для '
+        'всех категорий, где видимых публикаций не меньше --min-posts.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'slugs', nargs='*',
+            help='Идентификаторы категорий.'
+        )
+        parser.add_argument(
+            '--min-posts', type=int, default=0,
+            help='Пропускать категории с меньшим числом публикаций.'
+        )
+        parser.add_argument(
+            '--drop', action='store_true',
+            help='Удалить ленты: страницы вернутся к запросу по публикациям.'
+        )
+
+    def handle(self, *args, **options):
+        categories = Category.objects.all()
+        if options['slugs']:
+            categories = categories.filter(slug__in=options['slugs'])
+            unknown = set(options['slugs']) - set(
+                categories.values_list('slug', flat=True)
+            )
+            if unknown:
+                raise CommandError(
+                    'Нет категорий: ' + ', '.join(sorted(unknown))
+                )
+        elif options['min_posts'] and not options['drop']:
+            categories = categories.annotate(
+                total=Count('posts', filter=Q(
+                    posts__is_live=True, posts__is_published=True
+                ))
+            ).filter(total__gte=options['min_posts'])
+        for category in categories:
+            if options['drop']:
+                category_feeds.drop(category)
+                self.stdout.write(f'{category.slug}: лента удалена')
+            else:
+                total = category_feeds.rebuild(category)
+                self.stdout.write(f'{category.slug}: записей {total}')
+            page_cache.bump_on_commit(page_cache.category_scope(category.slug))
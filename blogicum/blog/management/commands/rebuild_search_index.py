@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from blog import search
+
+
+class Command(BaseCommand):
+    help = (
+        'Перестраивает полнотекстовый индекс публикаций (FTS5) и '
+        'пересоздаёт триггеры, которые поддерживают его в актуальном '
+        'состоянии'
+    )
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            raise CommandError('Полнотекстовый индекс есть только в SQLite.')
+        with transaction.atomic(), connection.cursor() as cursor:
+            search.create_triggers(cursor)
+            search.rebuild(cursor)
+            cursor.execute('SELECT COUNT(*) FROM blog_post')
+            total = cursor.fetchone()[0]
+        self.stdout.write(
+            self.style.SUCCESS(f'Проиндексировано публикаций: {total}')
+        )
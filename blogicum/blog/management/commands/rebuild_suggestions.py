@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from blog import suggestions
+
+
+class Command(BaseCommand):
+    help = (
+        'Перестраивает префиксный индекс подсказок поиска по видимым '
+        'публикациям, опубликованным категориям и активным пользователям'
+    )
+
+    def handle(self, *args, **options):
+        total = suggestions.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f'Строк в индексе подсказок: {total}')
+        )
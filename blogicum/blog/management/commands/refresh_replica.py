@@ -0,0 +1,46 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from blog import replica
+
+
+class Command(BaseCommand):
+    help = (
+        'Снимает копию основной SQLite-базы в файл реплики через online '
+        'backup API; с --interval повторяет снимок каждые N секунд'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float,
+            help='Обновлять реплику каждые N секунд (меньше '
+                 'BLOG_REPLICA_LAG_BUDGET), пока команду не остановят.'
+        )
+
+    def handle(self, *args, **options):
+        if not replica.is_configured():
+            raise CommandError('В DATABASES нет алиаса replica.')
+        source = settings.DATABASES[DEFAULT_DB_ALIAS]
+        target = settings.DATABASES[replica.REPLICA]
+        if not all(database['ENGINE'].endswith('sqlite3')
+                   for database in (source, target)):
+            raise CommandError('Копию снимает только SQLite → SQLite.')
+        interval = options['interval']
+        if interval is not None and interval >= replica.lag_budget():
+            self.stderr.write(self.style.WARNING(
+                'Интервал не меньше BLOG_REPLICA_LAG_BUDGET: часть времени '
+                'реплика будет считаться устаревшей.'
+            ))
+        while True:
+            started = time.monotonic()
+            replica.refresh(source['NAME'], target['NAME'])
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f'Реплика обновлена за {elapsed * 1000:.0f} мс'
+            )
+            if interval is None:
+                return
+            time.sleep(max(0, interval - elapsed))
@@ -0,0 +1,33 @@
+from django.utils.deprecation import MiddlewareMixin
+
+from . import replica, scheduler
+
+# MiddlewareMixin поддерживает и синхронный, и асинхронный режим: под
+# ASGI цепочка не переключается в поток целиком ради одного middleware.
+
+
+class PublicationSchedulerMiddleware(MiddlewareMixin):
+    """Публикует отложенные посты, дата которых наступила"""
+
+    def process_request(self, request):
+        scheduler.publish_if_due()
+
+
+class ReplicaRoutingMiddleware(MiddlewareMixin):
+    """Направляет чтение представлений с read_from_replica в реплику"""
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        if (getattr(view_class, 'read_from_replica', False)
+                and request.method in ('GET', 'HEAD')
+                and replica.is_configured()
+                and not replica.is_pinned(request)
+                and replica.is_fresh()):
+            replica.close_outdated_connection()
+            replica.set_reading(True)
+
+    def process_response(self, request, response):
+        replica.set_reading(False)
+        if request.method not in ('GET', 'HEAD', 'OPTIONS', 'TRACE'):
+            replica.pin(response)
+        return response
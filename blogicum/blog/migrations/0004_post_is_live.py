@@ -0,0 +1,33 @@
+# Generated by Django 3.2.16 on 2026-10-17 07:25
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def mark_live_posts(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Post.objects.filter(pub_date__lte=timezone.now()).update(is_live=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0003_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='post',
+            name='post_feed_idx',
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='is_live',
+            field=models.BooleanField(default=False, editable=False, help_text='Выставляется при сохранении и планировщиком публикаций в момент наступления даты публикации.', verbose_name='Дата публикации наступила'),
+        ),
+        migrations.RunPython(mark_live_posts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_live', True), ('is_published', True)), fields=['pub_date'], name='post_live_feed_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 3.2.16 on 2026-10-17 07:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryFeedEntry',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('pub_date', models.DateTimeField(verbose_name='Дата и время публикации')),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='blog.category', verbose_name='Категория')),
+            ],
+            options={
+                'verbose_name': 'запись ленты категории',
+                'verbose_name_plural': 'Записи лент категорий',
+            },
+        ),
+        migrations.CreateModel(
+            name='CategoryFeed',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rebuilt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Перестроена')),
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='feed', to='blog.category', verbose_name='Категория')),
+            ],
+            options={
+                'verbose_name': 'лента категории',
+                'verbose_name_plural': 'Ленты категорий',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='categoryfeedentry',
+            index=models.Index(fields=['category', 'pub_date'], name='category_feed_entry_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 3.2.16 on 2026-10-17 07:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+from django.template.defaultfilters import linebreaksbr
+
+
+def fill_post_bodies(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    PostBody = apps.get_model('blog', 'PostBody')
+    batch = []
+    for post in Post.objects.only('id', 'text').iterator(chunk_size=500):
+        batch.append(PostBody(
+            post_id=post.id, html=linebreaksbr(post.text, autoescape=True)
+        ))
+        if len(batch) == 500:
+            PostBody.objects.bulk_create(batch)
+            batch = []
+    PostBody.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_post_excerpt'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostBody',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('html', models.TextField(verbose_name='HTML текста')),
+            ],
+            options={
+                'verbose_name': 'HTML текста публикации',
+                'verbose_name_plural': 'HTML текстов публикаций',
+            },
+        ),
+        migrations.RunPython(fill_post_bodies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+from django.db import migrations
+
+# SQL на момент миграции: последующие правки blog.search её не меняют.
+FTS_TABLE = 'blog_post_fts'
+TRIGGERS = ('blog_post_fts_insert', 'blog_post_fts_delete',
+            'blog_post_fts_update')
+TITLE = "replace(replace(title, 'ё', 'е'), 'Ё', 'Е')"
+TEXT = "replace(replace(text, 'ё', 'е'), 'Ё', 'Е')"
+NEW = (
+    "new.id, replace(replace(new.title, 'ё', 'е'), 'Ё', 'Е'), "
+    "replace(replace(new.text, 'ё', 'е'), 'Ё', 'Е')"
+)
+OLD = (
+    "old.id, replace(replace(old.title, 'ё', 'е'), 'Ё', 'Е'), "
+    "replace(replace(old.text, 'ё', 'е'), 'Ё', 'Е')"
+)
+CREATE = (
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+    "title, text, content='blog_post', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    f'CREATE TRIGGER blog_post_fts_insert AFTER INSERT ON blog_post BEGIN '
+    f'INSERT INTO {FTS_TABLE}(rowid, title, text) VALUES ({NEW}); END',
+    f'CREATE TRIGGER blog_post_fts_delete AFTER DELETE ON blog_post BEGIN '
+    f'INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text) '
+    f"VALUES ('delete', {OLD}); END",
+    f'CREATE TRIGGER blog_post_fts_update AFTER UPDATE OF title, text '
+    f'ON blog_post BEGIN '
+    f'INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text) '
+    f"VALUES ('delete', {OLD}); "
+    f'INSERT INTO {FTS_TABLE}(rowid, title, text) VALUES ({NEW}); END',
+    f'INSERT INTO {FTS_TABLE}(rowid, title, text) '
+    f'SELECT id, {TITLE}, {TEXT} FROM blog_post',
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')",
+)
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in CREATE:
+        schema_editor.execute(sql)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for trigger in TRIGGERS:
+        schema_editor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_post_body'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
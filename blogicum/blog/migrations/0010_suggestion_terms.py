@@ -0,0 +1,87 @@
+# Generated by Django 3.2.16 on 2026-10-17 08:23
+
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Ключи как в blog.suggestions на момент миграции: её результат не должен
+# зависеть от последующих правок модуля.
+WORD_RE = re.compile(r'\w+')
+KEY_LENGTH = 64
+MAX_WORDS = 16
+
+
+def keys(label):
+    words = WORD_RE.findall(
+        label.replace('ё', 'е').replace('Ё', 'Е').lower()
+    )[:MAX_WORDS]
+    result = []
+    for i in range(len(words)):
+        key = ' '.join(words[i:])[:KEY_LENGTH]
+        if key not in result:
+            result.append(key)
+    return result
+
+
+def fill_suggestions(apps, schema_editor):
+    SuggestionTerm = apps.get_model('blog', 'SuggestionTerm')
+    sources = (
+        ('post', apps.get_model('blog', 'Post').objects.filter(
+            is_live=True, is_published=True, category__is_published=True
+        ), 'title'),
+        ('category', apps.get_model('blog', 'Category').objects.filter(
+            is_published=True
+        ), 'title'),
+        ('user', apps.get_model(settings.AUTH_USER_MODEL).objects.filter(
+            is_active=True
+        ), 'username'),
+    )
+    for kind, queryset, field in sources:
+        batch = []
+        for object_id, label in queryset.values_list(
+                'id', field).order_by().iterator(chunk_size=500):
+            batch.extend(
+                SuggestionTerm(
+                    kind=kind, object_id=object_id, key=key, label=label
+                )
+                for key in keys(label)
+            )
+            if len(batch) >= 500:
+                SuggestionTerm.objects.bulk_create(batch)
+                batch = []
+        SuggestionTerm.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0009_post_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SuggestionTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('post', 'Публикация'), ('category', 'Категория'), ('user', 'Пользователь')], max_length=8, verbose_name='Тип объекта')),
+                ('object_id', models.PositiveIntegerField(verbose_name='Id объекта')),
+                ('key', models.CharField(help_text='Нормализованный текст начиная с одного из слов.', max_length=64, verbose_name='Ключ')),
+                ('label', models.CharField(max_length=256, verbose_name='Подсказка')),
+            ],
+            options={
+                'verbose_name': 'подсказка поиска',
+                'verbose_name_plural': 'Подсказки поиска',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='suggestionterm',
+            index=models.Index(fields=['kind', 'key'], name='suggestion_prefix_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='suggestionterm',
+            index=models.Index(fields=['kind', 'object_id'], name='suggestion_object_idx'),
+        ),
+        migrations.RunPython(fill_suggestions, migrations.RunPython.noop),
+    ]
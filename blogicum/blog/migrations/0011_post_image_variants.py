@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-17 08:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_suggestion_terms'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_variants',
+            field=models.JSONField(default=dict, editable=False, help_text='Уменьшенные копии фото и их размеры; выставляются при сохранении.', verbose_name='Копии фото'),
+        ),
+    ]
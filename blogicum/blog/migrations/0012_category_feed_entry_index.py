@@ -0,0 +1,21 @@
+# Generated by Django 3.2.16 on 2026-10-17 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_post_image_variants'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='categoryfeedentry',
+            name='category_feed_entry_idx',
+        ),
+        migrations.AddIndex(
+            model_name='categoryfeedentry',
+            index=models.Index(fields=['category', 'pub_date', 'post'], name='category_feed_entry_idx'),
+        ),
+    ]
@@ -1,10 +1,27 @@
 from core.models import PublishedModel
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.template.defaultfilters import linebreaksbr
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.text import Truncator
+
+from . import images
 
 User = get_user_model()
 
+EXCERPT_WORDS = 10
+
+
+def make_excerpt(text):
+    """То же, что фильтр truncatewords:10 в карточке поста"""
+    return Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+
+
+def render_body(text):
+    """То же, что {{ post.text|linebreaksbr }} с автоэкранированием"""
+    return linebreaksbr(text, autoescape=True)
+
 
 class Category(PublishedModel):
     title = models.CharField(max_length=256, verbose_name='Заголовок')
@@ -40,6 +57,13 @@ class Location(PublishedModel):
 class Post(PublishedModel):
     title = models.CharField(max_length=256, verbose_name='Заголовок')
     text = models.TextField(verbose_name='Текст')
+    excerpt = models.TextField(
+        default='',
+        editable=False,
+        verbose_name='Начало текста',
+        help_text='Первые слова текста для карточки; выставляется при '
+                  'сохранении.'
+    )
     pub_date = models.DateTimeField(
         verbose_name='Дата и время публикации',
         help_text=(
@@ -69,12 +93,67 @@ class Post(PublishedModel):
         verbose_name='Фото',
         upload_to='birthdays_images',
         blank=True)
+    image_variants = models.JSONField(
+        default=dict,
+        editable=False,
+        verbose_name='Копии фото',
+        help_text='Уменьшенные копии фото и их размеры; выставляются при '
+                  'сохранении.'
+    )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
+    is_live = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Дата публикации наступила',
+        help_text=(
+            'Выставляется при сохранении и планировщиком публикаций '
+            'в момент наступления даты публикации.'
+        )
+    )
 
     class Meta:
         default_related_name = 'posts'
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(
+                fields=('pub_date',),
+                condition=models.Q(is_published=True, is_live=True),
+                name='post_live_feed_idx',
+            ),
+            models.Index(
+                fields=('category', 'pub_date'),
+                name='post_category_feed_idx',
+            ),
+            models.Index(
+                fields=('author', 'pub_date'),
+                name='post_author_feed_idx',
+            ),
+        )
+
+    def save(self, *args, **kwargs):
+        self.is_live = self.pub_date <= timezone.now()
+        self.excerpt = make_excerpt(self.text)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'pub_date' in update_fields:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'is_live'}
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'excerpt'}
+        if update_fields is None or 'image' in update_fields:
+            if images.refresh(self) and update_fields is not None:
+                kwargs['update_fields'] = {
+                    *kwargs['update_fields'], 'image_variants'
+                }
+        super().save(*args, **kwargs)
+        if update_fields is None or 'text' in update_fields:
+            PostBody.objects.update_or_create(
+                post=self, defaults={'html': render_body(self.text)}
+            )
 
     def get_absolute_url(self):
         return reverse('blog:profile', kwargs={'name': self.author})
@@ -95,6 +174,119 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ('created_at',)
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx',
+            ),
+        )
 
     def get_absolute_url(self):
         return reverse('post_detail', kwargs={'pk': self.post})
+
+
+class CategoryFeed(models.Model):
+    """Отметка, что для категории построена материализованная лента"""
+    category = models.OneToOneField(
+        Category,
+        on_delete=models.CASCADE,
+        related_name='feed',
+        verbose_name='Категория'
+    )
+    rebuilt_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Перестроена'
+    )
+
+    class Meta:
+        verbose_name = 'лента категории'
+        verbose_name_plural = 'Ленты категорий'
+
+    def __str__(self):
+        return str(self.category)
+
+
+class CategoryFeedEntry(models.Model):
+    """Видимая публикация в материализованной ленте категории"""
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='+',
+        verbose_name='Публикация'
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        verbose_name='Категория'
+    )
+    pub_date = models.DateTimeField(verbose_name='Дата и время публикации')
+
+    class Meta:
+        verbose_name = 'запись ленты категории'
+        verbose_name_plural = 'Записи лент категорий'
+        indexes = (
+            # post_id — не псевдоним rowid (bigint PRIMARY KEY), поэтому
+            # второй ключ сортировки ленты включён в индекс явно.
+            models.Index(
+                fields=('category', 'pub_date', 'post'),
+                name='category_feed_entry_idx',
+            ),
+        )
+
+
+class PostBody(models.Model):
+    """Текст публикации, заранее обработанный фильтром linebreaksbr"""
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='+',
+        verbose_name='Публикация'
+    )
+    html = models.TextField(verbose_name='HTML текста')
+
+    class Meta:
+        verbose_name = 'HTML текста публикации'
+        verbose_name_plural = 'HTML текстов публикаций'
+
+
+class SuggestionTerm(models.Model):
+    """Строка префиксного индекса подсказок поиска (blog.suggestions)"""
+    POST = 'post'
+    CATEGORY = 'category'
+    USER = 'user'
+    KINDS = (
+        (POST, 'Публикация'),
+        (CATEGORY, 'Категория'),
+        (USER, 'Пользователь'),
+    )
+
+    kind = models.CharField(
+        max_length=8, choices=KINDS, verbose_name='Тип объекта'
+    )
+    object_id = models.PositiveIntegerField(verbose_name='Id объекта')
+    key = models.CharField(
+        max_length=64,
+        verbose_name='Ключ',
+        help_text='Нормализованный текст начиная с одного из слов.'
+    )
+    label = models.CharField(max_length=256, verbose_name='Подсказка')
+
+    class Meta:
+        verbose_name = 'подсказка поиска'
+        verbose_name_plural = 'Подсказки поиска'
+        indexes = (
+            models.Index(
+                fields=('kind', 'key'),
+                name='suggestion_prefix_idx',
+            ),
+            models.Index(
+                fields=('kind', 'object_id'),
+                name='suggestion_object_idx',
+            ),
+        )
+
+    def __str__(self):
+        return self.label
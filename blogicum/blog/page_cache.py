@@ -0,0 +1,143 @@
+"""Версионированный кэш страниц для анонимных читателей.
+
+Ключ страницы состоит из адреса запроса и версий «областей», от которых
+зависит её содержимое: лента, категория, публикация, профиль и общие
+справочники (категории и местоположения). Сохранение или удаление
+объекта сбрасывает версии только затронутых областей, после чего старые
+ключи просто перестают запрашиваться и вытесняются по таймауту.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+FEED = 'feed'
+DIMENSIONS = 'dimensions'
+
+VERSION_PREFIX = 'blog:version:'
+PAGE_PREFIX = 'blog:page:'
+CARD_PREFIX = 'blog:card:'
+COUNT_PREFIX = 'blog:count:'
+MODIFIED_PREFIX = 'blog:modified:'
+BUMPED_AT_KEY = 'blog:bumped_at'
+
+
+def category_scope(slug):
+    return f'category:{slug}'
+
+
+def post_scope(post_id):
+    return f'post:{post_id}'
+
+
+def profile_scope(username):
+    return f'profile:{username}'
+
+
+def get_versions(scopes):
+    """Текущие версии областей; отсутствующие создаются заново.
+
+    Новая версия — уникальное значение, а не 1, чтобы после вытеснения
+    ключа версии из кэша не вернуться к ключам устаревших страниц.
+    """
+    keys = [VERSION_PREFIX + scope for scope in scopes]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump(*scopes):
+    """Сбрасывает версии областей и запоминает время сброса"""
+    cache.delete_many([VERSION_PREFIX + scope for scope in scopes if scope])
+    cache.set(BUMPED_AT_KEY, time.time(), None)
+
+
+def last_bump():
+    """Время последнего сброса версий (по нему проверяется реплика)"""
+    return cache.get(BUMPED_AT_KEY, 0)
+
+
+def bump_on_commit(*scopes):
+    """Сбрасывает версии сразу и ещё раз после фиксации транзакции.
+
+    Повторный сброс не даёт параллельному запросу закэшировать страницу,
+    прочитанную до фиксации изменений.
+    """
+    bump(*scopes)
+    transaction.on_commit(lambda: bump(*scopes))
+
+
+def page_key(request, scopes):
+    versions = '.'.join(str(version) for version in get_versions(scopes))
+    raw = f'{request.get_full_path()}|{versions}'
+    return PAGE_PREFIX + hashlib.md5(raw.encode()).hexdigest()
+
+
+def card_keys(posts):
+    """Ключи кэша карточек: id поста, версия поста и справочников"""
+    versions = get_versions(
+        [post_scope(post.pk) for post in posts] + [DIMENSIONS]
+    )
+    dimensions = versions.pop()
+    return [
+        f'{CARD_PREFIX}{post.pk}:{version}.{dimensions}'
+        for post, version in zip(posts, versions)
+    ]
+
+
+def etag(request, scopes):
+    """ETag страницы: версии её областей, текущий пользователь и, для
+    авторизованного, секрет CSRF — login() его меняет, и страница
+    с формой и старым токеном не должна доставаться из кэша браузера"""
+    versions = '.'.join(str(version) for version in get_versions(scopes))
+    raw = f'{request.get_full_path()}|{versions}|{request.user.pk}'
+    if request.user.is_authenticated:
+        raw += f'|{request.META.get("CSRF_COOKIE", "")}'
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def modified_key(request, scopes):
+    """Ключ даты последнего изменения страницы с учётом версий областей"""
+    versions = '.'.join(str(version) for version in get_versions(scopes))
+    raw = f'{request.path}|{versions}'
+    return MODIFIED_PREFIX + hashlib.md5(raw.encode()).hexdigest()
+
+
+def count_key(queryset, scopes):
+    """Ключ COUNT(*) запроса ленты с учётом версий областей"""
+    sql, params = queryset.query.sql_with_params()
+    versions = '.'.join(str(version) for version in get_versions(scopes))
+    raw = f'{sql}|{params}|{versions}'
+    return COUNT_PREFIX + hashlib.md5(raw.encode()).hexdigest()
+
+
+def timeout():
+    return getattr(settings, 'BLOG_PAGE_CACHE_TIMEOUT', 600)
+
+
+def card_timeout():
+    return getattr(settings, 'BLOG_CARD_CACHE_TIMEOUT', 3600)
+
+
+def count_timeout():
+    return getattr(settings, 'BLOG_COUNT_CACHE_TIMEOUT', 60)
+
+
+def is_cacheable(request):
+    return request.method in ('GET', 'HEAD') and (
+        not request.user.is_authenticated
+    )
+
+
+def is_cacheable_response(response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and 'private' not in response.get('Cache-Control', '')
+    )
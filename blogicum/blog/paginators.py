@@ -0,0 +1,167 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Paginator
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+from . import page_cache
+
+NEXT = 'n'
+PREVIOUS = 'p'
+# Наибольший id: INTEGER PRIMARY KEY в SQLite — знаковое 64-битное.
+MAX_PK = 2 ** 63 - 1
+
+
+def encode_cursor(post, direction):
+    """Упаковывает ключ (pub_date, id) публикации в непрозрачный токен"""
+    raw = json.dumps(
+        [direction, post.pub_date.isoformat(), post.pk],
+        separators=(',', ':')
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Распаковывает токен; при ошибке поднимает InvalidPage"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        direction, pub_date, pk = json.loads(
+            base64.urlsafe_b64decode(padded.encode())
+        )
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+    except (binascii.Error, ValueError, TypeError, UnicodeError):
+        raise InvalidPage('Некорректный курсор.')
+    # pk за пределами INTEGER SQLite дал бы OverflowError при запросе.
+    if (direction not in (NEXT, PREVIOUS) or pub_date is None
+            or not 0 <= pk <= MAX_PK):
+        raise InvalidPage('Некорректный курсор.')
+    return direction, pub_date, pk
+
+
+class CursorPage(Sequence):
+    """Страница ленты, полученная по курсору (без номера и COUNT)"""
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.next_cursor = (
+            encode_cursor(object_list[-1], NEXT) if has_next else None
+        )
+        self.previous_cursor = (
+            encode_cursor(object_list[0], PREVIOUS) if has_previous else None
+        )
+
+    def __repr__(self):
+        return '<Cursor page>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Keyset-пагинация по (pub_date, id) в порядке убывания.
+
+    Вместо OFFSET страница выбирается условием по ключу последней
+    (или первой) публикации предыдущей страницы, поэтому время ответа
+    не зависит от глубины страницы и не требует COUNT(*). Условие
+    записано как диапазон по pub_date с исключением строк той же даты
+    по id: OR двух условий SQLite не использует как границу индекса и
+    прошёл бы индекс от начала ленты до курсора. Подходит для
+    любой модели с полем pub_date: публикаций и записей лент категорий.
+    """
+
+    ordering = ('-pub_date', '-pk')
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+
+    def page(self, cursor=None):
+        """Страница после (или перед) курсором; без курсора — первая"""
+        if cursor is None:
+            rows = list(
+                self.queryset.order_by(*self.ordering)[:self.per_page + 1]
+            )
+            has_next, has_previous = len(rows) > self.per_page, False
+            rows = rows[:self.per_page]
+            return CursorPage(rows, self, has_next, has_previous)
+        direction, pub_date, pk = decode_cursor(cursor)
+        if direction == NEXT:
+            rows = list(
+                self.queryset.filter(pub_date__lte=pub_date).exclude(
+                    pub_date=pub_date, pk__gte=pk
+                ).order_by(*self.ordering)[:self.per_page + 1]
+            )
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            has_next, has_previous = has_more, True
+        else:
+            rows = list(
+                self.queryset.filter(pub_date__gte=pub_date).exclude(
+                    pub_date=pub_date, pk__lte=pk
+                ).order_by('pub_date', 'pk')[:self.per_page + 1]
+            )
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            has_next, has_previous = True, has_more
+        if not rows:
+            raise InvalidPage('Страница пуста.')
+        return CursorPage(rows, self, has_next, has_previous)
+
+    def attach_cursors(self, page):
+        """Добавляет курсоры соседних страниц к обычной странице Paginator"""
+        page.next_cursor = (
+            encode_cursor(page[-1], NEXT) if page.has_next() else None
+        )
+        page.previous_cursor = (
+            encode_cursor(page[0], PREVIOUS) if page.has_previous() else None
+        )
+        return page
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator, который берёт COUNT(*) ленты из кэша.
+
+    Ключ счётчика включает SQL запроса и версии областей page_cache,
+    поэтому изменения через модели и сигналы (новый пост, снятие с
+    публикации, планировщик, смена категории) сразу дают новый подсчёт.
+    Изменения в обход сигналов (bulk_create, QuerySet.update, сырой SQL)
+    видны только по истечении BLOG_COUNT_CACHE_TIMEOUT: до этого
+    num_pages может отличаться от настоящего, последняя страница
+    оказаться пустой или недоступной по номеру. Переходы по курсорам
+    (<<, >>) от счётчика не зависят.
+    """
+
+    def __init__(self, object_list, per_page, *args, scopes=None, **kwargs):
+        super().__init__(object_list, per_page, *args, **kwargs)
+        self.scopes = scopes
+
+    @cached_property
+    def count(self):
+        if self.scopes is None:
+            return super().count
+        key = page_cache.count_key(self.object_list, self.scopes)
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, page_cache.count_timeout())
+        return count
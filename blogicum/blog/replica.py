@@ -0,0 +1,151 @@
+"""Чтение из реплики базы данных.
+
+Представления с атрибутом read_from_replica = True (ленты, страница
+публикации, профиль, статические страницы) на GET и HEAD читают из
+алиаса REPLICA; запись и все остальные запросы идут в основную базу.
+Переключение делает ReplicaRoutingMiddleware через контекстную
+переменную, ReplicaRouter только читает её.
+
+Допустимое отставание реплики — BLOG_REPLICA_LAG_BUDGET секунд:
+- после любого изменяющего запроса (POST и т. п.) пользователь получает
+  cookie и столько же секунд читает из основной базы — видит свои записи,
+  в том числе новую сессию после входа;
+- реплика старше этого срока (не обновляется) не используется.
+
+Для разработки реплика — копия SQLite-файла, которую снимает команда
+refresh_replica через online backup API; время снимка — mtime файла.
+Снимок, сделанный раньше последнего сброса версий page_cache, тоже не
+используется: иначе страницы и карточки со старыми данными попали бы
+в кэш под новыми версиями. Для реплики не на SQLite время снимка
+неизвестно, и она считается актуальной. Постоянное соединение
+(CONN_MAX_AGE) с прежним снимком закрывается перед чтением.
+"""
+import os
+import sqlite3
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from . import page_cache
+
+REPLICA = 'replica'
+PIN_COOKIE = 'blog_primary_until'
+
+_reading_replica = ContextVar('reading_replica', default=False)
+
+
+def lag_budget():
+    return getattr(settings, 'BLOG_REPLICA_LAG_BUDGET', 5)
+
+
+def is_configured():
+    return REPLICA in settings.DATABASES
+
+
+def snapshot_time():
+    """Время снимка SQLite-реплики; 0 — реплики нет, None — не SQLite"""
+    database = settings.DATABASES[REPLICA]
+    if not database['ENGINE'].endswith('sqlite3'):
+        return None
+    try:
+        return os.stat(database['NAME']).st_mtime
+    except OSError:
+        return 0
+
+
+def is_fresh():
+    """Снимок не старше бюджета отставания и последних изменений"""
+    snapshot = snapshot_time()
+    if snapshot is None:
+        return True
+    return (time.time() - snapshot <= lag_budget()
+            and snapshot >= page_cache.last_bump())
+
+
+def is_pinned(request):
+    """Пользователь недавно что-то изменил и читает из основной базы"""
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def pin(response):
+    budget = lag_budget()
+    response.set_cookie(
+        PIN_COOKIE, str(time.time() + budget), max_age=max(1, int(budget)),
+        httponly=True, samesite='Lax'
+    )
+
+
+def remember_snapshot(connection):
+    """Запоминает, какой снимок открыло новое соединение с репликой"""
+    connection.blog_snapshot = snapshot_time()
+
+
+def close_outdated_connection():
+    """Закрывает постоянное (CONN_MAX_AGE) соединение со старым снимком.
+
+    refresh() подменяет файл реплики, а открытое соединение продолжает
+    читать прежний файл.
+    """
+    connection = connections[REPLICA]
+    if connection.connection is not None and (
+            getattr(connection, 'blog_snapshot', None) != snapshot_time()):
+        connection.close()
+
+
+def set_reading(value):
+    """Включает или выключает чтение из реплики в текущем контексте"""
+    _reading_replica.set(value)
+
+
+def reading_replica():
+    return _reading_replica.get()
+
+
+def refresh(source, target):
+    """Снимает копию SQLite-базы source в target.
+
+    Копия собирается во временном файле и подменяет target атомарно:
+    открытые соединения дочитывают старый снимок. mtime копии — время
+    начала снимка.
+    """
+    started = time.time()
+    tmp = f'{target}.tmp'
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    src = sqlite3.connect(source)
+    dst = sqlite3.connect(tmp)
+    try:
+        src.backup(dst)
+        # Копия читается без журнала WAL основной базы.
+        dst.execute('PRAGMA journal_mode=DELETE')
+    finally:
+        dst.close()
+        src.close()
+    os.utime(tmp, (started, started))
+    os.replace(tmp, target)
+    return started
+
+
+class ReplicaRouter:
+    """Чтение — из реплики, если её включил ReplicaRoutingMiddleware"""
+
+    def db_for_read(self, model, **hints):
+        return REPLICA if _reading_replica.get() else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Явно: иначе объект, прочитанный из реплики, сохранялся бы в неё.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, REPLICA}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return False if db == REPLICA else None
@@ -0,0 +1,89 @@
+"""Планировщик отложенных публикаций.
+
+Публикация с датой в будущем сохраняется с is_live=False. В момент
+наступления pub_date планировщик переключает флаг одним UPDATE и
+отправляет сигнал posts_went_live, поэтому запросам ленты не нужно
+сравнивать pub_date с текущим временем.
+
+Планировщик вызывается двумя способами:
+
+* командой ``python manage.py publish_scheduled --loop`` — отдельный
+  процесс спит до ближайшей даты публикации;
+* PublicationSchedulerMiddleware — перед каждым запросом сравнивает
+  текущее время с датой ближайшей публикации, сохранённой в памяти
+  процесса, и обращается к базе только когда эта дата наступила.
+"""
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from .models import Post
+from .signals import posts_went_live
+
+_UNKNOWN = object()
+
+_lock = threading.Lock()
+_next_due = _UNKNOWN
+_synced_at = None
+
+
+def resync_interval():
+    """Как часто перечитывать дату ближайшей публикации из базы"""
+    return timedelta(
+        seconds=getattr(settings, 'BLOG_SCHEDULER_RESYNC_SECONDS', 60)
+    )
+
+
+def next_due_date():
+    """Дата ближайшей ещё не наступившей публикации или None"""
+    return Post.objects.filter(is_live=False).aggregate(
+        next_due=Min('pub_date')
+    )['next_due']
+
+
+def publish_due_posts(now=None):
+    """Отмечает публикации, дата которых наступила; возвращает их id"""
+    now = now or timezone.now()
+    with transaction.atomic():
+        post_ids = list(
+            Post.objects.filter(
+                is_live=False, pub_date__lte=now
+            ).order_by().values_list('id', flat=True)
+        )
+        if post_ids:
+            Post.objects.filter(id__in=post_ids).update(is_live=True)
+    if post_ids:
+        posts_went_live.send(sender=Post, post_ids=post_ids)
+    return post_ids
+
+
+def schedule(pub_date):
+    """Сообщает планировщику процесса о новой отложенной публикации"""
+    global _next_due
+    with _lock:
+        if _next_due is not _UNKNOWN and (
+                _next_due is None or pub_date < _next_due):
+            _next_due = pub_date
+
+
+def publish_if_due(now=None):
+    """Дешёвая проверка на каждый запрос: в базу только по наступлении"""
+    global _next_due, _synced_at
+    now = now or timezone.now()
+    fresh = (
+        _synced_at is not None and now - _synced_at < resync_interval()
+    )
+    waiting = _next_due is None or (
+        _next_due is not _UNKNOWN and _next_due > now
+    )
+    if fresh and waiting:
+        return []
+    with _lock:
+        post_ids = publish_due_posts(now)
+        _next_due = next_due_date()
+        _synced_at = now
+    return post_ids
@@ -0,0 +1,218 @@
+"""Полнотекстовый поиск по публикациям (SQLite FTS5).
+
+Индекс blog_post_fts — FTS5-таблица с внешним содержимым: в ней хранится
+только словарь, сами title и text читаются из blog_post (для snippet).
+Синхронность с Post поддерживают триггеры базы данных, поэтому индекс
+обновляется при любой записи, включая bulk_create и QuerySet.update.
+
+Токенизатор unicode61 приводит кириллицу к нижнему регистру; «ё» перед
+индексацией и в запросе заменяется на «е». Слова запроса ищутся по
+префиксу, а у русских слов перед этим отбрасываются конечные гласные,
+«й» и «ь» («ёлка» → «елк*» находит «ёлку» и «ёлкой»): полноценного
+стемминга в FTS5 нет, но большая часть окончаний так покрывается.
+
+SQLite удаляет триггеры вместе с таблицей, а миграции Django на SQLite
+изменяют blog_post пересозданием таблицы. Поэтому после каждого migrate
+обработчик post_migrate (BlogConfig.ready) вызывает ensure_triggers():
+пропавшие триггеры создаются заново, а индекс перестраивается.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+FTS_TABLE = 'blog_post_fts'
+TRIGGERS = ('blog_post_fts_insert', 'blog_post_fts_delete',
+            'blog_post_fts_update')
+
+# Веса столбцов для bm25: совпадение в заголовке важнее, чем в тексте.
+TITLE_WEIGHT = 10.0
+TEXT_WEIGHT = 1.0
+
+SNIPPET_TOKENS = 24
+_START, _END = '\x02', '\x03'
+
+WORD_RE = re.compile(r'\w+')
+RUSSIAN_ENDING_RE = re.compile(r'(?<=[а-я]{3})[аеиоуыэюяйь]{1,2}$')
+
+
+def _folded(column):
+    return f"replace(replace({column}, 'ё', 'е'), 'Ё', 'Е')"
+
+
+def fold(text):
+    return text.replace('ё', 'е').replace('Ё', 'Е')
+
+
+def is_available():
+    return connection.vendor == 'sqlite'
+
+
+def create_table(cursor):
+    cursor.execute(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+        "title, text, content='blog_post', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    )
+
+
+def create_triggers(cursor):
+    """(Пере)создаёт триггеры, синхронизирующие индекс с blog_post.
+
+    cursor — курсор или schema_editor миграции: нужен только execute().
+    """
+    insert, delete, update = TRIGGERS
+    new = f"new.id, {_folded('new.title')}, {_folded('new.text')}"
+    old = f"old.id, {_folded('old.title')}, {_folded('old.text')}"
+    for trigger in TRIGGERS:
+        cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    cursor.execute(
+        f'CREATE TRIGGER {insert} AFTER INSERT ON blog_post BEGIN '
+        f'INSERT INTO {FTS_TABLE}(rowid, title, text) VALUES ({new}); END'
+    )
+    cursor.execute(
+        f'CREATE TRIGGER {delete} AFTER DELETE ON blog_post BEGIN '
+        f'INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text) '
+        f"VALUES ('delete', {old}); END"
+    )
+    cursor.execute(
+        f'CREATE TRIGGER {update} AFTER UPDATE OF title, text ON blog_post '
+        f'BEGIN '
+        f'INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text) '
+        f"VALUES ('delete', {old}); "
+        f'INSERT INTO {FTS_TABLE}(rowid, title, text) VALUES ({new}); END'
+    )
+
+
+def ensure_triggers(connection):
+    """Восстанавливает триггеры, если их нет, и перестраивает индекс:
+    записи в blog_post без триггеров в него не попали. True — триггеры
+    пришлось восстановить"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT name FROM sqlite_master WHERE name IN (%s, %s, %s, %s)',
+            (FTS_TABLE, *TRIGGERS),
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        # До миграции 0009 (или после её отката) индекса нет.
+        if FTS_TABLE not in existing or existing >= set(TRIGGERS):
+            return False
+        create_triggers(cursor)
+        rebuild(cursor)
+    return True
+
+
+def rebuild(cursor):
+    """Заполняет индекс заново по текущему содержимому blog_post"""
+    cursor.execute(
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('delete-all')"
+    )
+    cursor.execute(
+        f'INSERT INTO {FTS_TABLE}(rowid, title, text) '
+        f"SELECT id, {_folded('title')}, {_folded('text')} FROM blog_post"
+    )
+    cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+
+def match_expression(query):
+    """Запрос пользователя как выражение MATCH: все слова по префиксу.
+
+    Синтаксис FTS5 (кавычки, NEAR, OR, двоеточия) не передаётся —
+    каждое слово берётся в кавычки, поэтому ввод не вызывает ошибок.
+    """
+    words = WORD_RE.findall(fold(query).lower())
+    return ' '.join(
+        f'"{RUSSIAN_ENDING_RE.sub("", word)}"*' for word in words
+    )
+
+
+def highlight(snippet):
+    """Экранирует фрагмент и подсвечивает совпадения тегом <mark>"""
+    return mark_safe(
+        escape(snippet).replace(_START, '<mark>').replace(_END, '</mark>')
+    )
+
+
+class SearchResults:
+    """Ленивая выдача поиска для Paginator: count() и срезы.
+
+    visible — QuerySet Post с правилами видимости (post_query()); он
+    подставляется подзапросом, так что считаются и ранжируются только
+    видимые публикации. Срез возвращает посты с атрибутами search_rank и
+    snippet в порядке bm25.
+    """
+
+    def __init__(self, match, visible):
+        self.match = match
+        # Видимость проверяется коррелированным EXISTS по первичному ключу
+        # для каждого совпадения: это дешевле, чем строить полный список
+        # видимых id для rowid IN (...), когда публикаций сотни тысяч.
+        sql, params = visible.filter(
+            pk=RawSQL(f'{FTS_TABLE}.rowid', ())
+        ).order_by().values('id').query.sql_with_params()
+        self._where = f'{FTS_TABLE} MATCH %s AND EXISTS ({sql})'
+        self._params = [match, *params]
+        self._visible = visible
+
+    def count(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT COUNT(*) FROM {FTS_TABLE} WHERE {self._where}',
+                self._params
+            )
+            return cursor.fetchone()[0]
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start = index.start or 0
+        limit = -1 if index.stop is None else index.stop - start
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT rowid, '
+                f'bm25({FTS_TABLE}, {TITLE_WEIGHT}, {TEXT_WEIGHT}) AS rank '
+                f'FROM {FTS_TABLE} WHERE {self._where} '
+                f'ORDER BY rank LIMIT %s OFFSET %s',
+                [*self._params, limit, start]
+            )
+            rows = cursor.fetchall()
+            # snippet() считается только для строк страницы: в одном
+            # запросе с ORDER BY SQLite вычислил бы его для всех совпадений.
+            placeholders = ', '.join(['%s'] * len(rows)) or 'NULL'
+            cursor.execute(
+                f"SELECT rowid, snippet({FTS_TABLE}, 1, %s, %s, '…', "
+                f'{SNIPPET_TOKENS}) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid IN ({placeholders})',
+                [_START, _END, self.match, *(row[0] for row in rows)]
+            )
+            snippets = dict(cursor.fetchall())
+        posts = self._visible.defer('text').in_bulk(
+            [post_id for post_id, _ in rows]
+        )
+        results = []
+        for post_id, rank in rows:
+            post = posts.get(post_id)
+            if post is not None:
+                post.search_rank = rank
+                post.snippet = highlight(snippets.get(post_id, ''))
+                results.append(post)
+        return results
+
+
+def search(query, visible):
+    """Выдача по запросу пользователя или None, если в запросе нет слов.
+
+    Без FTS5 (не SQLite) — LIKE по заголовку и тексту, без рейтинга.
+    """
+    match = match_expression(query)
+    if not match:
+        return None
+    if is_available():
+        return SearchResults(match, visible)
+    condition = Q()
+    for word in WORD_RE.findall(query):
+        condition &= Q(title__icontains=word) | Q(text__icontains=word)
+    return visible.filter(condition).defer('text').order_by('-pub_date')
@@ -0,0 +1,237 @@
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+from tasks import queue
+
+from . import category_feeds, page_cache, search, sqlite, suggestions
+from .models import (Category, CategoryFeed, Comment, Location, Post,
+                     SuggestionTerm, User)
+
+# Отправляется планировщиком, когда наступила дата публикации постов;
+# аргумент post_ids — список их id.
+posts_went_live = Signal()
+
+
+def post_cache_scopes(post_ids):
+    """Области кэша страниц, в которых показываются публикации"""
+    scopes = {page_cache.FEED}
+    rows = Post.objects.filter(pk__in=post_ids).values_list(
+        'id', 'category__slug', 'author__username'
+    )
+    for post_id, category_slug, username in rows:
+        scopes.update((
+            page_cache.post_scope(post_id),
+            page_cache.category_scope(category_slug),
+            page_cache.profile_scope(username),
+        ))
+    return scopes
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    """Увеличивает Post.comment_count при добавлении комментария;
+    любое изменение комментария обновляет Post.updated_at"""
+    if raw:
+        return
+    changes = {'updated_at': timezone.now()}
+    if created:
+        changes['comment_count'] = F('comment_count') + 1
+    Post.objects.filter(pk=instance.post_id).update(**changes)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    """Уменьшает Post.comment_count при удалении комментария"""
+    Post.objects.filter(
+        pk=instance.post_id, comment_count__gt=0
+    ).update(
+        comment_count=F('comment_count') - 1,
+        updated_at=timezone.now()
+    )
+
+
+@receiver(post_save, sender=Post)
+def schedule_post(sender, instance, raw=False, **kwargs):
+    """Передаёт отложенную публикацию планировщику"""
+    if not raw and not instance.is_live:
+        from . import scheduler
+        scheduler.schedule(instance.pub_date)
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_scopes(sender, instance, raw=False, **kwargs):
+    """Запоминает категорию и автора до изменения публикации"""
+    instance._page_cache_scopes = (
+        post_cache_scopes([instance.pk]) if instance.pk else set()
+    )
+
+
+@receiver(post_save, sender=Post)
+def invalidate_saved_post(sender, instance, **kwargs):
+    scopes = getattr(instance, '_page_cache_scopes', set())
+    page_cache.bump_on_commit(*scopes | post_cache_scopes([instance.pk]))
+
+
+@receiver(pre_delete, sender=Post)
+def invalidate_deleted_post(sender, instance, **kwargs):
+    page_cache.bump_on_commit(*post_cache_scopes([instance.pk]))
+
+
+@receiver(post_save, sender=Post)
+def queue_post_image(sender, instance, raw=False, **kwargs):
+    """Новое фото обрабатывает фоновая задача blog.process_image"""
+    data = instance.image_variants
+    if not raw and data.get('pending'):
+        queue.enqueue(
+            'blog.process_image',
+            key=f'blog.process_image:{instance.pk}:{data["name"]}',
+            post_id=instance.pk, name=data['name']
+        )
+
+
+@receiver(post_save, sender=Post)
+def sync_category_feed(sender, instance, raw=False, **kwargs):
+    """Публикация, снятие, правка даты или перенос меняют ленты категорий;
+    удалённый пост уходит из ленты каскадом"""
+    if not raw:
+        category_feeds.sync_posts([instance.pk])
+
+
+@receiver(post_save, sender=Post)
+def sync_post_suggestions(sender, instance, raw=False, **kwargs):
+    if not raw:
+        suggestions.sync_posts([instance.pk])
+
+
+@receiver(post_delete, sender=Post)
+def drop_post_suggestions(sender, instance, **kwargs):
+    suggestions.drop(SuggestionTerm.POST, [instance.pk])
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_post(sender, instance, **kwargs):
+    """Комментарий меняет страницу поста и счётчик в его карточке"""
+    page_cache.bump_on_commit(*post_cache_scopes([instance.post_id]))
+
+
+@receiver(posts_went_live)
+def invalidate_live_posts(sender, post_ids, **kwargs):
+    page_cache.bump_on_commit(*post_cache_scopes(post_ids))
+
+
+@receiver(posts_went_live)
+def add_live_posts_to_category_feeds(sender, post_ids, **kwargs):
+    category_feeds.sync_posts(post_ids)
+
+
+@receiver(posts_went_live)
+def add_live_posts_to_suggestions(sender, post_ids, **kwargs):
+    suggestions.sync_posts(post_ids)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=CategoryFeed)
+@receiver(post_delete, sender=CategoryFeed)
+def invalidate_dimensions(sender, **kwargs):
+    """Категории и местоположения выводятся в карточках на всех страницах
+    и хранятся в памяти воркеров (blog.dimensions)"""
+    page_cache.bump_on_commit(page_cache.DIMENSIONS)
+
+
+@receiver(pre_save, sender=Category)
+def remember_category_published(sender, instance, raw=False, **kwargs):
+    instance._was_published = (
+        Category.objects.filter(pk=instance.pk).values_list(
+            'is_published', flat=True
+        ).first() if instance.pk and not raw else None
+    )
+
+
+@receiver(post_save, sender=Category)
+def sync_category_suggestions(sender, instance, raw=False, **kwargs):
+    """Снятие категории с публикации скрывает и подсказки её постов"""
+    if raw:
+        return
+    suggestions.sync_categories([instance.pk])
+    was_published = getattr(instance, '_was_published', None)
+    if was_published is not None and (
+            was_published != instance.is_published):
+        suggestions.sync_posts(
+            instance.posts.values_list('pk', flat=True)
+        )
+
+
+@receiver(pre_delete, sender=Category)
+def remember_category_posts(sender, instance, **kwargs):
+    instance._post_ids = list(instance.posts.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Category)
+def drop_category_suggestions(sender, instance, **kwargs):
+    """Посты удалённой категории остаются без категории и скрываются"""
+    suggestions.drop(SuggestionTerm.CATEGORY, [instance.pk])
+    suggestions.sync_posts(getattr(instance, '_post_ids', []))
+
+
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, raw=False, **kwargs):
+    instance._old_username = (
+        User.objects.filter(pk=instance.pk).values_list(
+            'username', flat=True
+        ).first() if instance.pk and not raw else None
+    )
+
+
+@receiver(post_save, sender=User)
+def invalidate_user(sender, instance, update_fields=None, **kwargs):
+    """Профиль пользователя; при смене имени — все карточки его постов"""
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    old_username = getattr(instance, '_old_username', None)
+    scopes = [page_cache.profile_scope(instance.username)]
+    if old_username and old_username != instance.username:
+        scopes += [
+            page_cache.profile_scope(old_username),
+            page_cache.DIMENSIONS,
+        ]
+    page_cache.bump_on_commit(*scopes)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_deleted_user(sender, instance, **kwargs):
+    page_cache.bump_on_commit(page_cache.profile_scope(instance.username))
+
+
+@receiver(post_save, sender=User)
+def sync_user_suggestions(sender, instance, raw=False, update_fields=None,
+                          **kwargs):
+    if raw or (update_fields is not None
+               and set(update_fields) == {'last_login'}):
+        return
+    suggestions.sync_users([instance.pk])
+
+
+@receiver(post_delete, sender=User)
+def drop_user_suggestions(sender, instance, **kwargs):
+    suggestions.drop(SuggestionTerm.USER, [instance.pk])
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    sqlite.configure(connection)
+
+
+def restore_search_triggers(sender, using, **kwargs):
+    """post_migrate: миграция, изменившая Post, пересоздаёт blog_post
+    в SQLite без триггеров полнотекстового индекса"""
+    connection = connections[using]
+    if connection.vendor == 'sqlite':
+        search.ensure_triggers(connection)
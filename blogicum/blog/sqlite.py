@@ -0,0 +1,29 @@
+"""Профиль соединений SQLite.
+
+PRAGMA из настройки BLOG_SQLITE_PRAGMAS (словарь по алиасам баз)
+выполняются для каждого нового соединения — их вызывает обработчик
+сигнала connection_created. Вместе с CONN_MAX_AGE соединение и его
+настройки переживают запрос: PRAGMA выполняются раз на соединение, а не
+на каждый запрос.
+
+journal_mode=WAL сохраняется в самом файле базы; остальные настройки
+действуют только в пределах соединения.
+"""
+from django.conf import settings
+
+from . import replica
+
+
+def pragmas(alias):
+    return getattr(settings, 'BLOG_SQLITE_PRAGMAS', {}).get(alias, {})
+
+
+def configure(connection):
+    """Выполняет PRAGMA профиля для нового соединения с SQLite"""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas(connection.alias).items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+    if connection.alias == replica.REPLICA:
+        replica.remember_snapshot(connection)
@@ -0,0 +1,157 @@
+"""Подсказки поиска по мере ввода: заголовки публикаций, категории и
+имена пользователей.
+
+Префиксный индекс хранится в таблице SuggestionTerm: для каждого видимого
+объекта — по строке на каждое слово подписи, ключ — нормализованный текст
+подписи начиная с этого слова («Зимняя ёлка» → «зимняя елка», «елка»).
+Поиск по префиксу — диапазон key >= префикс AND key < префикс + U+10FFFF
+по индексу (kind, key): это чтение нескольких страниц B-дерева, без LIKE
+и без обращения к таблицам Post, Category и User.
+
+Индекс обновляют сигналы сохранения и удаления Post, Category и User и
+наступление даты отложенной публикации. Записи в обход моделей
+(bulk_create, QuerySet.update) исправляет команда rebuild_suggestions.
+"""
+from django.db import transaction
+
+from .models import Category, Post, SuggestionTerm, User
+from .search import WORD_RE, fold
+
+KEY_LENGTH = SuggestionTerm._meta.get_field('key').max_length
+# Сколько первых слов подписи могут начинать совпадение.
+MAX_WORDS = 16
+LIMIT = 5
+BATCH_SIZE = 500
+
+_UPPER = '\U0010ffff'
+
+
+def normalize(text):
+    """Слова в нижнем регистре через пробел, «ё» заменена на «е»"""
+    return ' '.join(WORD_RE.findall(fold(text).lower()))
+
+
+def keys(label):
+    """Ключи индекса для подписи: текст начиная с каждого слова"""
+    words = WORD_RE.findall(fold(label).lower())[:MAX_WORDS]
+    result = []
+    for i in range(len(words)):
+        key = ' '.join(words[i:])[:KEY_LENGTH]
+        if key not in result:
+            result.append(key)
+    return result
+
+
+def _terms(kind, labels):
+    return [
+        SuggestionTerm(kind=kind, object_id=object_id, key=key, label=label)
+        for object_id, label in labels
+        for key in keys(label)
+    ]
+
+
+def _chunks(ids):
+    ids = list(ids)
+    for start in range(0, len(ids), BATCH_SIZE):
+        yield ids[start:start + BATCH_SIZE]
+
+
+def _replace(kind, ids, labels):
+    """Заменяет строки индекса объектов ids; labels — пары (id, подпись)
+    тех из них, что должны попадать в подсказки"""
+    with transaction.atomic():
+        SuggestionTerm.objects.filter(
+            kind=kind, object_id__in=ids
+        ).delete()
+        SuggestionTerm.objects.bulk_create(_terms(kind, labels))
+
+
+def visible_posts():
+    return Post.objects.filter(
+        is_live=True, is_published=True, category__is_published=True
+    )
+
+
+def visible_categories():
+    return Category.objects.filter(is_published=True)
+
+
+def active_users():
+    return User.objects.filter(is_active=True)
+
+
+def sync_posts(post_ids):
+    for ids in _chunks(post_ids):
+        _replace(SuggestionTerm.POST, ids, visible_posts().filter(
+            pk__in=ids
+        ).values_list('id', 'title'))
+
+
+def sync_categories(category_ids):
+    for ids in _chunks(category_ids):
+        _replace(SuggestionTerm.CATEGORY, ids, visible_categories().filter(
+            pk__in=ids
+        ).values_list('id', 'title'))
+
+
+def sync_users(user_ids):
+    for ids in _chunks(user_ids):
+        _replace(SuggestionTerm.USER, ids, active_users().filter(
+            pk__in=ids
+        ).values_list('id', 'username'))
+
+
+def drop(kind, object_ids):
+    SuggestionTerm.objects.filter(kind=kind, object_id__in=object_ids).delete()
+
+
+def rebuild():
+    """Строит индекс заново; возвращает число строк"""
+    sources = (
+        (SuggestionTerm.POST, visible_posts(), 'title'),
+        (SuggestionTerm.CATEGORY, visible_categories(), 'title'),
+        (SuggestionTerm.USER, active_users(), 'username'),
+    )
+    total = 0
+    with transaction.atomic():
+        SuggestionTerm.objects.all().delete()
+        for kind, queryset, field in sources:
+            batch = []
+            rows = queryset.values_list('id', field).order_by().iterator(
+                chunk_size=BATCH_SIZE
+            )
+            for row in rows:
+                batch.append(row)
+                if len(batch) == BATCH_SIZE:
+                    total += len(SuggestionTerm.objects.bulk_create(
+                        _terms(kind, batch)
+                    ))
+                    batch = []
+            total += len(SuggestionTerm.objects.bulk_create(
+                _terms(kind, batch)
+            ))
+    return total
+
+
+def suggest(query, limit=LIMIT):
+    """Подсказки по началу запроса: {тип: [(id, подпись), ...]}.
+
+    Совпадения упорядочены по ключу — сначала самые короткие
+    продолжения введённого текста.
+    """
+    prefix = normalize(query)[:KEY_LENGTH]
+    result = {kind: [] for kind, _ in SuggestionTerm.KINDS}
+    if not prefix:
+        return result
+    for kind in result:
+        # У объекта может совпасть несколько слов подписи: строк берётся
+        # с запасом, повторы отбрасываются.
+        rows = SuggestionTerm.objects.filter(
+            kind=kind, key__gte=prefix, key__lt=prefix + _UPPER
+        ).order_by('key').values_list('object_id', 'label')[:limit * 3]
+        seen = set()
+        for object_id, label in rows:
+            if object_id not in seen and len(seen) < limit:
+                seen.add(object_id)
+                result[kind].append((object_id, label))
+    return result
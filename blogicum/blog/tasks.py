@@ -0,0 +1,20 @@
+"""Фоновые задачи блога; выполняет их команда run_tasks (приложение
+tasks)"""
+from django.core.mail import EmailMultiAlternatives
+
+from tasks import queue
+
+from . import image_pipeline
+
+
+@queue.register('blog.process_image')
+def process_image(post_id, name):
+    image_pipeline.process_post(post_id, name)
+
+
+@queue.register('blog.send_mail')
+def send_mail(subject, body, from_email, to, html=None):
+    message = EmailMultiAlternatives(subject, body, from_email, to)
+    if html is not None:
+        message.attach_alternative(html, 'text/html')
+    message.send()
@@ -0,0 +1,69 @@
+from functools import lru_cache
+
+from django import template
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+from blog import images, page_cache
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_cards(posts):
+    """HTML карточек includes/post_card.html из кэша фрагментов.
+
+    Карточка не зависит от пользователя, поэтому кэш общий и для
+    авторизованных читателей; рендерятся только отсутствующие карточки.
+    """
+    posts = list(posts)
+    keys = page_cache.card_keys(posts)
+    cached = cache.get_many(keys)
+    rendered = {}
+    cards = []
+    for post, key in zip(posts, keys):
+        html = cached.get(key)
+        if html is None:
+            html = render_to_string('includes/post_card.html', {'post': post})
+            rendered[key] = html
+        cards.append(mark_safe(html))
+    if rendered:
+        cache.set_many(rendered, page_cache.card_timeout())
+    return cards
+
+
+@register.simple_tag
+def page_links(page_obj, on_each_side=3, on_ends=1):
+    """Номера страниц окном: первая, последняя и ±on_each_side вокруг
+    текущей; пропуски обозначены Paginator.ELLIPSIS"""
+    return page_obj.paginator.get_elided_page_range(
+        page_obj.number, on_each_side=on_each_side, on_ends=on_ends
+    )
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post, loading='lazy'):
+    """Фото публикации с srcset из уменьшенных копий и явными размерами"""
+    return {
+        'post': post,
+        'sizes': images.SIZES,
+        'loading': loading,
+        **images.attributes(post.image, post.image_variants),
+    }
+
+
+@lru_cache(maxsize=None)
+def _read_static(name):
+    with open(finders.find(name), encoding='utf-8') as file:
+        return file.read()
+
+
+@register.simple_tag
+def critical_css():
+    """Содержимое css/critical.css для <style>, если BLOG_CRITICAL_CSS"""
+    if not getattr(settings, 'BLOG_CRITICAL_CSS', False):
+        return ''
+    return mark_safe(_read_static('css/critical.css'))
@@ -5,18 +5,30 @@ from . import views
 app_name = 'blog'
 
 urlpatterns = [
-    path('', views.BlogListView.as_view(), name='index'),
-    path('category/<slug:category_slug>/', views.CategoryListView.as_view(),
+    path('', views.read_view(views.BlogListView), name='index'),
+    path('fragment/', views.read_view(views.BlogFragmentView),
+         name='index_fragment'),
+    path('category/<slug:category_slug>/',
+         views.read_view(views.CategoryListView),
          name='category_posts'),
-    path('posts/<int:pk>/', views.PostDetailView.as_view(),
+    path('category/<slug:category_slug>/fragment/',
+         views.read_view(views.CategoryFragmentView),
+         name='category_posts_fragment'),
+    path('search/', views.read_view(views.SearchView), name='search'),
+    path('search/suggest/', views.read_view(views.SuggestView),
+         name='suggest'),
+    path('posts/<int:pk>/', views.read_view(views.PostDetailView),
          name='post_detail'),
     path('posts/create/', views.PostCreateView.as_view(), name='create_post'),
     path('posts/<int:pk>/edit/', views.PostUpdateView.as_view(),
          name='edit_post'),
     path('posts/<int:pk>/delete/', views.PostDeleteView.as_view(),
          name='delete_post'),
-    path('profile/<slug:name>/', views.ProfileListView.as_view(),
+    path('profile/<slug:name>/', views.read_view(views.ProfileListView),
          name='profile'),
+    path('profile/<slug:name>/fragment/',
+         views.read_view(views.ProfileFragmentView),
+         name='profile_fragment'),
     path('edit_profile/', views.ProfileUpdateView.as_view(),
          name='edit_profile'),
     path('posts/<int:pk>/comment/',
@@ -1,29 +1,106 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
+from django.core.cache import cache
+from django.core.paginator import InvalidPage
+from django.db import close_old_connections, transaction
+from django.db.models import OuterRef, Subquery
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse, reverse_lazy
-from django.utils import timezone
+from django.views.decorators.http import condition
 from django.views.generic import (CreateView, DeleteView, DetailView, ListView,
-                                  UpdateView)
+                                  UpdateView, View)
 
-from blog.models import Category, Comment, Post, User
+from blog.models import Comment, Post, PostBody, SuggestionTerm, User
+from . import (category_feeds, dimensions, page_cache, replica, search,
+               suggestions)
 from .forms import BlogForm, CommentForm, UserForm
+from .paginators import CachedCountPaginator, CursorPaginator
 
 
 def post_query():
-    """Фильтрует объект Post"""
+    """Фильтрует объект Post (is_live выставляет планировщик публикаций)"""
     return Post.objects.filter(
-        pub_date__lte=timezone.now(),
+        is_live=True,
         is_published=True,
         category__is_published=True
     )
 
 
 def post_annotate(query):
-    """Подсчет комментариев"""
-    return query.annotate(
-        comment_count=Count('comment')
-    ).order_by('-pub_date')
+    """Сортировка ленты (число комментариев хранится в Post.comment_count);
+    полный текст карточкам не нужен — они выводят Post.excerpt"""
+    return query.defer('text').order_by(*CursorPaginator.ordering)
+
+
+_read_executor = None
+_read_executor_lock = threading.Lock()
+
+
+def read_executor():
+    """Ограниченный пул потоков для ORM и рендера асинхронных
+    представлений чтения (BLOG_ASYNC_READ_THREADS)"""
+    global _read_executor
+    if _read_executor is None:
+        with _read_executor_lock:
+            if _read_executor is None:
+                _read_executor = ThreadPoolExecutor(
+                    max_workers=getattr(
+                        settings, 'BLOG_ASYNC_READ_THREADS', 8
+                    ),
+                    thread_name_prefix='blog-read',
+                )
+    return _read_executor
+
+
+def _run_read_view(view, request, *args, **kwargs):
+    """Выполняет представление и рендер шаблона в потоке пула.
+
+    Соединения потоков пула живут по CONN_MAX_AGE так же, как
+    соединения обработчика запросов.
+    """
+    close_old_connections()
+    if replica.reading_replica():
+        replica.close_outdated_connection()
+    try:
+        response = view(request, *args, **kwargs)
+        if callable(getattr(response, 'render', None)):
+            response = response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def async_read_view(view_class, **initkwargs):
+    """Асинхронная точка входа представления чтения для ASGI.
+
+    Без неё Django 3.2 выполняет синхронные представления под ASGI в
+    одном общем потоке по очереди; здесь представление целиком, вместе
+    с запросами к базе и рендером, уходит в пул read_executor().
+    """
+    view = view_class.as_view(**initkwargs)
+
+    async def async_view(request, *args, **kwargs):
+        return await sync_to_async(
+            _run_read_view, thread_sensitive=False, executor=read_executor()
+        )(view, request, *args, **kwargs)
+
+    async_view.view_class = view_class
+    async_view.view_initkwargs = initkwargs
+    async_view.__doc__ = view_class.__doc__
+    return async_view
+
+
+def read_view(view_class, **initkwargs):
+    """Представление чтения для urls.py: под ASGI (BLOG_ASYNC_READ_VIEWS)
+    асинхронное, иначе обычное as_view()"""
+    if getattr(settings, 'BLOG_ASYNC_READ_VIEWS', False):
+        return async_read_view(view_class, **initkwargs)
+    return view_class.as_view(**initkwargs)
 
 
 class PostMixin:
@@ -33,6 +110,117 @@ class PostMixin:
     template_name = 'blog/create.html'
 
 
+class CursorPaginationMixin:
+    """Пагинация списка: ?cursor=<токен> по ключу, ?page=N как раньше"""
+    cursor_kwarg = 'cursor'
+    cursor_only = False
+    paginator_class = CachedCountPaginator
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        """Счётчик ленты кэшируется по тем же областям, что и страница"""
+        return super().get_paginator(
+            queryset, per_page, scopes=self.get_cache_scopes(), **kwargs
+        )
+
+    def paginate_queryset(self, queryset, page_size):
+        cursor = self.request.GET.get(self.cursor_kwarg)
+        if cursor is None and not self.cursor_only:
+            paginator, page, _, is_paginated = (
+                super().paginate_queryset(queryset, page_size)
+            )
+            CursorPaginator(queryset, page_size).attach_cursors(page)
+        else:
+            paginator = CursorPaginator(queryset, page_size)
+            try:
+                page = paginator.page(cursor)
+            except InvalidPage as e:
+                raise Http404(str(e))
+            is_paginated = page.has_other_pages()
+        page.object_list = self.get_page_posts(page.object_list)
+        return paginator, page, page.object_list, is_paginated
+
+    def get_page_posts(self, object_list):
+        """Посты страницы с категориями и местоположениями из памяти"""
+        return dimensions.attach(list(object_list))
+
+
+class FeedFragmentMixin:
+    """Только карточки ленты для подгрузки; курсор следующей порции
+    передаётся в заголовке X-Next-Cursor"""
+    template_name = 'includes/post_cards.html'
+    cursor_only = True
+
+    def render_to_response(self, context, **response_kwargs):
+        response = super().render_to_response(context, **response_kwargs)
+        next_cursor = context['page_obj'].next_cursor
+        if next_cursor:
+            response['X-Next-Cursor'] = next_cursor
+        return response
+
+
+class ConditionalGetMixin:
+    """Отвечает 304 на If-None-Match/If-Modified-Since до рендера.
+
+    ETag строится из версий областей page_cache (их сбрасывают сигналы,
+    в том числе при удалении), Last-Modified — из get_last_modified()
+    и кэшируется под теми же версиями; авторизованным Last-Modified
+    не отдаётся.
+    """
+
+    def get_last_modified(self):
+        return None
+
+    def cached_last_modified(self):
+        if self.request.user.is_authenticated:
+            # Дата не учитывает смену токена CSRF при входе: страницу
+            # авторизованного пользователя проверяет только ETag.
+            return None
+        key = page_cache.modified_key(self.request, self.get_cache_scopes())
+        last_modified = cache.get(key)
+        if last_modified is None:
+            last_modified = self.get_last_modified()
+            if last_modified is not None:
+                cache.set(key, last_modified, page_cache.timeout())
+        return last_modified
+
+    def dispatch(self, request, *args, **kwargs):
+        view = condition(
+            etag_func=lambda request, *args, **kwargs: page_cache.etag(
+                request, self.get_cache_scopes()
+            ),
+            last_modified_func=lambda request, *args, **kwargs: (
+                self.cached_last_modified()
+            ),
+        )(super().dispatch)
+        return view(request, *args, **kwargs)
+
+
+class AnonymousPageCacheMixin:
+    """Кэширует страницу целиком для анонимных GET-запросов"""
+
+    def get_cache_scopes(self):
+        """Области page_cache, от которых зависит страница"""
+        raise NotImplementedError
+
+    def dispatch(self, request, *args, **kwargs):
+        if not page_cache.is_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+        key = page_cache.page_key(request, self.get_cache_scopes())
+        response = cache.get(key)
+        if response is not None:
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        if page_cache.is_cacheable_response(response):
+            timeout = page_cache.timeout()
+            if callable(getattr(response, 'render', None)):
+                response.add_post_render_callback(
+                    lambda r: cache.set(key, r, timeout)
+                )
+            else:
+                cache.set(key, response, timeout)
+        return response
+
+
 class CommentMixin:
     """Mixin"""
     model = Comment
@@ -57,24 +245,62 @@ class CommentDefMixin:
         )
 
 
-class BlogListView(ListView):
+class BlogListView(ConditionalGetMixin,
+                   AnonymousPageCacheMixin,
+                   CursorPaginationMixin,
+                   ListView):
     """Выводит главную страницу index.html (список постов)"""
+    read_from_replica = True
     model = Post
     template_name = 'blog/index.html'
-    query = post_query().select_related(
-        'category',
-        'location',
-        'author'
-    )
-    queryset = post_annotate(query)
     paginate_by = 10
 
+    def get_cache_scopes(self):
+        return [page_cache.FEED, page_cache.DIMENSIONS]
+
+    def get_queryset(self):
+        query = post_query().select_related('author')
+        return post_annotate(query)
+
 
-class PostDetailView(DetailView):
+class BlogFragmentView(FeedFragmentMixin, BlogListView):
+    """Порция карточек главной страницы"""
+
+
+class PostDetailView(ConditionalGetMixin,
+                     AnonymousPageCacheMixin,
+                     DetailView):
     """Выводит детальную информацию о посте"""
+    read_from_replica = True
     model = Post
     template_name = 'blog/detail.html'
 
+    def get_queryset(self):
+        """Текст берётся уже обработанным linebreaksbr из PostBody"""
+        body = PostBody.objects.filter(post=OuterRef('pk')).values('html')
+        return Post.objects.select_related('author').defer('text').annotate(
+            body_html=Subquery(body)
+        )
+
+    def get_object(self, queryset=None):
+        post = super().get_object(queryset)
+        dimensions.attach([post])
+        return post
+
+    def get_last_modified(self):
+        """Последнее изменение поста (включая комментарии), его категории
+        и местоположения"""
+        dates = Post.objects.filter(pk=self.kwargs['pk']).values_list(
+            'updated_at', 'category__updated_at', 'location__updated_at'
+        ).first()
+        return max(filter(None, dates), default=None) if dates else None
+
+    def get_cache_scopes(self):
+        return [
+            page_cache.post_scope(self.kwargs['pk']),
+            page_cache.DIMENSIONS,
+        ]
+
     def get_context_data(self, **kwargs):
         """Переопределяем get_context_data для расширения context"""
         context = super().get_context_data(**kwargs)
@@ -85,39 +311,123 @@ class PostDetailView(DetailView):
         return context
 
 
-class CategoryListView(ListView):
+class CategoryListView(ConditionalGetMixin,
+                       AnonymousPageCacheMixin,
+                       CursorPaginationMixin,
+                       ListView):
     """Выводит страницу категорий"""
+    read_from_replica = True
     model = Post
     template_name = 'blog/category.html'
+    context_object_name = 'post_list'
     paginate_by = 10
 
+    def get_cache_scopes(self):
+        return [
+            page_cache.category_scope(self.kwargs['category_slug']),
+            page_cache.DIMENSIONS,
+        ]
+
     def get_queryset(self):
-        query = Post.objects.select_related(
-            'category',
-            'location',
-            'author'
-        ).filter(
-            category__slug=self.kwargs['category_slug'],
-            pub_date__lte=timezone.now(),
+        self.category = dimensions.category_by_slug(
+            self.kwargs['category_slug']
+        )
+        if self.category is None or not self.category.is_published:
+            raise Http404('Категория не найдена.')
+        self.materialized = dimensions.has_feed(self.category)
+        if self.materialized:
+            return category_feeds.entries(self.category)
+        query = Post.objects.select_related('author').filter(
+            category=self.category,
+            is_live=True,
             is_published=True,
         )
         return post_annotate(query)
 
+    def get_page_posts(self, object_list):
+        """Записи материализованной ленты заменяются постами страницы"""
+        if self.materialized:
+            post_ids = [entry.pk for entry in object_list]
+            posts = Post.objects.select_related('author').defer(
+                'text'
+            ).in_bulk(post_ids)
+            object_list = [
+                posts[post_id] for post_id in post_ids if post_id in posts
+            ]
+        return super().get_page_posts(object_list)
+
     def get_context_data(self, **kwargs):
         """Переопределяем get_context_data для расширения context"""
         context = super().get_context_data(**kwargs)
-        category = get_object_or_404(Category.objects.values(
-            'id',
-            'title',
-            'description'
-        ).filter(
-            is_published=True
-        ), slug=self.kwargs['category_slug']
+        context['category'] = self.category
+        return context
+
+
+class CategoryFragmentView(FeedFragmentMixin, CategoryListView):
+    """Порция карточек страницы категории"""
+
+
+class SearchView(ConditionalGetMixin, AnonymousPageCacheMixin, ListView):
+    """Поиск по заголовкам и текстам видимых публикаций"""
+    read_from_replica = True
+    template_name = 'blog/search.html'
+    context_object_name = 'post_list'
+    paginate_by = 10
+
+    def get_cache_scopes(self):
+        return [page_cache.FEED, page_cache.DIMENSIONS]
+
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        results = search.search(
+            self.query, post_query().select_related('author')
         )
-        context['category'] = category
+        return [] if results is None else results
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page, object_list, is_paginated = (
+            super().paginate_queryset(queryset, page_size)
+        )
+        page.object_list = dimensions.attach(list(page.object_list))
+        return paginator, page, page.object_list, is_paginated
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
         return context
 
 
+class SuggestView(View):
+    """Подсказки для строки поиска по введённому началу запроса (JSON)"""
+    read_from_replica = True
+
+    def get(self, request, *args, **kwargs):
+        query = request.GET.get('q', '')
+        found = suggestions.suggest(query)
+        categories = [
+            dimensions.category_by_id(category_id)
+            for category_id, _ in found[SuggestionTerm.CATEGORY]
+        ]
+        return JsonResponse({
+            'query': query,
+            'posts': [
+                {'title': title,
+                 'url': reverse('blog:post_detail', args=(post_id,))}
+                for post_id, title in found[SuggestionTerm.POST]
+            ],
+            'categories': [
+                {'title': category.title,
+                 'url': reverse('blog:category_posts', args=(category.slug,))}
+                for category in categories if category is not None
+            ],
+            'users': [
+                {'username': username,
+                 'url': reverse('blog:profile', args=(username,))}
+                for _, username in found[SuggestionTerm.USER]
+            ],
+        })
+
+
 class PostCreateView(LoginRequiredMixin, PostMixin, CreateView):
     """Создание новой публикации"""
 
@@ -158,28 +468,30 @@ class PostDeleteView(LoginRequiredMixin, DeleteView):
         return super().dispatch(request, *args, **kwargs)
 
 
-class ProfileListView(ListView):
+class ProfileListView(ConditionalGetMixin,
+                      AnonymousPageCacheMixin,
+                      CursorPaginationMixin,
+                      ListView):
     """Выводит страницу категорий"""
+    read_from_replica = True
     model = Post
     template_name = 'blog/profile.html'
     slug_url_kwarg = 'name'
     paginate_by = 10
 
+    def get_cache_scopes(self):
+        return [
+            page_cache.profile_scope(self.kwargs['name']),
+            page_cache.DIMENSIONS,
+        ]
+
     def get_queryset(self):
         if self.request.user.username == self.kwargs['name']:
-            query = Post.objects.select_related(
-                'category',
-                'location',
-                'author'
-            ).filter(
+            query = Post.objects.select_related('author').filter(
                 author__username=self.kwargs['name'],
             )
         else:
-            query = post_query().select_related(
-                'category',
-                'location',
-                'author'
-            ).filter(
+            query = post_query().select_related('author').filter(
                 author__username=self.kwargs['name'],
             )
         return post_annotate(query)
@@ -195,6 +507,10 @@ class ProfileListView(ListView):
         return context
 
 
+class ProfileFragmentView(FeedFragmentMixin, ProfileListView):
+    """Порция карточек страницы пользователя"""
+
+
 class ProfileUpdateView(LoginRequiredMixin, UpdateView):
     """Редактируем профиль"""
     model = User
@@ -223,7 +539,8 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
     def form_valid(self, form):
         form.instance.author = self.request.user
         form.instance.post = self.post_
-        return super().form_valid(form)
+        with transaction.atomic():
+            return super().form_valid(form)
 
     def get_success_url(self):
         return reverse(
@@ -250,4 +567,8 @@ class CommentDeleteView(LoginRequiredMixin,
                         CommentDefMixin,
                         DeleteView):
     """Удаляем комментарий"""
-    pass
+
+    def delete(self, request, *args, **kwargs):
+        """Удаление и уменьшение счётчика в одной транзакции"""
+        with transaction.atomic():
+            return super().delete(request, *args, **kwargs)
@@ -11,6 +11,11 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from core.static_app import StaticFilesASGI
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
+# Публичные страницы — асинхронные представления (blog.views.read_view).
+os.environ.setdefault('BLOG_ASYNC_READ_VIEWS', '1')
 
-application = get_asgi_application()
+# Статику отдаёт StaticFilesASGI, минуя middleware и URL.
+application = StaticFilesASGI(get_asgi_application())
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -37,6 +38,7 @@ STATICFILES_DIRS = [
 INSTALLED_APPS = [
     'blog.apps.BlogConfig',
     'pages.apps.PagesConfig',
+    'tasks.apps.TasksConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -49,6 +51,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'blog.middleware.PublicationSchedulerMiddleware',
+    'blog.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -85,13 +89,111 @@ WSGI_APPLICATION = 'blogicum.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/3.2/ref/settings/#databases
 
+# Профиль баз данных. BLOG_DB_PROFILE=production включает профиль
+# SQLite для боевого развёртывания: постоянные соединения (CONN_MAX_AGE)
+# и PRAGMA ниже. Без переменной — соединение на каждый запрос и
+# настройки SQLite по умолчанию, как для runserver и тестов.
+BLOG_DB_PROFILE = os.environ.get('BLOG_DB_PROFILE', '')
+_PRODUCTION_DB = BLOG_DB_PROFILE == 'production'
+_CONN_MAX_AGE = 600 if _PRODUCTION_DB else 0
+
+# Реплика для чтения (blog.replica); в разработке — копия db.sqlite3,
+# которую обновляет `python manage.py refresh_replica --interval 2`.
+# Пока копии нет или она старше BLOG_REPLICA_LAG_BUDGET, всё читается
+# из основной базы. В тестах реплика — та же база, что и default.
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': _CONN_MAX_AGE,
+    },
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.replica.sqlite3',
+        'CONN_MAX_AGE': _CONN_MAX_AGE,
+        'TEST': {
+            'MIRROR': 'default',
+        },
+    },
+}
+
+# PRAGMA для каждого нового соединения (blog.sqlite). WAL позволяет
+# читать во время записи, busy_timeout — ждать блокировку записи вместо
+# ошибки «database is locked». Реплика только читается в любом профиле,
+# режим журнала её файла задаёт refresh_replica.
+_SQLITE_CONNECTION_PRAGMAS = {
+    'busy_timeout': 5000,
+    'cache_size': -32000,  # 32 МБ на соединение
+    'mmap_size': 268435456,  # 256 МБ
+    'temp_store': 'MEMORY',
+}
+
+if _PRODUCTION_DB:
+    BLOG_SQLITE_PRAGMAS = {
+        'default': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            **_SQLITE_CONNECTION_PRAGMAS,
+        },
+        'replica': {
+            'query_only': 'ON',
+            **_SQLITE_CONNECTION_PRAGMAS,
+        },
+    }
+else:
+    BLOG_SQLITE_PRAGMAS = {
+        'replica': {
+            'query_only': 'ON',
+        },
+    }
+
+DATABASE_ROUTERS = ['blog.replica.ReplicaRouter']
+
+# Допустимое отставание реплики в секундах: столько после своих изменений
+# пользователь читает из основной базы, и не старше этого должен быть
+# снимок реплики.
+BLOG_REPLICA_LAG_BUDGET = 5
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# Кэш процесса подходит для разработки; при нескольких воркерах нужен общий
+# бэкенд (например, PyMemcacheCache), иначе сброс версий страниц
+# не дойдёт до других процессов. Справочники blog.dimensions при этом
+# всё равно обновляются раз в BLOG_DIMENSIONS_TTL секунд.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blogicum',
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
     }
 }
 
+# Асинхронные представления чтения (blog.views.read_view): включает
+# blogicum/asgi.py. Запросы к базе и рендер выполняются в пуле из
+# BLOG_ASYNC_READ_THREADS потоков.
+BLOG_ASYNC_READ_VIEWS = os.environ.get('BLOG_ASYNC_READ_VIEWS') == '1'
+
+BLOG_ASYNC_READ_THREADS = 8
+
+# Время жизни страниц в кэше для анонимных читателей (blog.page_cache)
+BLOG_PAGE_CACHE_TIMEOUT = 600
+
+# Время жизни HTML карточек публикаций (тег {% post_cards %})
+BLOG_CARD_CACHE_TIMEOUT = 3600
+
+# Как часто каждый процесс перечитывает категории и местоположения
+# (blog.dimensions), даже если сброс версии до него не дошёл, секунд
+BLOG_DIMENSIONS_TTL = 30
+
+# Время жизни COUNT(*) лент для пагинации; изменения в обход сигналов
+# (bulk_create, QuerySet.update) попадут в счётчик не позже этого срока
+BLOG_COUNT_CACHE_TIMEOUT = 60
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -131,6 +233,20 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 
+# python manage.py collectstatic собирает сюда статику с хэшем
+# содержимого в именах и сжатыми копиями .gz/.br (core.staticfiles).
+STATIC_ROOT = BASE_DIR / 'static'
+
+STATICFILES_STORAGE = 'core.staticfiles.CompressedManifestStorage'
+
+# Cache-Control для статики без хэша в имени; файлы с хэшем кэшируются
+# на год как immutable.
+STATIC_MAX_AGE = 3600
+
+# Встраивать css/critical.css (команда prune_css) в <style> base.html и
+# загружать остальной CSS без блокировки первой отрисовки.
+BLOG_CRITICAL_CSS = os.environ.get('BLOG_CRITICAL_CSS') == '1'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
@@ -151,3 +267,19 @@ LOGIN_REDIRECT_URL = 'blog:index'
 MEDIA_ROOT = BASE_DIR / 'media'
 
 LOGIN_URL = '/auth/login/'
+
+# Как часто (в секундах) каждый процесс перечитывает из базы дату
+# ближайшей отложенной публикации, созданной другими процессами.
+BLOG_SCHEDULER_RESYNC_SECONDS = 60
+
+# Фоновые задачи (приложение tasks): повтор после ошибки через
+# TASKS_RETRY_DELAY секунд, с удвоением до TASKS_MAX_RETRY_DELAY, всего
+# не больше TASKS_MAX_ATTEMPTS попыток. Задачу, не завершённую за
+# TASKS_LEASE_SECONDS, забирает другой воркер.
+TASKS_RETRY_DELAY = 10
+
+TASKS_MAX_RETRY_DELAY = 3600
+
+TASKS_MAX_ATTEMPTS = 5
+
+TASKS_LEASE_SECONDS = 300
@@ -17,10 +17,30 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.contrib.auth.forms import UserCreationForm
-from django.urls import include, path, reverse_lazy
+from django.contrib.auth.views import (PasswordResetConfirmView,
+                                       PasswordResetView)
+from django.urls import include, path, re_path, reverse_lazy
 from django.views.generic.edit import CreateView
 
+from blog.forms import PasswordResetForm
+from core import staticfiles
+
 auth_urlpatterns = [
+    path(
+        'password_reset/',
+        PasswordResetView.as_view(
+            form_class=PasswordResetForm,
+            success_url=reverse_lazy('auth:password_reset_done'),
+        ),
+        name='password_reset',
+    ),
+    path(
+        'reset/<uidb64>/<token>/',
+        PasswordResetConfirmView.as_view(
+            success_url=reverse_lazy('auth:password_reset_complete'),
+        ),
+        name='password_reset_confirm',
+    ),
     path('', include('django.contrib.auth.urls')),
     path(
         'registration/',
@@ -38,6 +58,10 @@ urlpatterns = [
     path('pages/', include('pages.urls', namespace='pages')),
     path('admin/', admin.site.urls),
     path('auth/', include((auth_urlpatterns, 'auth'))),
+    re_path(
+        rf'^{settings.STATIC_URL.lstrip("/")}(?P<path>.+)$',
+        staticfiles.serve
+    ),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
 if settings.DEBUG:
@@ -11,6 +11,9 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
+from core.static_app import StaticFilesWSGI
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blogicum.settings')
 
-application = get_wsgi_application()
+# Статику отдаёт StaticFilesWSGI, минуя middleware и URL.
+application = StaticFilesWSGI(get_wsgi_application())
@@ -0,0 +1,163 @@
+"""Удаление неиспользуемых правил CSS.
+
+Используемые классы определяются как в PurgeCSS: из HTML шаблонов
+(и разметки форм django_bootstrap5) берутся все слова из букв, цифр,
+«-» и «_». Это с запасом — слово в тексте или в JavaScript тоже
+считается классом, — зато классы, собранные в шаблоне из частей или
+добавленные скриптом, не теряются.
+
+Селектор остаётся, если все его классы встречаются среди слов; классы
+внутри :not() не учитываются. Правило без оставшихся селекторов,
+пустые @media и @supports и @keyframes, на которые ничего не ссылается,
+удаляются. Разбор рассчитан на минифицированный CSS вроде Bootstrap,
+а не на произвольный: комментарии, кроме /*! ... */, выбрасываются.
+"""
+import re
+
+WORD = re.compile(r'[A-Za-z0-9_-]+')
+CLASS = re.compile(r'\.(-?[A-Za-z_][\w-]*)')
+NOT = re.compile(r':not\([^()]*\)')
+KEYFRAMES = re.compile(r'@(?:-webkit-)?keyframes\s+([\w-]+)')
+# At-правила, внутри которых — обычные правила.
+NESTED = ('@media', '@supports')
+
+
+def used_words(texts):
+    words = set()
+    for text in texts:
+        words.update(WORD.findall(text))
+    return words
+
+
+def _strip_comments(css):
+    def replace(match):
+        return match.group(0) if match.group(0).startswith('/*!') else ''
+    return re.sub(r'/\*.*?\*/', replace, css, flags=re.S)
+
+
+def parse(css):
+    """Список (prelude, body); body — строка объявлений или вложенный
+    список для @media и @supports"""
+    rules, i = _parse_block(_strip_comments(css), 0)
+    return rules
+
+
+def _parse_block(css, i):
+    rules = []
+    start = i
+    while i < len(css):
+        char = css[i]
+        if char in '"\'':
+            i = css.index(char, i + 1) + 1
+            continue
+        if css.startswith('/*', i):
+            # Оставленный /*! ... */ — отдельное правило без блока.
+            end = css.index('*/', i) + 2
+            rules.append((css[i:end], None))
+            start = i = end
+            continue
+        if char == ';' and css[start:i].lstrip().startswith('@'):
+            # @charset, @import: правило без блока.
+            rules.append((css[start:i + 1].strip(), None))
+            start = i = i + 1
+            continue
+        if char == '{':
+            prelude = css[start:i].strip()
+            if prelude.startswith(NESTED):
+                body, i = _parse_block(css, i + 1)
+            else:
+                body, i = _read_body(css, i + 1)
+            rules.append((prelude, body))
+            start = i
+            continue
+        if char == '}':
+            return rules, i + 1
+        i += 1
+    tail = css[start:].strip()
+    if tail:
+        rules.append((tail, None))
+    return rules, i
+
+
+def _read_body(css, i):
+    """Объявления до парной «}» (в @keyframes и @font-face — вложенные)"""
+    depth, start = 1, i
+    while depth:
+        char = css[i]
+        if char in '"\'':
+            i = css.index(char, i + 1)
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+        i += 1
+    return css[start:i - 1], i
+
+
+def split_selectors(prelude):
+    """Селекторы через запятую верхнего уровня (не внутри скобок)"""
+    selectors, depth, start = [], 0, 0
+    for i, char in enumerate(prelude):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == ',' and not depth:
+            selectors.append(prelude[start:i])
+            start = i + 1
+    selectors.append(prelude[start:])
+    return [selector.strip() for selector in selectors]
+
+
+def is_used(selector, words):
+    return all(
+        name in words for name in CLASS.findall(NOT.sub('', selector))
+    )
+
+
+def _prune(rules, words):
+    kept = []
+    for prelude, body in rules:
+        if body is None or prelude.startswith('@'):
+            if isinstance(body, list):
+                body = _prune(body, words)
+                if not body:
+                    continue
+            kept.append((prelude, body))
+            continue
+        selectors = [
+            selector for selector in split_selectors(prelude)
+            if is_used(selector, words)
+        ]
+        if selectors:
+            kept.append((','.join(selectors), body))
+    return kept
+
+
+def serialize(rules):
+    parts = []
+    for prelude, body in rules:
+        if body is None:
+            parts.append(prelude)
+        elif isinstance(body, list):
+            parts.append(f'{prelude}{{{serialize(body)}}}')
+        else:
+            parts.append(f'{prelude}{{{body}}}')
+    return ''.join(parts)
+
+
+def _drop_unused_keyframes(rules):
+    text = serialize([
+        rule for rule in rules if not KEYFRAMES.match(rule[0])
+    ])
+    return [
+        rule for rule in rules
+        if not KEYFRAMES.match(rule[0])
+        or re.search(
+            rf'\b{re.escape(KEYFRAMES.match(rule[0]).group(1))}\b', text)
+    ]
+
+
+def prune(css, words):
+    """CSS только с правилами, селекторы которых используют words"""
+    return serialize(_drop_unused_keyframes(_prune(parse(css), words)))
@@ -0,0 +1,282 @@
+"""Отдача собранной статики в процессе — для узлов без nginx.
+
+StaticFilesWSGI и StaticFilesASGI оборачивают приложение Django
+(blogicum/wsgi.py, asgi.py) и отвечают на GET и HEAD к STATIC_URL сами,
+минуя middleware и разрешение URL. Файлы STATIC_ROOT индексируются
+один раз при запуске: размер, дата изменения, ETag и сжатые копии
+(.br, .gz от collectstatic) известны заранее, на запрос нет ни stat(),
+ни чтения файла целиком в память.
+
+Тело отдаётся без копирования, если сервер это умеет: wsgi.file_wrapper
+(sendfile у gunicorn), расширения ASGI http.response.zerocopysend
+и http.response.pathsend. Поддерживаются If-None-Match,
+If-Modified-Since и один диапазон Range (с If-Range).
+
+Файла нет в индексе (collectstatic после запуска) или DEBUG — запрос
+уходит в Django, где его обслужит core.staticfiles.serve или
+runserver.
+"""
+import mimetypes
+import os
+import re
+from collections import namedtuple
+from http import HTTPStatus
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+
+from .staticfiles import ENCODINGS, accepted_encodings, cache_control
+
+BLOCK_SIZE = 64 * 1024
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+# Заголовки запроса, от которых зависит ответ.
+REQUEST_HEADERS = ('accept-encoding', 'if-none-match', 'if-modified-since',
+                   'range', 'if-range')
+
+# Представление файла: исходное (encoding None) или сжатая копия.
+Variant = namedtuple('Variant', 'path size etag encoding')
+StaticFile = namedtuple(
+    'StaticFile', 'content_type mtime cache_control variants'
+)
+# Что отдать: код ответа, заголовки и (Variant, начало, длина) тела.
+Response = namedtuple('Response', 'status headers body')
+
+
+def _variant(path, encoding=None):
+    stat = os.stat(path)
+    suffix = f'-{encoding}' if encoding else ''
+    return Variant(
+        path, stat.st_size,
+        f'"{int(stat.st_mtime):x}-{stat.st_size:x}{suffix}"', encoding
+    )
+
+
+def build_index(root):
+    """Имя файла относительно root → StaticFile"""
+    index = {}
+    if not root or not os.path.isdir(root):
+        return index
+    extensions = tuple(extension for extension, _ in ENCODINGS)
+    for directory, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            if (filename.endswith(extensions)
+                    and os.path.isfile(os.path.splitext(path)[0])):
+                continue
+            name = os.path.relpath(path, root).replace(os.sep, '/')
+            variants = [
+                _variant(path + extension, coding)
+                for extension, coding in ENCODINGS
+                if os.path.isfile(path + extension)
+            ]
+            original = _variant(path)
+            content_type, _ = mimetypes.guess_type(path)
+            index[name] = StaticFile(
+                content_type or 'application/octet-stream',
+                int(os.stat(path).st_mtime), cache_control(name),
+                (*variants, original),
+            )
+    return index
+
+
+def _not_modified(headers, variant, mtime):
+    if 'if-none-match' in headers:
+        etags = parse_etags(headers['if-none-match'])
+        # Для If-None-Match слабое сравнение: W/ не учитывается.
+        return '*' in etags or any(
+            (etag[2:] if etag.startswith('W/') else etag) == variant.etag
+            for etag in etags
+        )
+    since = parse_http_date_safe(headers.get('if-modified-since', ''))
+    return since is not None and mtime <= since
+
+
+def _byte_range(headers, variant, mtime):
+    """(начало, длина); None — отдать файл целиком; ValueError —
+    диапазон за пределами файла"""
+    match = RANGE.match(headers.get('range', '').replace(' ', ''))
+    if match is None:
+        # Несколько диапазонов не поддерживаются: весь файл тоже ответ.
+        return None
+    if_range = headers.get('if-range')
+    if if_range is not None and if_range != variant.etag and (
+            parse_http_date_safe(if_range) != mtime):
+        return None
+    first, last = match.groups()
+    size = variant.size
+    if not first:
+        if not last or not int(last):
+            raise ValueError
+        start = max(size - int(last), 0)
+        end = size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+    if start >= size:
+        raise ValueError
+    return start, end - start + 1
+
+
+def respond(static_file, headers):
+    """Ответ на GET static_file; headers — заголовки запроса с именами
+    в нижнем регистре"""
+    accepted = accepted_encodings(headers.get('accept-encoding', ''))
+    variant = next(
+        variant for variant in static_file.variants
+        if variant.encoding is None or variant.encoding in accepted
+    )
+    response_headers = [
+        ('Last-Modified', http_date(static_file.mtime)),
+        ('ETag', variant.etag),
+        ('Cache-Control', static_file.cache_control),
+        ('Vary', 'Accept-Encoding'),
+    ]
+    if _not_modified(headers, variant, static_file.mtime):
+        return Response(304, response_headers, None)
+    response_headers += [
+        ('Content-Type', static_file.content_type),
+        ('Accept-Ranges', 'bytes'),
+    ]
+    if variant.encoding:
+        response_headers.append(('Content-Encoding', variant.encoding))
+    if getattr(settings, 'SECURE_CONTENT_TYPE_NOSNIFF', False):
+        # Без middleware этот заголовок SecurityMiddleware не добавит.
+        response_headers.append(('X-Content-Type-Options', 'nosniff'))
+    try:
+        byte_range = _byte_range(headers, variant, static_file.mtime)
+    except ValueError:
+        return Response(416, response_headers + [
+            ('Content-Range', f'bytes */{variant.size}'),
+            ('Content-Length', '0'),
+        ], None)
+    if byte_range is None:
+        return Response(200, response_headers + [
+            ('Content-Length', str(variant.size)),
+        ], (variant, 0, variant.size))
+    start, length = byte_range
+    return Response(206, response_headers + [
+        ('Content-Range',
+         f'bytes {start}-{start + length - 1}/{variant.size}'),
+        ('Content-Length', str(length)),
+    ], (variant, start, length))
+
+
+def _read(file, start, length):
+    """Блоки файла от start длиной length; файл закрывается в конце"""
+    try:
+        file.seek(start)
+        while length > 0:
+            block = file.read(min(BLOCK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+    finally:
+        file.close()
+
+
+class StaticFiles:
+    """Индекс STATIC_ROOT и поиск файла по пути запроса"""
+
+    def __init__(self, application, root=None, prefix=None):
+        self.application = application
+        self.prefix = prefix or settings.STATIC_URL
+        self.index = {} if settings.DEBUG else build_index(
+            root or settings.STATIC_ROOT
+        )
+
+    def find(self, method, path):
+        if (method not in ('GET', 'HEAD')
+                or not path.startswith(self.prefix)):
+            return None
+        return self.index.get(path[len(self.prefix):])
+
+
+class StaticFilesWSGI(StaticFiles):
+    """WSGI-приложение: статика из индекса, остальное — application"""
+
+    def __call__(self, environ, start_response):
+        method = environ['REQUEST_METHOD']
+        try:
+            # PATH_INFO по PEP 3333 — байты UTF-8 в строке latin-1.
+            path = environ.get('PATH_INFO', '').encode('latin-1').decode()
+        except UnicodeError:
+            path = ''
+        static_file = self.find(method, path)
+        if static_file is None:
+            return self.application(environ, start_response)
+        response = respond(static_file, {
+            name: environ[f'HTTP_{name.upper().replace("-", "_")}']
+            for name in REQUEST_HEADERS
+            if f'HTTP_{name.upper().replace("-", "_")}' in environ
+        })
+        status = HTTPStatus(response.status)
+        start_response(f'{status.value} {status.phrase}', response.headers)
+        if response.body is None or method == 'HEAD':
+            return []
+        variant, start, length = response.body
+        file = open(variant.path, 'rb')
+        file_wrapper = environ.get('wsgi.file_wrapper')
+        if file_wrapper is not None and length == variant.size:
+            # Весь файл: сервер может отдать его через sendfile().
+            return file_wrapper(file, BLOCK_SIZE)
+        return _read(file, start, length)
+
+
+class StaticFilesASGI(StaticFiles):
+    """ASGI-приложение: статика из индекса, остальное — application"""
+
+    async def __call__(self, scope, receive, send):
+        static_file = None
+        if scope['type'] == 'http':
+            static_file = self.find(scope['method'], scope['path'])
+        if static_file is None:
+            return await self.application(scope, receive, send)
+        headers = {}
+        for name, value in scope['headers']:
+            name = name.decode('latin-1').lower()
+            if name in REQUEST_HEADERS:
+                headers[name] = value.decode('latin-1')
+        response = respond(static_file, headers)
+        await send({
+            'type': 'http.response.start',
+            'status': response.status,
+            'headers': [
+                (name.lower().encode('latin-1'), value.encode('latin-1'))
+                for name, value in response.headers
+            ],
+        })
+        if response.body is None or scope['method'] == 'HEAD':
+            await send({'type': 'http.response.body'})
+            return
+        await self.send_file(scope, send, *response.body)
+
+    async def send_file(self, scope, send, variant, start, length):
+        extensions = scope.get('extensions') or {}
+        if 'http.response.zerocopysend' in extensions:
+            with open(variant.path, 'rb') as file:
+                await send({
+                    'type': 'http.response.zerocopysend',
+                    'file': file, 'offset': start, 'count': length,
+                })
+            return
+        if 'http.response.pathsend' in extensions and length == variant.size:
+            await send({'type': 'http.response.pathsend',
+                        'path': variant.path})
+            return
+        # Чтение с диска — в потоке, чтобы не останавливать цикл событий.
+        blocks = _read(open(variant.path, 'rb'), start, length)
+        read = sync_to_async(next, thread_sensitive=False)
+        try:
+            while True:
+                block = await read(blocks, None)
+                if block is None:
+                    break
+                await send({'type': 'http.response.body', 'body': block,
+                            'more_body': True})
+        finally:
+            blocks.close()
+        await send({'type': 'http.response.body'})
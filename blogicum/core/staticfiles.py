@@ -0,0 +1,135 @@
+"""Статика с хэшем содержимого в имени и сжатыми копиями.
+
+collectstatic с CompressedManifestStorage (STATICFILES_STORAGE) пишет
+в STATIC_ROOT файлы вида css/bootstrap.min.1a2b3c4d5e6f.css, манифест
+staticfiles.json, по которому {% static %} подставляет эти имена,
+и рядом с текстовыми файлами — копии .gz и .br (brotli, если пакет
+установлен), если они меньше оригинала.
+
+Имя с хэшем меняется вместе с содержимым, поэтому serve() отдаёт такие
+файлы с Cache-Control: immutable на год: повторный просмотр страницы их
+не запрашивает. Остальные файлы кэшируются на STATIC_MAX_AGE секунд.
+"""
+import gzip
+import mimetypes
+import os
+import posixpath
+from functools import cached_property
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import (ManifestStaticFilesStorage,
+                                                staticfiles_storage)
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE = ('.css', '.js', '.svg', '.ico', '.json', '.txt', '.map')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+# (расширение, Content-Encoding) в порядке предпочтения.
+ENCODINGS = (('.br', 'br'), ('.gz', 'gzip'))
+
+
+def compress(path):
+    """Пишет path.gz и path.br, если они меньше оригинала"""
+    with open(path, 'rb') as file:
+        content = file.read()
+    # mtime=0: одинаковый файл даёт одинаковый .gz при каждой сборке.
+    variants = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(content)
+    for extension, compressed in variants.items():
+        if len(compressed) < len(content):
+            with open(path + extension, 'wb') as file:
+                file.write(compressed)
+
+
+def accepted_encodings(header):
+    """Кодировки из Accept-Encoding, кроме запрещённых q=0"""
+    accepted = set()
+    for item in header.split(','):
+        coding, _, params = item.partition(';')
+        quality = params.replace(' ', '').partition('q=')[2]
+        try:
+            allowed = float(quality) > 0 if quality else True
+        except ValueError:
+            allowed = False
+        if coding.strip() and allowed:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class CompressedManifestStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage со сжатыми копиями.
+
+    Файла нет в манифесте (например, collectstatic не запускали) —
+    {% static %} даёт исходное имя вместо ValueError.
+    """
+    manifest_strict = False
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in {*paths, *self.hashed_files.values()}:
+            if name.endswith(COMPRESSIBLE) and self.exists(name):
+                compress(self.path(name))
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    @cached_property
+    def immutable_names(self):
+        return frozenset(self.hashed_files.values())
+
+
+def cache_control(name):
+    if name in getattr(staticfiles_storage, 'immutable_names', ()):
+        return IMMUTABLE
+    return f'public, max-age={getattr(settings, "STATIC_MAX_AGE", 3600)}'
+
+
+def serve(request, path):
+    """Файл из STATIC_ROOT: сжатая копия по Accept-Encoding и
+    Cache-Control по имени"""
+    name = posixpath.normpath(path).lstrip('/')
+    try:
+        fullpath = safe_join(settings.STATIC_ROOT, name)
+    except SuspiciousFileOperation:
+        raise Http404(name)
+    if not os.path.isfile(fullpath):
+        raise Http404(name)
+    content_type, encoding = mimetypes.guess_type(fullpath)
+    accepted = accepted_encodings(
+        request.META.get('HTTP_ACCEPT_ENCODING', '')
+    )
+    for extension, coding in ENCODINGS:
+        if coding in accepted and os.path.isfile(fullpath + extension):
+            fullpath += extension
+            encoding = coding
+            break
+    stat = os.stat(fullpath)
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'),
+                              stat.st_mtime, stat.st_size):
+        response = HttpResponseNotModified()
+    else:
+        response = FileResponse(
+            open(fullpath, 'rb'),
+            content_type=content_type or 'application/octet-stream'
+        )
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        if encoding:
+            response['Content-Encoding'] = encoding
+    response['Cache-Control'] = cache_control(name)
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
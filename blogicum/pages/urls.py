@@ -1,11 +1,16 @@
 from django.urls import path
-from django.views.generic import TemplateView
+
+from blog.views import read_view
+
+from .views import StaticPageView
 
 app_name = 'pages'
 
 urlpatterns = [
-    path('about/', TemplateView.as_view(template_name='pages/about.html'),
+    path('about/',
+         read_view(StaticPageView, template_name='pages/about.html'),
          name='about'),
-    path('rules/', TemplateView.as_view(template_name='pages/rules.html'),
+    path('rules/',
+         read_view(StaticPageView, template_name='pages/rules.html'),
          name='rules'),
 ]
@@ -1,5 +1,11 @@
 from django.shortcuts import render
 from django.views.decorators.csrf import requires_csrf_token
+from django.views.generic import TemplateView
+
+
+class StaticPageView(TemplateView):
+    """Статическая страница; читает из реплики базы (blog.replica)"""
+    read_from_replica = True
 
 
 @requires_csrf_token
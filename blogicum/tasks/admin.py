@@ -0,0 +1,45 @@
+from django.contrib import admin
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from .models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = (
+        'id', 'name', 'status', 'attempts', 'max_attempts', 'run_at',
+        'locked_by', 'created_at', 'finished_at'
+    )
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'key')
+    readonly_fields = ('locked_by', 'locked_until', 'created_at',
+                       'finished_at', 'last_error')
+    actions = ('retry',)
+
+    @admin.action(description='Повторить сейчас')
+    def retry(self, request, queryset):
+        updated = queryset.exclude(status=Task.RUNNING).update(
+            status=Task.PENDING, run_at=timezone.now(), attempts=0,
+            finished_at=None
+        )
+        self.message_user(request, f'Поставлено в очередь задач: {updated}')
+
+    def changelist_view(self, request, extra_context=None):
+        """Сводка очереди над списком: число задач по состояниям и
+        сколько ждёт самая старая готовая к выполнению"""
+        counts = dict(Task.objects.order_by().values_list(
+            'status'
+        ).annotate(Count('pk')))
+        oldest = Task.objects.filter(
+            status=Task.PENDING, run_at__lte=timezone.now()
+        ).aggregate(oldest=Min('run_at'))['oldest']
+        extra_context = {
+            'task_counts': [
+                (label, counts.get(status, 0))
+                for status, label in Task.STATUSES
+            ],
+            'oldest_due': oldest,
+            **(extra_context or {}),
+        }
+        return super().changelist_view(request, extra_context)
@@ -0,0 +1,87 @@
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, connections
+
+from tasks import queue
+
+logger = logging.getLogger(__name__)
+
+
+def work(worker, loop, interval, stop):
+    """Цикл одного воркера: задачи, пока они есть, затем ожидание"""
+    try:
+        while not stop.is_set():
+            try:
+                done = queue.run_next(worker)
+            except DatabaseError:
+                # С --loop воркер не должен умирать от временного сбоя
+                # базы: задача, которую он держал, вернётся после аренды.
+                logger.exception('Воркер %s: ошибка базы данных', worker)
+                done = False
+            if not done and (not loop or stop.wait(interval)):
+                return
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет фоновые задачи из очереди в --workers потоках или '
+        'процессах. С --loop работает постоянно.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=4,
+            help='Сколько задач выполнять одновременно.'
+        )
+        parser.add_argument(
+            '--processes', action='store_true',
+            help='Воркеры — процессы, а не потоки: для задач, которые '
+                 'занимают CPU.'
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а ждать новых задач.'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1,
+            help='Пауза между проверками пустой очереди с --loop, секунд.'
+        )
+
+    def handle(self, *args, **options):
+        prefix = f'{socket.gethostname()}:{os.getpid()}'
+        if options['processes']:
+            context = multiprocessing.get_context('fork')
+            stop = context.Event()
+            # Дочерним процессам не достаются открытые соединения.
+            connections.close_all()
+            workers = [
+                context.Process(target=work, args=(
+                    f'{prefix}:p{i}', options['loop'], options['interval'],
+                    stop))
+                for i in range(options['workers'])
+            ]
+        else:
+            stop = threading.Event()
+            workers = [
+                threading.Thread(target=work, args=(
+                    f'{prefix}:t{i}', options['loop'], options['interval'],
+                    stop))
+                for i in range(options['workers'])
+            ]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            # Текущие задачи доделываются, новые не забираются.
+            stop.set()
+            for worker in workers:
+                worker.join()
@@ -0,0 +1,75 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField(max_length=128, verbose_name='Задача')
+    payload = models.JSONField(
+        default=dict, blank=True, verbose_name='Аргументы'
+    )
+    key = models.CharField(
+        max_length=255,
+        unique=True,
+        null=True,
+        blank=True,
+        verbose_name='Ключ идемпотентности',
+        help_text='Задача с тем же ключом ставится в очередь один раз.'
+    )
+    status = models.CharField(
+        max_length=8, choices=STATUSES, default=PENDING,
+        verbose_name='Состояние'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='Попыток'
+    )
+    max_attempts = models.PositiveSmallIntegerField(
+        default=5, verbose_name='Наибольшее число попыток'
+    )
+    run_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Выполнить не раньше',
+        help_text='Для повтора после ошибки сдвигается с экспоненциальной '
+                  'задержкой.'
+    )
+    locked_by = models.CharField(
+        max_length=64, blank=True, verbose_name='Воркер'
+    )
+    locked_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Занята до',
+        help_text='Если воркер не завершил задачу к этому времени, её '
+                  'забирает другой.'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='Добавлено'
+    )
+    finished_at = models.DateTimeField(
+        null=True, blank=True, verbose_name='Завершена'
+    )
+
+    class Meta:
+        verbose_name = 'задача'
+        verbose_name_plural = 'Задачи'
+        ordering = ('-created_at',)
+        indexes = (
+            models.Index(
+                fields=('status', 'run_at'),
+                name='task_due_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.name} #{self.pk}'
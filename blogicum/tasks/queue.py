@@ -0,0 +1,148 @@
+"""Очередь фоновых задач в базе данных проекта.
+
+Задача — функция, зарегистрированная декоратором register() в модуле
+tasks.py приложения; в очередь попадают её имя и именованные аргументы
+(JSON). enqueue() пишет строку Task в текущей транзакции: задача видна
+воркеру только после фиксации изменений, которые её породили, и
+пропадает вместе с ними при откате.
+
+Воркер (команда run_tasks) забирает задачу условным UPDATE — это
+работает и на SQLite без SELECT ... FOR UPDATE — и держит её до
+locked_until. Упавшая задача повторяется с экспоненциальной задержкой
+до max_attempts раз, задача умершего воркера после locked_until
+достаётся другому. Поэтому задачи должны выдерживать повторный запуск.
+"""
+import logging
+import random
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, OperationalError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+def register(name, *, max_attempts=None):
+    """Регистрирует функцию как задачу name"""
+    def decorator(func):
+        _registry[name] = func
+        func.task_name = name
+        func.max_attempts = max_attempts
+        return func
+    return decorator
+
+
+def retry_delay(attempts):
+    """Задержка перед попыткой attempts + 1: удваивается с каждой
+    неудачей, с разбросом ±10 %, чтобы повторы не сходились"""
+    base = getattr(settings, 'TASKS_RETRY_DELAY', 10)
+    cap = getattr(settings, 'TASKS_MAX_RETRY_DELAY', 3600)
+    delay = min(base * 2 ** (attempts - 1), cap)
+    return timedelta(seconds=delay * random.uniform(0.9, 1.1))
+
+
+def lease():
+    return timedelta(seconds=getattr(settings, 'TASKS_LEASE_SECONDS', 300))
+
+
+def enqueue(name, /, *, key=None, delay=None, **payload):
+    """Ставит задачу name с аргументами payload в очередь.
+
+    Если задача с ключом идемпотентности key уже есть (в любом
+    состоянии), новая не создаётся и возвращается существующая. name
+    только позиционный: аргумент задачи тоже может называться name.
+    """
+    func = _registry[name]
+    fields = {
+        'name': name,
+        'payload': payload,
+        'max_attempts': func.max_attempts
+        or getattr(settings, 'TASKS_MAX_ATTEMPTS', 5),
+        'run_at': timezone.now() + (delay or timedelta()),
+    }
+    if key is None:
+        return Task.objects.create(**fields)
+    try:
+        with transaction.atomic():
+            return Task.objects.create(key=key, **fields)
+    except IntegrityError:
+        return Task.objects.get(key=key)
+
+
+def _due(now):
+    return (Q(status=Task.PENDING, run_at__lte=now)
+            | Q(status=Task.RUNNING, locked_until__lt=now))
+
+
+def claim(worker, batch=10):
+    """Забирает одну готовую к выполнению задачу или возвращает None"""
+    now = timezone.now()
+    candidates = Task.objects.filter(_due(now)).order_by(
+        'run_at', 'pk'
+    ).values_list('pk', flat=True)[:batch]
+    for pk in candidates:
+        claimed = Task.objects.filter(_due(now), pk=pk).update(
+            status=Task.RUNNING,
+            attempts=F('attempts') + 1,
+            locked_by=worker,
+            locked_until=now + lease(),
+        )
+        if claimed:
+            return Task.objects.get(pk=pk)
+    return None
+
+
+def execute(task):
+    """Выполняет забранную задачу и записывает результат"""
+    func = _registry.get(task.name)
+    try:
+        if func is None:
+            raise LookupError(f'Задача {task.name} не зарегистрирована')
+        with transaction.atomic():
+            func(**task.payload)
+    except Exception:
+        logger.exception('Задача %s упала', task)
+        now = timezone.now()
+        if task.attempts < task.max_attempts:
+            result = {'status': Task.PENDING,
+                      'run_at': now + retry_delay(task.attempts)}
+        else:
+            result = {'status': Task.FAILED, 'finished_at': now}
+        result['last_error'] = traceback.format_exc()
+    else:
+        result = {'status': Task.DONE, 'finished_at': timezone.now()}
+    return _finish(task, result)
+
+
+def _finish(task, result, retries=3):
+    """Записывает итог задачи, повторяя запись при блокировке базы:
+    иначе выполненная задача висит до конца аренды и запускается снова"""
+    for retry in range(retries + 1):
+        try:
+            # Если аренда истекла и задачу забрал другой воркер, итог
+            # за ним.
+            return Task.objects.filter(
+                pk=task.pk, locked_by=task.locked_by,
+                attempts=task.attempts
+            ).update(locked_until=None, **result)
+        except OperationalError:
+            if retry == retries:
+                raise
+            time.sleep(0.05 * 2 ** retry)
+
+
+def run_next(worker):
+    """Выполняет одну задачу; False — готовых задач нет"""
+    task = claim(worker)
+    if task is None:
+        return False
+    execute(task)
+    return True
@@ -0,0 +1,50 @@
+import asyncio
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.test import AsyncRequestFactory
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True)
+]
+
+
+def test_read_view_is_async_under_asgi(settings):
+    from blog import views
+    settings.BLOG_ASYNC_READ_VIEWS = True
+    view = views.read_view(views.BlogListView)
+    assert asyncio.iscoroutinefunction(view), (
+        'Убедитесь, что под ASGI представления чтения асинхронные.')
+    assert view.view_class is views.BlogListView
+    settings.BLOG_ASYNC_READ_VIEWS = False
+    assert not asyncio.iscoroutinefunction(
+        views.read_view(views.BlogListView))
+
+
+def test_async_view_renders_in_executor(
+        monkeypatch, post_with_published_location):
+    from blog import views
+    post = post_with_published_location
+    threads = []
+    get_object = views.PostDetailView.get_object
+
+    def recording_get_object(self, queryset=None):
+        threads.append(threading.current_thread().name)
+        return get_object(self, queryset)
+
+    monkeypatch.setattr(
+        views.PostDetailView, 'get_object', recording_get_object)
+    request = AsyncRequestFactory().get(f'/posts/{post.pk}/')
+    request.user = AnonymousUser()
+    response = async_to_sync(views.async_read_view(views.PostDetailView))(
+        request, pk=post.pk)
+    assert response.status_code == 200
+    assert post.title in response.content.decode('utf-8'), (
+        'Убедитесь, что асинхронное представление возвращает '
+        'отрендеренную страницу.')
+    assert threads and all(
+        name.startswith('blog-read') for name in threads), (
+        'Убедитесь, что запросы к базе асинхронных представлений '
+        'выполняются в пуле потоков read_executor().')
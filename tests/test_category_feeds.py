@@ -0,0 +1,84 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def _feed_ids(client, category):
+    response = client.get(f'/category/{category.slug}/')
+    assert response.status_code == 200
+    return [post.id for post in response.context['page_obj']]
+
+
+def test_materialized_feed_matches_live_query(
+        user_client, many_posts_with_published_locations):
+    category = many_posts_with_published_locations[0].category
+    expected = _feed_ids(user_client, category)
+    call_command('rebuild_category_feeds', category.slug)
+    assert category.feed_entries.count() == len(
+        many_posts_with_published_locations)
+    with CaptureQueriesContext(connection) as ctx:
+        assert _feed_ids(user_client, category) == expected, (
+            'Убедитесь, что страница категории с материализованной лентой '
+            'выводит те же публикации в том же порядке.'
+        )
+    assert not any(
+        'JOIN' in query['sql'] and 'blog_categoryfeedentry' in query['sql']
+        for query in ctx.captured_queries
+    ), 'Убедитесь, что записи ленты выбираются без соединений таблиц.'
+
+
+def test_feed_follows_post_changes(
+        user_client, mixer, user, published_category, published_location):
+    other = mixer.blend('blog.Category', is_published=True)
+    call_command('rebuild_category_feeds')
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        location=published_location)
+    assert _feed_ids(user_client, published_category) == [post.id], (
+        'Убедитесь, что новая публикация попадает в ленту категории.')
+
+    post.category = other
+    post.save()
+    assert _feed_ids(user_client, published_category) == []
+    assert _feed_ids(user_client, other) == [post.id], (
+        'Убедитесь, что перенос публикации меняет ленты обеих категорий.')
+
+    post.is_published = False
+    post.save()
+    assert _feed_ids(user_client, other) == []
+
+    post.is_published = True
+    post.pub_date = timezone.now() + timedelta(hours=1)
+    post.save()
+    assert _feed_ids(user_client, other) == []
+
+    from blog import scheduler
+    scheduler.publish_due_posts(post.pub_date + timedelta(seconds=1))
+    assert _feed_ids(user_client, other) == [post.id], (
+        'Убедитесь, что отложенная публикация появляется в ленте '
+        'категории при наступлении даты.')
+
+    post.delete()
+    assert _feed_ids(user_client, other) == []
+
+
+def test_check_category_feeds(
+        mixer, user, published_category, post_with_published_location):
+    call_command('rebuild_category_feeds')
+    call_command('check_category_feeds')
+
+    from blog.models import Post
+    Post.objects.filter(pk=post_with_published_location.pk).update(
+        is_published=False)
+    with pytest.raises(CommandError):
+        call_command('check_category_feeds')
+    call_command('check_category_feeds', '--fix')
+    call_command('check_category_feeds')
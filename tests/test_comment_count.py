@@ -0,0 +1,44 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_comment_count_follows_views(
+        user, user_client, post_with_published_location):
+    post = post_with_published_location
+    for i in range(2):
+        user_client.post(
+            f'/posts/{post.id}/comment/', {'text': f'Комментарий {i}'})
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        'Убедитесь, что при добавлении комментария увеличивается '
+        '`Post.comment_count`.'
+    )
+
+    comment = post.comment.first()
+    user_client.post(f'/posts/{post.id}/delete_comment/{comment.id}/')
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        'Убедитесь, что при удалении комментария уменьшается '
+        '`Post.comment_count`.'
+    )
+
+    response = user_client.get('/')
+    assert 'Комментарии (1)' in response.content.decode('utf-8')
+
+
+def test_recount_comments_command(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend('blog.Comment', post=post)
+    type(post).objects.filter(pk=post.pk).update(comment_count=0)
+    call_command('recount_comments', stdout=StringIO())
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        'Убедитесь, что команда `recount_comments` восстанавливает '
+        'количество комментариев.'
+    )
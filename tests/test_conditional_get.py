@@ -0,0 +1,108 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from django.test import Client
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def post(mixer, user, published_location):
+    return mixer.blend(
+        'blog.Post', author=user, location=published_location,
+        category__is_published=True)
+
+
+def test_etag_not_modified(client, user, post):
+    urls = (
+        '/', f'/category/{post.category.slug}/',
+        f'/posts/{post.id}/', f'/profile/{user.username}/',
+    )
+    for url in urls:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.has_header('ETag'), (
+            f'Убедитесь, что страница `{url}` отдаёт заголовок ETag.')
+        response = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Убедитесь, что страница `{url}` отвечает 304 на '
+            'If-None-Match с актуальным ETag.'
+        )
+        assert not response.content
+
+
+def test_etag_depends_on_user(client, user_client, post):
+    anonymous = client.get('/')['ETag']
+    response = user_client.get('/', HTTP_IF_NONE_MATCH=anonymous)
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что ETag анонимной страницы не подходит '
+        'авторизованному пользователю.'
+    )
+
+
+def test_detail_last_modified(client, mixer, another_user, post):
+    url = f'/posts/{post.id}/'
+    response = client.get(url)
+    last_modified = response['Last-Modified']
+    response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        'Убедитесь, что страница поста отвечает 304 на If-Modified-Since.')
+
+    etag = client.get(url)['ETag']
+    mixer.blend('blog.Comment', post=post, author=another_user)
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что новый комментарий меняет ETag страницы поста.')
+    post.refresh_from_db()
+    assert post.updated_at >= post.created_at
+
+
+def _csrf_token(response):
+    return re.search(
+        r'name="csrfmiddlewaretoken" value="([^"]+)"',
+        response.content.decode()
+    ).group(1)
+
+
+def test_relogin_changes_etag(mixer, post):
+    user = mixer.blend('auth.User', username='reader')
+    user.set_password('password')
+    user.save()
+    client = Client(enforce_csrf_checks=True)
+
+    def login():
+        token = _csrf_token(client.get('/auth/login/'))
+        response = client.post('/auth/login/', {
+            'username': 'reader', 'password': 'password',
+            'csrfmiddlewaretoken': token,
+        })
+        assert response.status_code == HTTPStatus.FOUND
+
+    url = f'/posts/{post.id}/'
+    login()
+    response = client.get(url)
+    etag, old_token = response['ETag'], _csrf_token(response)
+    client.get('/auth/logout/')
+    login()
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что после нового входа страница с формой не отвечает '
+        '304: в ней токен CSRF, который login() заменил.'
+    )
+    comment_url = f'/posts/{post.id}/comment/'
+    response = client.post(comment_url, {
+        'text': 'Комментарий', 'csrfmiddlewaretoken': old_token,
+    })
+    assert response.status_code == HTTPStatus.FORBIDDEN
+    response = client.post(comment_url, {
+        'text': 'Комментарий',
+        'csrfmiddlewaretoken': _csrf_token(client.get(url)),
+    })
+    assert response.status_code == HTTPStatus.FOUND, (
+        'Убедитесь, что комментарий с токеном со страницы после нового '
+        'входа принимается.'
+    )
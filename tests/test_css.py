@@ -0,0 +1,92 @@
+import re
+
+import pytest
+from django.contrib.staticfiles import finders
+from django.core.cache import cache
+from django.core.management import call_command
+
+from blog.management.commands.prune_css import (CRITICAL, PRUNED, SOURCE,
+                                                markup)
+from core import css
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+CLASS_ATTRIBUTE = re.compile(r'class="([^"]*)"')
+
+
+def _read(name):
+    with open(finders.find(name), encoding='utf-8') as file:
+        return file.read()
+
+
+def _classes(stylesheet, used):
+    """Классы из used в селекторах, которые применимы при классах used"""
+    return {
+        name for prelude, body in _rules(css.parse(stylesheet))
+        for selector in css.split_selectors(prelude)
+        if css.is_used(selector, used)
+        for name in css.CLASS.findall(selector)
+    }
+
+
+def _rules(rules):
+    for prelude, body in rules:
+        if isinstance(body, list):
+            yield from _rules(body)
+        elif body is not None:
+            yield prelude, body
+
+
+def test_pruned_css_is_up_to_date():
+    call_command('prune_css', check=True)
+
+
+def test_template_classes_kept():
+    used = set()
+    for text in markup():
+        for value in CLASS_ATTRIBUTE.findall(text):
+            # Без шаблонных вставок: {% if %} ... {% endif %} и {{ }}.
+            value = re.sub(r'{[{%].*?[%}]}', ' ', value)
+            used.update(value.split())
+    missing = (
+        _classes(_read(SOURCE), used) - _classes(_read(PRUNED), used)
+    )
+    assert not missing, (
+        f'Убедитесь, что `{PRUNED}` содержит правила для классов из '
+        f'шаблонов и форм; не хватает: {", ".join(sorted(missing))}.'
+    )
+    assert len(_read(PRUNED)) < len(_read(SOURCE)) / 3
+
+
+def test_prune_keeps_used_selectors():
+    stylesheet = (
+        ':root{--a:1}.btn,.card{color:red}.unused{color:blue}'
+        '.btn:not(.unused){top:0}'
+        '@media (min-width:576px){.unused{top:0}.card .card-body{top:1}}'
+        '@keyframes spin{to{transform:rotate(1turn)}}'
+        '.spinner{animation:spin 1s}'
+    )
+    assert css.prune(stylesheet, {'btn', 'card', 'card-body'}) == (
+        ':root{--a:1}.btn,.card{color:red}.btn:not(.unused){top:0}'
+        '@media (min-width:576px){.card .card-body{top:1}}'
+    )
+    assert 'keyframes' in css.prune(stylesheet, {'spinner'})
+
+
+def test_critical_css_inlined(client, settings):
+    settings.DEBUG = False
+    # Страницы из кэша могли быть отрисованы без встроенного CSS.
+    cache.clear()
+    response = client.get('/about/')
+    content = response.content.decode()
+    assert '<style>' not in content
+    settings.BLOG_CRITICAL_CSS = True
+    content = client.get('/rules/').content.decode()
+    assert f'<style>{_read(CRITICAL)}</style>' in content, (
+        'Убедитесь, что при `BLOG_CRITICAL_CSS = True` `base.html` '
+        f'встраивает `{CRITICAL}` в `<style>`.'
+    )
+    assert 'rel="preload"' in content
+    assert '<noscript><link rel="stylesheet"' in content
@@ -0,0 +1,80 @@
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_feed_queries_skip_dimension_tables(
+        user, user_client, many_posts_with_published_locations):
+    category = many_posts_with_published_locations[0].category
+    urls = ('/', f'/category/{category.slug}/', f'/profile/{user.username}/')
+    for url in urls:
+        user_client.get(url)
+        with CaptureQueriesContext(connection) as ctx:
+            response = user_client.get(url)
+        sql = ' '.join(query['sql'] for query in ctx.captured_queries)
+        assert 'FROM "blog_location"' not in sql and (
+            '"blog_location"."name"' not in sql), (
+            f'Убедитесь, что на странице `{url}` местоположения берутся '
+            'из памяти процесса, а не из базы данных.'
+        )
+        assert 'FROM "blog_category"' not in sql, (
+            f'Убедитесь, что на странице `{url}` категории берутся '
+            'из памяти процесса, а не из базы данных.'
+        )
+        for post in response.context['page_obj']:
+            assert post.location.name and post.category.slug
+
+
+def test_unpublished_location_fallback(
+        user_client, mixer, user, published_category):
+    location = mixer.blend('blog.Location', is_published=False)
+    mixer.blend('blog.Post', author=user, category=published_category,
+                location=location)
+    content = user_client.get('/').content.decode('utf-8')
+    assert 'Планета Земля' in content
+    assert location.name not in content
+
+
+def test_dimension_changes_reach_other_workers(
+        user_client, mixer, post_with_published_location):
+    from blog import page_cache
+    from blog.models import Location
+
+    location = post_with_published_location.location
+    user_client.get('/')
+    # Другой воркер изменил местоположение: в этом процессе сигнал не
+    # сработал, но версия в общем кэше сброшена.
+    Location.objects.filter(pk=location.pk).update(name='Новое место')
+    page_cache.bump(page_cache.DIMENSIONS)
+    post = user_client.get('/').context['page_obj'][0]
+    assert post.location.name == 'Новое место', (
+        'Убедитесь, что кэш справочников перечитывается после сброса '
+        'версии в общем кэше.'
+    )
+
+
+def test_dimensions_reload_after_ttl(
+        user_client, settings, post_with_published_location):
+    from blog import dimensions
+    from blog.models import Location
+
+    location = post_with_published_location.location
+    user_client.get('/')
+    # Другой воркер изменил местоположение, а сброс версии сюда не дошёл.
+    Location.objects.filter(pk=location.pk).update(name='Новое место')
+    post = user_client.get('/').context['page_obj'][0]
+    assert post.location.name == location.name
+
+    later = dimensions.time.monotonic() + settings.BLOG_DIMENSIONS_TTL + 1
+    with mock.patch.object(dimensions.time, 'monotonic', return_value=later):
+        post = user_client.get('/').context['page_obj'][0]
+    assert post.location.name == 'Новое место', (
+        'Убедитесь, что справочники перечитываются по истечении '
+        '`BLOG_DIMENSIONS_TTL` и без сброса версии.'
+    )
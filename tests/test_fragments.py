@@ -0,0 +1,51 @@
+from http import HTTPStatus
+
+import pytest
+from conftest import N_PER_PAGE
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.mark.parametrize('url', (
+    '/fragment/',
+    '/category/{category}/fragment/',
+    '/profile/{author}/fragment/',
+))
+def test_fragment_returns_cards_and_cursor(
+        url, user, client, many_posts_with_published_locations):
+    posts = many_posts_with_published_locations
+    url = url.format(category=posts[0].category.slug, author=user.username)
+
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    content = response.content.decode('utf-8')
+    assert '<html' not in content and '<header' not in content, (
+        'Убедитесь, что фрагмент ленты содержит только карточки публикаций.')
+    assert content.count('<article') == N_PER_PAGE
+    next_cursor = response['X-Next-Cursor']
+
+    response = client.get(url, {'cursor': next_cursor})
+    assert response.status_code == HTTPStatus.OK
+    assert response.content.decode('utf-8').count('<article') == (
+        len(posts) - N_PER_PAGE)
+    assert not response.has_header('X-Next-Cursor'), (
+        'Убедитесь, что у последней порции ленты нет курсора продолжения.')
+
+
+def test_fragment_respects_visibility(
+        client, posts_with_unpublished_category, future_posts):
+    response = client.get('/fragment/')
+    assert response.status_code == HTTPStatus.OK
+    assert '<article' not in response.content.decode('utf-8')
+
+    slug = posts_with_unpublished_category[0].category.slug
+    response = client.get(f'/category/{slug}/fragment/')
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_index_links_fragment_endpoint(
+        client, many_posts_with_published_locations):
+    content = client.get('/').content.decode('utf-8')
+    assert 'data-url="/fragment/"' in content
@@ -0,0 +1,104 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from blog.paginators import NEXT, PREVIOUS, encode_cursor
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='EXPLAIN QUERY PLAN — SQLite'),
+]
+
+
+def _query_plans(client, url, table):
+    """Планы всех запросов страницы с сортировкой по таблице `table`.
+
+    Запросы объясняются с теми же параметрами, что и выполнялись:
+    в SQL с подставленными значениями SQLite может выбрать другой план.
+    """
+    queries = []
+
+    def record(execute, sql, params, many, context):
+        queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(record):
+        response = client.get(url)
+    assert response.status_code == 200
+    plans = []
+    with connection.cursor() as cursor:
+        for sql, params in queries:
+            if f'FROM "{table}"' not in sql or 'ORDER BY' not in sql:
+                continue
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            plans.append(' | '.join(row[-1] for row in cursor.fetchall()))
+    assert plans, f'На странице `{url}` не найдено запросов к `{table}`.'
+    return plans
+
+
+@pytest.mark.parametrize('url, index', [
+    ('/', 'post_live_feed_idx'),
+    ('/?page=2', 'post_live_feed_idx'),
+    ('/category/{category}/', 'post_category_feed_idx'),
+    ('/profile/{author}/', 'post_author_feed_idx'),
+])
+def test_feed_queries_use_indexes(
+        url, index, user, client, many_posts_with_published_locations):
+    category = many_posts_with_published_locations[0].category
+    url = url.format(category=category.slug, author=user.username)
+    for plan in _query_plans(client, url, 'blog_post'):
+        assert f'USING INDEX {index}' in plan, (
+            f'Убедитесь, что запрос ленты `{url}` использует индекс '
+            f'`{index}`. План: {plan}'
+        )
+        assert 'TEMP B-TREE' not in plan, (
+            f'Убедитесь, что для сортировки ленты `{url}` не требуется '
+            f'временное B-дерево. План: {plan}'
+        )
+
+
+def test_comments_query_uses_index(user_client, comment_to_a_post):
+    url = f'/posts/{comment_to_a_post.post_id}/'
+    for plan in _query_plans(user_client, url, 'blog_comment'):
+        assert 'USING INDEX comment_post_created_idx' in plan, plan
+        assert 'TEMP B-TREE' not in plan, plan
+
+
+@pytest.mark.parametrize('direction, bound', [
+    (NEXT, 'pub_date<?'),
+    (PREVIOUS, 'pub_date>?'),
+])
+def test_cursor_query_is_index_range(
+        direction, bound, client, many_posts_with_published_locations):
+    post = sorted(many_posts_with_published_locations,
+                  key=lambda post: post.pub_date)[1]
+    url = f'/?cursor={encode_cursor(post, direction)}'
+    for plan in _query_plans(client, url, 'blog_post'):
+        assert (
+            f'SEARCH blog_post USING INDEX post_live_feed_idx ({bound})'
+            in plan
+        ), (
+            'Убедитесь, что запрос страницы по курсору ограничивает '
+            'диапазон индекса `post_live_feed_idx`, а не просматривает '
+            f'его от начала ленты. План: {plan}'
+        )
+        assert 'TEMP B-TREE' not in plan, plan
+
+
+def test_category_feed_cursor_query_is_index_range(
+        client, many_posts_with_published_locations):
+    category = many_posts_with_published_locations[0].category
+    call_command('rebuild_category_feeds', category.slug)
+    entry = category.feed_entries.order_by('pub_date')[1]
+    url = (f'/category/{category.slug}/'
+           f'?cursor={encode_cursor(entry, NEXT)}')
+    for plan in _query_plans(client, url, 'blog_categoryfeedentry'):
+        assert (
+            'INDEX category_feed_entry_idx (category_id=? AND pub_date<?)'
+            in plan
+        ), (
+            'Убедитесь, что запрос ленты категории по курсору ограничивает '
+            f'диапазон индекса по pub_date. План: {plan}'
+        )
+        assert 'TEMP B-TREE' not in plan, plan
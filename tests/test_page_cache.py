@@ -0,0 +1,72 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def _queries(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(ctx.captured_queries), response.content.decode('utf-8')
+
+
+@pytest.fixture
+def two_posts(mixer, user, published_location):
+    return mixer.cycle(2).blend(
+        'blog.Post', author=user, location=published_location,
+        category__is_published=True)
+
+
+def test_anonymous_pages_are_cached(client, user, two_posts):
+    post = two_posts[0]
+    urls = (
+        '/', f'/category/{post.category.slug}/',
+        f'/posts/{post.id}/', f'/profile/{user.username}/',
+    )
+    for url in urls:
+        _queries(client, url)
+        n_queries, _ = _queries(client, url)
+        assert n_queries == 0, (
+            f'Убедитесь, что страница `{url}` для анонимного пользователя '
+            'отдаётся из кэша без запросов к базе данных.'
+        )
+
+
+def test_logged_in_users_bypass_cache(user_client, two_posts):
+    _queries(user_client, '/')
+    n_queries, _ = _queries(user_client, '/')
+    assert n_queries > 0
+
+
+def test_comment_invalidates_only_affected_pages(
+        client, mixer, another_user, two_posts):
+    commented, other = two_posts
+    unaffected = (f'/posts/{other.id}/', f'/category/{other.category.slug}/')
+    for url in unaffected + (f'/posts/{commented.id}/',):
+        _queries(client, url)
+
+    comment = mixer.blend(
+        'blog.Comment', post=commented, author=another_user)
+
+    _, content = _queries(client, f'/posts/{commented.id}/')
+    assert comment.text.split('\n')[0][:20] in content, (
+        'Убедитесь, что новый комментарий сбрасывает кэш страницы поста.')
+    for url in unaffected:
+        n_queries, _ = _queries(client, url)
+        assert n_queries == 0, (
+            'Убедитесь, что комментарий к одному посту не сбрасывает кэш '
+            f'несвязанной страницы `{url}`.'
+        )
+
+
+def test_post_edit_invalidates_feed(client, two_posts):
+    post = two_posts[0]
+    _queries(client, '/')
+    post.title = 'Изменённый заголовок'
+    post.save()
+    _, content = _queries(client, '/')
+    assert 'Изменённый заголовок' in content
@@ -0,0 +1,108 @@
+import base64
+import json
+from http import HTTPStatus
+
+import pytest
+from blog.models import Post
+from conftest import N_PER_PAGE
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def _walk_cursor_pages(client, url):
+    """Проходит ленту по курсорам ">>" и возвращает id публикаций"""
+    seen = []
+    response = client.get(url)
+    while True:
+        assert response.status_code == HTTPStatus.OK
+        page_obj = response.context['page_obj']
+        seen.extend(post.id for post in page_obj)
+        if not page_obj.has_next():
+            return seen, page_obj
+        response = client.get(url, {'cursor': page_obj.next_cursor})
+
+
+def test_cursor_pages_cover_feed(
+        user, user_client, many_posts_with_published_locations):
+    posts = many_posts_with_published_locations
+    category = posts[0].category
+    expected = [
+        post.id for post in sorted(
+            posts, key=lambda post: (post.pub_date, post.id), reverse=True)
+    ]
+    for url in (
+            '/', f'/category/{category.slug}/', f'/profile/{user.username}/'):
+        seen, last_page = _walk_cursor_pages(user_client, url)
+        assert seen == expected, (
+            f'Убедитесь, что курсорная пагинация на `{url}` выводит все '
+            'публикации ровно один раз в порядке убывания даты.'
+        )
+        response = user_client.get(
+            url, {'cursor': last_page.previous_cursor})
+        assert [post.id for post in response.context['page_obj']] == (
+            expected[-2 * N_PER_PAGE:-N_PER_PAGE]
+        ), 'Убедитесь, что курсор "<<" возвращает предыдущую страницу.'
+
+
+def test_page_number_links_still_work(
+        user_client, many_posts_with_published_locations):
+    response = user_client.get('/', {'page': 2})
+    assert response.status_code == HTTPStatus.OK
+    page_obj = response.context['page_obj']
+    assert page_obj.number == 2
+    assert page_obj.previous_cursor, (
+        'Убедитесь, что у страниц с номером есть курсор для перехода назад.')
+    response = user_client.get('/', {'cursor': page_obj.previous_cursor})
+    assert list(response.context['page_obj']) == list(
+        user_client.get('/', {'page': 1}).context['page_obj'])
+
+
+def test_invalid_cursor_is_not_found(
+        user_client, many_posts_with_published_locations):
+    response = user_client.get('/', {'cursor': 'not-a-cursor'})
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        'Убедитесь, что некорректный курсор приводит к ошибке 404.')
+    for pk in (10 ** 30, -1):
+        raw = json.dumps(['n', '2020-01-01T00:00:00+00:00', pk])
+        cursor = base64.urlsafe_b64encode(raw.encode()).decode()
+        response = user_client.get('/', {'cursor': cursor})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Убедитесь, что курсор с id вне диапазона 64-битного целого '
+            'приводит к ошибке 404.')
+
+
+def test_feed_count_is_cached(
+        user_client, many_posts_with_published_locations):
+    user_client.get('/')
+    with CaptureQueriesContext(connection) as ctx:
+        response = user_client.get('/')
+    assert response.context['page_obj'].paginator.num_pages == 2
+    assert not any(
+        'COUNT(' in query['sql'] for query in ctx.captured_queries), (
+        'Убедитесь, что количество публикаций ленты берётся из кэша.')
+
+
+def test_feed_count_staleness(
+        user_client, mixer, many_posts_with_published_locations):
+    """Изменения в обход сигналов видны в счётчике после таймаута кэша,
+    изменения через модели — сразу."""
+    template = many_posts_with_published_locations[0]
+    assert user_client.get('/').context['paginator'].count == 2 * N_PER_PAGE
+
+    Post.objects.bulk_create([
+        Post(title='bulk', text='bulk', pub_date=template.pub_date,
+             author=template.author, category=template.category,
+             is_live=True)
+        for _ in range(N_PER_PAGE)
+    ])
+    assert user_client.get('/').context['paginator'].count == 2 * N_PER_PAGE
+
+    mixer.blend('blog.Post', author=template.author,
+                category=template.category, pub_date=template.pub_date)
+    assert user_client.get('/').context['paginator'].count == (
+        3 * N_PER_PAGE + 1), (
+        'Убедитесь, что сохранение публикации сбрасывает кэш счётчика.')
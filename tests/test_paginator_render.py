@@ -0,0 +1,51 @@
+import time
+
+import pytest
+from django.core.paginator import Paginator
+from django.template.loader import render_to_string
+
+from blog.paginators import CursorPaginator
+
+N_PAGES = (10, 1_000, 100_000)
+
+
+def _render(n_pages, number):
+    paginator = Paginator(range(n_pages * 10), 10)
+    page = CursorPaginator(None, 10).attach_cursors(paginator.page(number))
+    start = time.perf_counter()
+    html = render_to_string('includes/paginator.html', {'page_obj': page})
+    return html, time.perf_counter() - start
+
+
+@pytest.mark.parametrize('position', ('first', 'middle', 'last'))
+def test_paginator_html_is_bounded(position, monkeypatch):
+    monkeypatch.setattr(
+        'blog.paginators.encode_cursor', lambda post, direction: 'token')
+    sizes, timings = [], []
+    for n_pages in N_PAGES:
+        number = {'first': 1, 'middle': n_pages // 2, 'last': n_pages}[
+            position]
+        html, elapsed = _render(n_pages, number)
+        sizes.append(len(html.encode('utf-8')))
+        timings.append(elapsed)
+        assert html.count('<li') <= 15, (
+            'Убедитесь, что пагинатор выводит только окно номеров страниц: '
+            'первую, последнюю и по три вокруг текущей.'
+        )
+    assert max(sizes) < 4096 and max(sizes) - min(sizes) < 256, (
+        'Убедитесь, что размер HTML пагинатора не растёт с числом страниц. '
+        f'Размеры: {sizes}'
+    )
+    assert max(timings) < 0.05, (
+        'Убедитесь, что время рендера пагинатора не растёт с числом '
+        f'страниц. Время, с: {timings}'
+    )
+
+
+def test_paginator_links_around_current_page(monkeypatch):
+    monkeypatch.setattr(
+        'blog.paginators.encode_cursor', lambda post, direction: 'token')
+    html, _ = _render(1_000, 500)
+    for number in (1, 497, 498, 499, 501, 502, 503, 1000):
+        assert f'?page={number}"' in html
+    assert '?page=496"' not in html and '?page=504"' not in html
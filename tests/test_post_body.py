@@ -0,0 +1,50 @@
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.template import engines
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+TEXT = 'Первая <script>alert("x")</script> & строка\r\nвторая\n\nтретья\'s'
+
+
+def _linebreaksbr(text):
+    return engines['django'].from_string(
+        '{{ text|linebreaksbr }}').render({'text': text})
+
+
+def test_detail_serves_stored_html(
+        user_client, mixer, user, published_category):
+    post = mixer.blend('blog.Post', author=user, text=TEXT,
+                       category=published_category)
+    url = f'/posts/{post.id}/'
+    with CaptureQueriesContext(connection) as ctx:
+        content = user_client.get(url).content.decode('utf-8')
+    assert _linebreaksbr(TEXT) in content, (
+        'Убедитесь, что текст публикации на её странице выводится так же, '
+        'как фильтром `linebreaksbr`.'
+    )
+    assert not any(
+        '"blog_post"."text"' in query['sql']
+        for query in ctx.captured_queries
+    ), 'Убедитесь, что страница публикации не загружает исходный текст.'
+
+    post.text = 'Новый\nтекст'
+    post.save()
+    assert _linebreaksbr('Новый\nтекст') in user_client.get(
+        url).content.decode('utf-8')
+
+
+def test_body_check_and_backfill(user, published_category):
+    from blog.models import Post
+    Post.objects.bulk_create([
+        Post(title='bulk', text=TEXT, author=user,
+             category=published_category, pub_date='2020-01-01T00:00Z')
+    ])
+    with pytest.raises(CommandError):
+        call_command('backfill_post_fields', '--check')
+    call_command('backfill_post_fields')
+    call_command('backfill_post_fields', '--check')
@@ -0,0 +1,42 @@
+import pytest
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+CARD_TEMPLATE = 'includes/post_card.html'
+
+
+def _card_renders(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return [t.name for t in response.templates].count(CARD_TEMPLATE)
+
+
+def test_cards_are_reused_for_logged_in_users(
+        user_client, many_posts_with_published_locations):
+    assert _card_renders(user_client, '/') == 10
+    assert _card_renders(user_client, '/') == 0, (
+        'Убедитесь, что карточки публикаций берутся из кэша фрагментов.')
+
+
+def test_card_rerendered_when_post_changes(
+        user_client, mixer, many_posts_with_published_locations):
+    posts = many_posts_with_published_locations
+    category = posts[0].category
+    url = f'/category/{category.slug}/'
+    _card_renders(user_client, url)
+    newest = max(posts, key=lambda post: (post.pub_date, post.id))
+
+    mixer.blend('blog.Comment', post=newest)
+    assert _card_renders(user_client, url) == 1, (
+        'Убедитесь, что после нового комментария перерисовывается только '
+        'карточка этого поста.'
+    )
+    content = user_client.get(url).content.decode('utf-8')
+    assert 'Комментарии (1)' in content
+
+    category.title = 'Новое название категории'
+    category.save()
+    assert _card_renders(user_client, url) == 10, (
+        'Убедитесь, что изменение категории сбрасывает кэш карточек.')
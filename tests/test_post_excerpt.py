@@ -0,0 +1,58 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.template.defaultfilters import truncatewords
+from django.test.utils import CaptureQueriesContext
+from django.utils.html import escape
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def test_excerpt_matches_truncatewords(mixer, user, published_category):
+    text = ' '.join(f'слово{i} <b>&' for i in range(30))
+    post = mixer.blend('blog.Post', author=user, text=text,
+                       category=published_category)
+    assert post.excerpt == truncatewords(text, 10), (
+        'Убедитесь, что Post.excerpt совпадает с результатом '
+        'фильтра `truncatewords:10`.'
+    )
+    post.text = 'Короткий текст'
+    post.save()
+    post.refresh_from_db()
+    assert post.excerpt == 'Короткий текст', (
+        'Убедитесь, что excerpt пересчитывается при сохранении.')
+    post.text = 'Другой текст'
+    post.save(update_fields=['text'])
+    post.refresh_from_db()
+    assert post.excerpt == 'Другой текст', (
+        'Убедитесь, что `save()` с `text` в `update_fields` записывает '
+        'и пересчитанный excerpt.')
+
+
+def test_feed_does_not_load_text(
+        user, user_client, many_posts_with_published_locations):
+    category = many_posts_with_published_locations[0].category
+    for url in ('/', f'/category/{category.slug}/',
+                f'/profile/{user.username}/'):
+        with CaptureQueriesContext(connection) as ctx:
+            response = user_client.get(url)
+        content = response.content.decode('utf-8')
+        assert not any(
+            '"blog_post"."text"' in query['sql']
+            for query in ctx.captured_queries
+        ), f'Убедитесь, что лента `{url}` не загружает полный текст постов.'
+        for post in response.context['page_obj']:
+            assert escape(post.excerpt) in content
+
+
+def test_backfill_post_fields(user, published_category):
+    from blog.models import Post
+    Post.objects.bulk_create([
+        Post(title='bulk', text='раз два три ' * 10, author=user,
+             category=published_category, pub_date='2020-01-01T00:00Z')
+    ])
+    call_command('backfill_post_fields')
+    post = Post.objects.get(title='bulk')
+    assert post.excerpt == truncatewords(post.text, 10)
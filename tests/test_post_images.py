@@ -0,0 +1,166 @@
+import re
+from io import BytesIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.utils import timezone
+from PIL import Image
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+
+
+def _upload(width, height, name='photo.jpg', exif=None):
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), 'teal').save(
+        buffer, 'JPEG', exif=exif or Image.Exif())
+    return SimpleUploadedFile(name, buffer.getvalue(), 'image/jpeg')
+
+
+def _process():
+    call_command('process_images', workers=1)
+
+
+@pytest.fixture
+def make_post(mixer, user, published_category):
+    def make(image, process=True):
+        post = mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            is_published=True, pub_date=timezone.now(), image=image
+        )
+        if process:
+            _process()
+            post.refresh_from_db()
+        return post
+    return make
+
+
+def _img_tag(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    tags = re.findall(r'<img [^>]*img-thumbnail[^>]*>',
+                      response.content.decode())
+    assert len(tags) == 1
+    return tags[0]
+
+
+def test_upload_is_queued_with_placeholder(client, make_post):
+    post = make_post(_upload(1600, 1000), process=False)
+    assert post.image_variants == {
+        'name': post.image.name, 'pending': True,
+        'width': 1600, 'height': 1000}, (
+        'Убедитесь, что при загрузке фото только сохраняется и ставится '
+        'в очередь обработки.'
+    )
+    tag = _img_tag(client, '/')
+    assert 'placeholder' in tag and 'width="1600" height="1000"' in tag, (
+        'Убедитесь, что до обработки фото выводится заглушка его размеров.'
+    )
+    _process()
+    assert 'placeholder' not in _img_tag(client, '/'), (
+        'Убедитесь, что после обработки фото страницы из кэша обновляются.'
+    )
+
+
+def test_processing_strips_metadata_and_fixes_orientation(make_post):
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Повёрнуто на 90°.
+    exif[0x010F] = 'Camera'
+    post = make_post(_upload(400, 300, exif=exif))
+    assert (post.image_variants['width'],
+            post.image_variants['height']) == (300, 400)
+    with default_storage.open(post.image.name) as file, \
+            Image.open(file) as image:
+        assert image.size == (300, 400)
+        assert not image.getexif(), (
+            'Убедитесь, что обработка удаляет метаданные из оригинала.'
+        )
+
+
+def test_variants_created_by_worker(make_post):
+    post = make_post(_upload(1600, 1000))
+    variants = post.image_variants['variants']
+    assert [(v['width'], v['height']) for v in variants] == [
+        (320, 200), (640, 400), (1280, 800)], (
+        'Убедитесь, что при загрузке фото создаются уменьшенные копии '
+        'и их размеры сохраняются в модели.'
+    )
+    assert (post.image_variants['width'],
+            post.image_variants['height']) == (1600, 1000)
+    for variant in variants:
+        assert default_storage.exists(variant['name'])
+
+
+@pytest.mark.parametrize('url', ['/', '/posts/{pk}/'])
+def test_img_has_srcset_and_dimensions(client, make_post, url):
+    post = make_post(_upload(1600, 1000))
+    tag = _img_tag(client, url.format(pk=post.pk))
+    variants = post.image_variants['variants']
+    assert f'src="{default_storage.url(variants[1]["name"])}"' in tag
+    srcset = re.search(r'srcset="([^"]*)"', tag).group(1)
+    assert [item.rsplit(' ', 1)[1] for item in srcset.split(', ')] == [
+        '320w', '640w', '1280w', '1600w'], (
+        f'Убедитесь, что `<img>` на странице `{url}` перечисляет копии '
+        'фото в srcset.'
+    )
+    for attribute in ('sizes="', 'width="640"', 'height="400"',
+                      'loading="lazy"'):
+        assert attribute in tag, (
+            f'Убедитесь, что у `<img>` на странице `{url}` есть `{attribute}`.'
+        )
+
+
+def test_small_image_is_shown_as_is(client, make_post):
+    post = make_post(_upload(200, 100))
+    assert post.image_variants['variants'] == []
+    tag = _img_tag(client, '/')
+    assert f'src="{post.image.url}"' in tag
+    assert 'srcset' not in tag
+    assert 'width="200" height="100"' in tag
+
+
+def test_replaced_image_drops_old_variants(make_post):
+    post = make_post(_upload(800, 600))
+    old = post.image_variants['variants']
+    post.image = _upload(700, 700, 'other.jpg')
+    post.save()
+    _process()
+    post.refresh_from_db()
+    assert [v['width'] for v in post.image_variants['variants']] == [320, 640]
+    for variant in old:
+        assert not default_storage.exists(variant['name'])
+
+
+def test_build_image_variants(client, make_post):
+    from blog.models import Post
+    post = make_post(_upload(1000, 500))
+    Post.objects.filter(pk=post.pk).update(image_variants={})
+    client.get('/')
+    call_command('build_image_variants')
+    _process()
+    post.refresh_from_db()
+    assert [v['width'] for v in post.image_variants['variants']] == [320, 640]
+    assert 'srcset' in _img_tag(client, '/'), (
+        'Убедитесь, что после `build_image_variants` страницы из кэша '
+        'обновляются.'
+    )
+
+
+def test_upload_is_processed_by_task(make_post):
+    from tasks import queue
+    from tasks.models import Task
+    post = make_post(_upload(800, 600), process=False)
+    task = Task.objects.get(name='blog.process_image')
+    assert task.payload == {'post_id': post.pk, 'name': post.image.name}
+    while queue.run_next('test'):
+        pass
+    post.refresh_from_db()
+    assert [v['width'] for v in post.image_variants['variants']] == [320, 640]
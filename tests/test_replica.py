@@ -0,0 +1,111 @@
+import os
+import sqlite3
+import time
+
+import pytest
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [
+    pytest.mark.django_db(transaction=True, databases=['default', 'replica'])
+]
+
+
+@pytest.fixture
+def fresh_replica(monkeypatch):
+    from blog import replica
+
+    # В тестах реплика — зеркало тестовой базы, снимок всегда свежий.
+    monkeypatch.setattr(replica, 'snapshot_time', time.time)
+    return replica
+
+
+def _replica_queries(client, url):
+    with CaptureQueriesContext(connections['replica']) as ctx:
+        response = client.get(url)
+    assert response.status_code == 200
+    return ctx.captured_queries
+
+
+def test_read_views_use_replica(fresh_replica, client, user_client,
+                                post_with_published_location):
+    post = post_with_published_location
+    for url in ('/', f'/posts/{post.pk}/', f'/profile/{post.author}/',
+                f'/category/{post.category.slug}/', '/pages/about/'):
+        assert _replica_queries(user_client, url), (
+            f'Убедитесь, что страница `{url}` читает из реплики.')
+    assert not _replica_queries(user_client, '/posts/create/'), (
+        'Убедитесь, что остальные страницы читают из основной базы.')
+
+
+def test_writer_is_pinned_to_primary(fresh_replica, user_client,
+                                     post_with_published_location):
+    from blog.replica import PIN_COOKIE
+    url = f'/posts/{post_with_published_location.pk}/'
+    response = user_client.post(f'{url}comment/', {'text': 'Комментарий'})
+    assert PIN_COOKIE in response.cookies, (
+        'Убедитесь, что после изменения пользователь получает cookie '
+        'чтения из основной базы.')
+    assert not _replica_queries(user_client, url), (
+        'Убедитесь, что после изменения пользователь читает из основной '
+        'базы в пределах BLOG_REPLICA_LAG_BUDGET.')
+    user_client.cookies[PIN_COOKIE] = str(time.time() - 1)
+    assert _replica_queries(user_client, url)
+
+
+def test_stale_replica_is_not_used(monkeypatch, client,
+                                   post_with_published_location):
+    from blog import page_cache, replica
+    monkeypatch.setattr(replica, 'snapshot_time', lambda: time.time() - 60)
+    assert not _replica_queries(client, '/'), (
+        'Убедитесь, что реплика старше BLOG_REPLICA_LAG_BUDGET '
+        'не используется.')
+
+    snapshot = time.time()
+    monkeypatch.setattr(replica, 'snapshot_time', lambda: snapshot)
+    page_cache.bump(page_cache.FEED)
+    assert not _replica_queries(client, '/'), (
+        'Убедитесь, что реплика, снятая до последних изменений, '
+        'не используется.')
+
+
+def test_writes_go_to_primary(fresh_replica, user):
+    from django.contrib.auth import get_user_model
+    from blog.replica import ReplicaRouter
+    replica_user = get_user_model().objects.using('replica').get(pk=user.pk)
+    assert ReplicaRouter().db_for_write(
+        type(replica_user), instance=replica_user) == 'default'
+
+
+def test_refresh_copies_database(tmp_path):
+    from blog.replica import refresh
+    source, target = tmp_path / 'db.sqlite3', tmp_path / 'replica.sqlite3'
+    with sqlite3.connect(source) as db:
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('CREATE TABLE t (x)')
+        db.execute('INSERT INTO t VALUES (1)')
+    started = refresh(source, target)
+    with sqlite3.connect(target) as db:
+        assert db.execute('SELECT x FROM t').fetchall() == [(1,)]
+        assert db.execute('PRAGMA journal_mode').fetchone() == ('delete',)
+    assert os.stat(target).st_mtime == pytest.approx(started)
+    assert not os.path.exists(f'{target}.tmp')
+
+
+def test_outdated_replica_connection_is_closed(monkeypatch):
+    from blog import replica
+    connection = connections['replica']
+    closed = []
+    # Тестовая база в памяти: SQLite-бэкенд Django её не закрывает.
+    monkeypatch.setattr(connection, 'close', lambda: closed.append(True))
+    monkeypatch.setattr(replica, 'snapshot_time', lambda: 1.0)
+    connection.ensure_connection()
+    replica.remember_snapshot(connection)
+    replica.close_outdated_connection()
+    assert not closed
+    monkeypatch.setattr(replica, 'snapshot_time', lambda: 2.0)
+    replica.close_outdated_connection()
+    assert closed, (
+        'Убедитесь, что постоянное соединение со старым снимком реплики '
+        'закрывается.'
+    )
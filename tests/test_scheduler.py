@@ -0,0 +1,81 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def scheduled_post(mixer, user, published_category):
+    return mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(hours=1))
+
+
+def test_post_becomes_visible_at_pub_date(
+        client, scheduled_post, post_with_published_location):
+    from blog import scheduler
+    from blog.signals import posts_went_live
+
+    assert not scheduled_post.is_live
+    response = client.get('/')
+    assert scheduled_post not in response.context['page_obj']
+
+    received = []
+
+    def on_live(sender, post_ids, **kwargs):
+        received.extend(post_ids)
+
+    posts_went_live.connect(on_live)
+    later = scheduled_post.pub_date + timedelta(seconds=1)
+    try:
+        with mock.patch.object(scheduler.timezone, 'now', return_value=later):
+            response = client.get('/')
+    finally:
+        posts_went_live.disconnect(on_live)
+
+    assert scheduled_post in response.context['page_obj'], (
+        'Убедитесь, что отложенная публикация появляется в ленте, когда '
+        'наступает дата её публикации, без перезапуска сервера.'
+    )
+    assert received == [scheduled_post.id], (
+        'Убедитесь, что при наступлении даты публикации отправляется '
+        'сигнал `posts_went_live`.'
+    )
+
+
+def test_idle_requests_skip_database(scheduled_post):
+    from blog import scheduler
+
+    scheduler.publish_if_due()
+    with mock.patch.object(scheduler, 'publish_due_posts') as publish:
+        scheduler.publish_if_due()
+    assert not publish.called, (
+        'Убедитесь, что до наступления даты ближайшей публикации '
+        'планировщик не обращается к базе данных.'
+    )
+
+
+def test_editing_pub_date_reschedules(scheduled_post):
+    scheduled_post.pub_date = timezone.now() - timedelta(minutes=1)
+    scheduled_post.save()
+    scheduled_post.refresh_from_db()
+    assert scheduled_post.is_live
+
+
+def test_update_fields_pub_date_updates_is_live(client, mixer, user,
+                                                published_category):
+    post = mixer.blend('blog.Post', author=user, category=published_category)
+    assert post.is_live
+    post.pub_date = timezone.now() + timedelta(days=3)
+    post.save(update_fields=['pub_date'])
+    post.refresh_from_db()
+    assert not post.is_live, (
+        'Убедитесь, что `save()` с `pub_date` в `update_fields` записывает '
+        'и пересчитанный `is_live`.'
+    )
+    assert post not in client.get('/').context['page_obj']
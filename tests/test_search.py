@@ -0,0 +1,113 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='FTS5 — только SQLite'),
+]
+
+
+@pytest.fixture
+def posts(mixer, user, published_category, published_location):
+    def blend(title, text, **kwargs):
+        return mixer.blend(
+            'blog.Post', title=title, text=text, author=user,
+            category=published_category, location=published_location,
+            **kwargs)
+    return {
+        'title': blend('Зимняя ёлка', 'Про праздник и подарки.'),
+        'text': blend('Про праздник', 'Во дворе поставили ёлку <b>и</b> '
+                      'украсили её гирляндами.'),
+        'hidden': blend('Ёлка в черновике', 'Ёлка', is_published=False),
+        'other': blend('Весна', 'Распустились почки.'),
+    }
+
+
+def _search(client, query):
+    response = client.get('/search/', {'q': query})
+    assert response.status_code == 200
+    return response
+
+
+def test_search_ranks_visible_posts(client, posts):
+    response = _search(client, 'елки')
+    found = list(response.context['page_obj'])
+    assert found == [posts['title'], posts['text']], (
+        'Убедитесь, что поиск находит русские слова в разных формах и с «ё», '
+        'скрывает невидимые публикации и ставит совпадения в заголовке выше.'
+    )
+    content = response.content.decode('utf-8')
+    assert '<mark>ёлку</mark>' in content, (
+        'Убедитесь, что совпадения в найденном фрагменте подсвечены.')
+    assert '<b>и</b>' not in content and '&lt;b&gt;и&lt;/b&gt;' in content, (
+        'Убедитесь, что фрагмент текста экранируется.')
+
+
+def test_search_follows_post_writes(user_client, posts):
+    from blog.models import Post
+    post = posts['other']
+    post.text = 'Снег растаял'
+    post.save()
+    assert list(_search(user_client, 'снег').context['page_obj']) == [post]
+    Post.objects.filter(pk=post.pk).update(title='Оттепель')
+    assert list(_search(user_client, 'оттепель').context['page_obj']) == [post]
+    post.delete()
+    assert not list(_search(user_client, 'снег').context['page_obj'])
+
+
+def test_search_query_syntax_is_escaped(client, posts):
+    for query in ('"', 'ёлка OR', 'NEAR(', 'title:весна', '*', '   '):
+        _search(client, query)
+
+
+def test_triggers_survive_migrations(posts):
+    from blog import search
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        triggers = {row[0] for row in cursor.fetchall()}
+    assert set(search.TRIGGERS) <= triggers, (
+        'Убедитесь, что после миграций в базе есть триггеры '
+        'полнотекстового индекса.'
+    )
+
+
+def test_post_migrate_restores_triggers(user_client, posts):
+    from django.core.management.sql import emit_post_migrate_signal
+
+    from blog import search
+    from blog.models import Post
+
+    # Так их удаляет пересоздание blog_post миграцией на SQLite.
+    with connection.cursor() as cursor:
+        for trigger in search.TRIGGERS:
+            cursor.execute(f'DROP TRIGGER {trigger}')
+    Post.objects.filter(pk=posts['other'].pk).update(title='Оттепель')
+    assert not list(_search(user_client, 'оттепель').context['page_obj'])
+
+    emit_post_migrate_signal(verbosity=0, interactive=False, db='default')
+    assert list(_search(user_client, 'оттепель').context['page_obj']) == [
+        posts['other']
+    ], (
+        'Убедитесь, что после migrate пропавшие триггеры восстанавливаются, '
+        'а индекс перестраивается.'
+    )
+    assert not search.ensure_triggers(connection)
+
+
+def test_rebuild_search_index(user_client, posts):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO blog_post_fts(blog_post_fts) VALUES ('delete-all')")
+    assert not list(_search(user_client, 'весна').context['page_obj'])
+    call_command('rebuild_search_index')
+    assert list(_search(user_client, 'весна').context['page_obj']) == [
+        posts['other']]
+
+
+def test_admin_search_uses_index(admin_client, posts):
+    response = admin_client.get('/admin/blog/post/', {'q': 'почки'})
+    assert response.status_code == 200
+    assert list(response.context['cl'].result_list) == [posts['other']]
@@ -0,0 +1,93 @@
+import importlib
+import runpy
+
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+def _pragma(cursor, name):
+    cursor.execute(f'PRAGMA {name}')
+    return cursor.fetchone()[0]
+
+
+def _load_settings(monkeypatch, profile):
+    """Настройки проекта, прочитанные заново при BLOG_DB_PROFILE=profile"""
+    if profile is None:
+        monkeypatch.delenv('BLOG_DB_PROFILE', raising=False)
+    else:
+        monkeypatch.setenv('BLOG_DB_PROFILE', profile)
+    module = importlib.import_module(settings.SETTINGS_MODULE)
+    return runpy.run_path(module.__file__)
+
+
+@pytest.fixture
+def production_pragmas(settings, monkeypatch):
+    pragmas = _load_settings(monkeypatch, 'production')['BLOG_SQLITE_PRAGMAS']
+    settings.BLOG_SQLITE_PRAGMAS = pragmas
+    return pragmas['default']
+
+
+@pytest.fixture
+def file_connection(tmp_path):
+    wrapper = DatabaseWrapper(
+        {**connection.settings_dict, 'NAME': str(tmp_path / 'db.sqlite3')},
+        alias='default'
+    )
+    yield wrapper
+    wrapper.close()
+
+
+def test_db_profile_switch(monkeypatch):
+    development = _load_settings(monkeypatch, None)
+    assert {
+        database['CONN_MAX_AGE']
+        for database in development['DATABASES'].values()
+    } == {0}, (
+        'Убедитесь, что без `BLOG_DB_PROFILE=production` соединения с базой '
+        'не сохраняются между запросами.'
+    )
+    assert 'default' not in development['BLOG_SQLITE_PRAGMAS'], (
+        'Убедитесь, что без `BLOG_DB_PROFILE=production` основная база '
+        'открывается с настройками SQLite по умолчанию.'
+    )
+    production = _load_settings(monkeypatch, 'production')
+    assert {
+        database['CONN_MAX_AGE']
+        for database in production['DATABASES'].values()
+    } == {600}
+    assert production['BLOG_SQLITE_PRAGMAS']['default'][
+        'journal_mode'] == 'WAL'
+
+
+def test_connection_pragmas(production_pragmas, file_connection):
+    with file_connection.cursor() as cursor:
+        assert _pragma(cursor, 'busy_timeout') == (
+            production_pragmas['busy_timeout']), (
+            'Убедитесь, что PRAGMA из BLOG_SQLITE_PRAGMAS выполняются '
+            'для каждого нового соединения.'
+        )
+        assert _pragma(cursor, 'cache_size') == (
+            production_pragmas['cache_size'])
+        assert _pragma(cursor, 'temp_store') == 2
+        assert _pragma(cursor, 'synchronous') == 1
+
+
+def test_file_database_uses_wal(production_pragmas, file_connection):
+    with file_connection.cursor() as cursor:
+        assert _pragma(cursor, 'journal_mode') == 'wal'
+        assert _pragma(cursor, 'mmap_size') == production_pragmas['mmap_size']
+
+
+def test_development_profile_keeps_sqlite_defaults(
+        settings, monkeypatch, file_connection):
+    settings.BLOG_SQLITE_PRAGMAS = _load_settings(
+        monkeypatch, None)['BLOG_SQLITE_PRAGMAS']
+    with file_connection.cursor() as cursor:
+        assert _pragma(cursor, 'journal_mode') == 'delete'
+        assert _pragma(cursor, 'synchronous') == 2
@@ -0,0 +1,169 @@
+import asyncio
+from wsgiref.util import FileWrapper, setup_testing_defaults
+
+import pytest
+from django.core.management import call_command
+from django.test import override_settings
+
+from core.static_app import StaticFilesASGI, StaticFilesWSGI
+
+NAME = 'css/bootstrap.min.css'
+
+
+@pytest.fixture(scope='module')
+def collected(tmp_path_factory):
+    root = tmp_path_factory.mktemp('static')
+    with override_settings(STATIC_ROOT=str(root)):
+        call_command('collectstatic', interactive=False, verbosity=0)
+    return root
+
+
+@pytest.fixture
+def static_root(settings, collected):
+    settings.DEBUG = False
+    settings.STATIC_ROOT = str(collected)
+    return collected
+
+
+def django_app(environ, start_response):
+    start_response('200 OK', [('Content-Type', 'text/plain')])
+    return [b'django']
+
+
+def get(app, path, **headers):
+    environ = {'PATH_INFO': path, 'REQUEST_METHOD': 'GET'}
+    setup_testing_defaults(environ)
+    environ['wsgi.file_wrapper'] = FileWrapper
+    environ.update(
+        (f'HTTP_{name.upper()}', value) for name, value in headers.items()
+    )
+    response = {}
+
+    def start_response(status, response_headers):
+        response['status'] = int(status.split()[0])
+        response['headers'] = dict(response_headers)
+
+    body = app(environ, start_response)
+    response['wrapped'] = isinstance(body, FileWrapper)
+    response['body'] = b''.join(body)
+    return response
+
+
+def test_wsgi_serves_indexed_files(static_root):
+    app = StaticFilesWSGI(django_app)
+    original = (static_root / NAME).read_bytes()
+
+    response = get(app, f'/static/{NAME}', accept_encoding='gzip, br')
+    assert response['status'] == 200
+    assert response['headers']['Content-Encoding'] == 'br'
+    assert response['body'] == (static_root / f'{NAME}.br').read_bytes()
+    assert response['wrapped'], (
+        'Убедитесь, что файл целиком отдаётся через wsgi.file_wrapper.'
+    )
+
+    response = get(app, f'/static/{NAME}')
+    assert response['body'] == original
+    assert response['headers']['Content-Length'] == str(len(original))
+    assert 'Accept-Encoding' in response['headers']['Vary']
+
+    assert get(app, '/static/missing.css')['body'] == b'django', (
+        'Убедитесь, что запросы к файлам не из индекса уходят в Django.'
+    )
+    assert get(app, '/')['body'] == b'django'
+
+
+def test_wsgi_conditional_requests(static_root):
+    app = StaticFilesWSGI(django_app)
+    response = get(app, f'/static/{NAME}', accept_encoding='gzip')
+    etag = response['headers']['ETag']
+
+    response = get(app, f'/static/{NAME}', accept_encoding='gzip',
+                   if_none_match=f'"other", W/{etag}')
+    assert response['status'] == 304
+    assert response['body'] == b''
+    # Другое представление — другой ETag.
+    response = get(app, f'/static/{NAME}', if_none_match=etag)
+    assert response['status'] == 200
+
+    last_modified = response['headers']['Last-Modified']
+    response = get(app, f'/static/{NAME}', if_modified_since=last_modified)
+    assert response['status'] == 304
+
+
+def test_wsgi_range(static_root):
+    app = StaticFilesWSGI(django_app)
+    original = (static_root / NAME).read_bytes()
+    size = len(original)
+
+    response = get(app, f'/static/{NAME}', range='bytes=10-19')
+    assert response['status'] == 206
+    assert response['body'] == original[10:20]
+    assert response['headers']['Content-Range'] == f'bytes 10-19/{size}'
+    assert not response['wrapped']
+
+    response = get(app, f'/static/{NAME}', range='bytes=-5')
+    assert response['body'] == original[-5:]
+
+    response = get(app, f'/static/{NAME}', range=f'bytes={size}-')
+    assert response['status'] == 416
+    assert response['headers']['Content-Range'] == f'bytes */{size}'
+
+    response = get(app, f'/static/{NAME}', range='bytes=0-9',
+                   if_range='"stale"')
+    assert response['status'] == 200
+    assert response['body'] == original
+
+
+def test_debug_passes_everything_to_django(settings, static_root):
+    settings.DEBUG = True
+    app = StaticFilesWSGI(django_app)
+    assert get(app, f'/static/{NAME}')['body'] == b'django'
+
+
+def asgi_get(app, path, headers=(), extensions=None, method='GET'):
+    messages = []
+    scope = {
+        'type': 'http', 'method': method, 'path': path,
+        'headers': [(name.encode(), value.encode())
+                    for name, value in headers],
+    }
+    if extensions is not None:
+        scope['extensions'] = extensions
+
+    async def receive():
+        return {'type': 'http.request'}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return messages
+
+
+def test_asgi_serves_indexed_files(static_root):
+    async def django_asgi(scope, receive, send):
+        raise AssertionError('Статика не должна доходить до Django')
+
+    app = StaticFilesASGI(django_asgi)
+    original = (static_root / NAME).read_bytes()
+
+    start, *body = asgi_get(app, f'/static/{NAME}',
+                            headers=[('Range', 'bytes=100-')])
+    assert start['status'] == 206
+    assert b''.join(message.get('body', b'') for message in body) == (
+        original[100:]
+    )
+    assert not body[-1].get('more_body')
+
+    start, body = asgi_get(app, f'/static/{NAME}', method='HEAD')
+    assert dict(start['headers'])[b'content-length'] == (
+        str(len(original)).encode()
+    )
+    assert not body.get('body')
+
+    _, message = asgi_get(
+        app, f'/static/{NAME}',
+        extensions={'http.response.pathsend': {}},
+    )
+    assert message == {'type': 'http.response.pathsend',
+                       'path': str(static_root / NAME)}
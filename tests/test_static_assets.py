@@ -0,0 +1,86 @@
+import gzip
+import re
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+HASHED_CSS = re.compile(r'/static/(css/bootstrap\.pruned\.[0-9a-f]{12}\.css)')
+
+
+@pytest.fixture
+def static_root(settings, tmp_path):
+    # При DEBUG {% static %} не подставляет имена с хэшем.
+    settings.DEBUG = False
+    settings.STATIC_ROOT = str(tmp_path)
+    # Страницы из кэша могли быть отрисованы с другой статикой.
+    cache.clear()
+    yield tmp_path
+    cache.clear()
+
+
+@pytest.fixture
+def collected(static_root):
+    call_command('collectstatic', interactive=False, verbosity=0)
+    return static_root
+
+
+def _hashed_css(client):
+    match = HASHED_CSS.search(client.get('/').content.decode())
+    assert match, (
+        'Убедитесь, что `{% static %}` в `base.html` после collectstatic '
+        'даёт имена файлов с хэшем содержимого.'
+    )
+    return match.group(1)
+
+
+def test_static_tag_uses_hashed_names(client, collected):
+    name = _hashed_css(client)
+    html = client.get('/').content.decode()
+    assert re.search(r'/static/img/logo\.[0-9a-f]{12}\.png', html)
+    assert re.search(r'/static/img/fav/favicon\.[0-9a-f]{12}\.ico', html)
+    for extension in ('.gz', '.br'):
+        assert (collected / f'{name}{extension}').exists(), (
+            f'Убедитесь, что collectstatic пишет сжатые копии `{extension}`.'
+        )
+
+
+def test_missing_manifest_falls_back_to_plain_names(client, static_root):
+    response = client.get('/')
+    assert response.status_code == 200
+    assert '/static/css/bootstrap.pruned.css' in response.content.decode()
+
+
+def test_serve_precompressed_immutable(client, collected):
+    name = _hashed_css(client)
+    original = (collected / name).read_bytes()
+    url = f'/static/{name}'
+
+    response = client.get(url, HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+    assert response['Content-Encoding'] == 'br'
+    assert response['Cache-Control'] == (
+        'public, max-age=31536000, immutable'), (
+        'Убедитесь, что файлы с хэшем в имени отдаются с immutable '
+        'Cache-Control.'
+    )
+    assert 'Accept-Encoding' in response['Vary']
+
+    response = client.get(url, HTTP_ACCEPT_ENCODING='gzip, br;q=0')
+    assert response['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(b''.join(response.streaming_content)) == original
+
+    response = client.get(url)
+    assert not response.has_header('Content-Encoding')
+    assert b''.join(response.streaming_content) == original
+
+    last_modified = response['Last-Modified']
+    response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == 304
+
+    response = client.get('/static/css/bootstrap.min.css')
+    assert 'immutable' not in response['Cache-Control']
+    assert client.get('/static/../manage.py').status_code == 404
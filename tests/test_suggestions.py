@@ -0,0 +1,105 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def posts(mixer, user, published_category):
+    def blend(title, **kwargs):
+        return mixer.blend('blog.Post', title=title, author=user,
+                           category=published_category, **kwargs)
+    return {
+        'tree': blend('Зимняя ёлка во дворе'),
+        'hidden': blend('Ёлка в черновике', is_published=False),
+        'other': blend('Весенний парк'),
+    }
+
+
+def _suggest(client, query):
+    response = client.get('/search/suggest/', {'q': query})
+    assert response.status_code == 200
+    return response.json()
+
+
+def _titles(data):
+    return [post['title'] for post in data['posts']]
+
+
+def test_suggest_matches_word_prefixes(client, posts, published_category):
+    assert _titles(_suggest(client, 'елк')) == ['Зимняя ёлка во дворе'], (
+        'Убедитесь, что подсказки находят начало любого слова заголовка '
+        'с учётом «ё» и не показывают невидимые публикации.'
+    )
+    assert _titles(_suggest(client, 'ЗИМНЯЯ Ё')) == ['Зимняя ёлка во дворе']
+    assert _suggest(client, 'двор')['posts'][0]['url'] == (
+        f'/posts/{posts["tree"].pk}/')
+    assert not _titles(_suggest(client, 'ёлка во парк'))
+    assert _suggest(client, '   ') == {
+        'query': '   ', 'posts': [], 'categories': [], 'users': []}
+
+    category = _suggest(client, published_category.title[:3])['categories']
+    assert category == [{
+        'title': published_category.title,
+        'url': f'/category/{published_category.slug}/',
+    }]
+
+
+def test_suggest_users(client, user):
+    users = _suggest(client, user.username[:2])['users']
+    assert {'username': user.username,
+            'url': f'/profile/{user.username}/'} in users
+
+
+def test_suggestions_follow_writes(client, posts, published_category, user):
+    post = posts['tree']
+    post.title = 'Летний сад'
+    post.save()
+    assert not _titles(_suggest(client, 'елк'))
+    assert _titles(_suggest(client, 'сад')) == ['Летний сад']
+
+    published_category.is_published = False
+    published_category.save()
+    assert not _titles(_suggest(client, 'сад')), (
+        'Убедитесь, что снятие категории с публикации убирает из '
+        'подсказок её публикации.'
+    )
+    published_category.is_published = True
+    published_category.save()
+    assert _titles(_suggest(client, 'сад')) == ['Летний сад']
+
+    post.delete()
+    assert not _titles(_suggest(client, 'сад'))
+
+    user.username = 'renamed_author'
+    user.save()
+    assert [u['username'] for u in _suggest(client, 'renamed')['users']] == [
+        'renamed_author']
+
+
+def test_suggest_reads_only_prefix_index(client, posts, published_category):
+    query = published_category.title[:2]
+    _suggest(client, query)
+    with CaptureQueriesContext(connection) as ctx:
+        _suggest(client, query)
+    sql = ' '.join(q['sql'] for q in ctx.captured_queries)
+    assert 'LIKE' not in sql.upper(), (
+        'Убедитесь, что подсказки не используют LIKE.')
+    for table in ('blog_post', 'blog_category', 'auth_user'):
+        assert f'FROM "{table}"' not in sql, (
+            f'Убедитесь, что подсказки не читают таблицу {table}.')
+
+
+def test_rebuild_suggestions(client, user, published_category):
+    from blog.models import Post
+    Post.objects.bulk_create([
+        Post(title='Массовая загрузка', text='', author=user, is_live=True,
+             category=published_category, pub_date='2020-01-01T00:00Z')
+    ])
+    assert not _titles(_suggest(client, 'масс'))
+    call_command('rebuild_suggestions')
+    assert _titles(_suggest(client, 'масс')) == ['Массовая загрузка']
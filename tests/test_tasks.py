@@ -0,0 +1,125 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.utils import timezone
+
+pytestmark = [
+    pytest.mark.django_db
+]
+
+
+@pytest.fixture
+def flaky_task():
+    from tasks import queue
+    calls = []
+
+    @queue.register('tests.flaky', max_attempts=2)
+    def flaky(fail):
+        calls.append(fail)
+        if fail:
+            raise RuntimeError('Сбой')
+
+    return calls
+
+
+def _run_all():
+    from tasks import queue
+    while queue.run_next('test'):
+        pass
+
+
+def test_task_runs_and_retries_with_backoff(flaky_task, settings):
+    from tasks import queue
+    from tasks.models import Task
+    settings.TASKS_RETRY_DELAY = 60
+    ok = queue.enqueue('tests.flaky', fail=False)
+    failing = queue.enqueue('tests.flaky', fail=True)
+    _run_all()
+    ok.refresh_from_db()
+    failing.refresh_from_db()
+    assert ok.status == Task.DONE and ok.finished_at
+    assert failing.status == Task.PENDING, (
+        'Убедитесь, что упавшая задача возвращается в очередь.'
+    )
+    assert 'Сбой' in failing.last_error
+    assert timedelta(seconds=50) < failing.run_at - timezone.now() \
+        < timedelta(seconds=70), (
+        'Убедитесь, что повтор откладывается на TASKS_RETRY_DELAY.'
+    )
+
+    Task.objects.filter(pk=failing.pk).update(run_at=timezone.now())
+    _run_all()
+    failing.refresh_from_db()
+    assert failing.status == Task.FAILED, (
+        'Убедитесь, что после max_attempts попыток задача не повторяется.'
+    )
+    assert flaky_task == [False, True, True]
+
+
+def test_retry_delay_doubles(settings):
+    from tasks.queue import retry_delay
+    settings.TASKS_RETRY_DELAY = 10
+    settings.TASKS_MAX_RETRY_DELAY = 60
+    delays = [retry_delay(n).total_seconds() for n in (1, 2, 3, 4)]
+    for delay, expected in zip(delays, (10, 20, 40, 60)):
+        assert expected * 0.9 <= delay <= expected * 1.1
+
+
+def test_idempotency_key(flaky_task):
+    from tasks import queue
+    first = queue.enqueue('tests.flaky', key='once', fail=False)
+    _run_all()
+    assert queue.enqueue('tests.flaky', key='once', fail=False) == first
+    _run_all()
+    assert flaky_task == [False], (
+        'Убедитесь, что задача с тем же ключом идемпотентности '
+        'выполняется один раз.'
+    )
+
+
+def test_expired_lease_is_reclaimed(flaky_task):
+    from tasks import queue
+    from tasks.models import Task
+    task = queue.enqueue('tests.flaky', fail=False)
+    assert queue.claim('dead').pk == task.pk
+    assert queue.claim('other') is None
+    Task.objects.filter(pk=task.pk).update(
+        locked_until=timezone.now() - timedelta(seconds=1))
+    assert queue.claim('other').pk == task.pk, (
+        'Убедитесь, что задачу упавшего воркера забирает другой.'
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_run_tasks_command(flaky_task):
+    from tasks import queue
+    from tasks.models import Task
+    for _ in range(5):
+        queue.enqueue('tests.flaky', fail=False)
+    call_command('run_tasks', workers=2)
+    assert set(Task.objects.values_list('status', flat=True)) == {Task.DONE}
+
+
+def test_admin_dashboard(admin_client, flaky_task):
+    from tasks import queue
+    queue.enqueue('tests.flaky', fail=False)
+    response = admin_client.get('/admin/tasks/task/')
+    assert response.status_code == 200
+    assert ('В очереди', 1) in response.context['task_counts']
+
+
+def test_password_reset_email_is_queued(client, user):
+    user.email = 'reader@example.com'
+    user.save()
+    response = client.post(
+        '/auth/password_reset/', {'email': 'reader@example.com'})
+    assert response.status_code == 302
+    assert not mail.outbox, (
+        'Убедитесь, что письмо сброса пароля отправляется не в запросе, '
+        'а фоновой задачей.'
+    )
+    _run_all()
+    assert len(mail.outbox) == 1
+    assert '/auth/reset/' in mail.outbox[0].body